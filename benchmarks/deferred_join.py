@@ -0,0 +1,107 @@
+# benchmarks/deferred_join.py
+"""
+Benchmark for numbered pages at deep offsets.
+
+Compares `paginate` with the "standard" strategy, which applies OFFSET to the
+query loading full rows, against the "deferred_join" strategy, which applies
+it to a primary-key-only query served by the index on the sort column and
+then loads the page's rows by key.
+
+Builds a SQLite database of wide rows in a temporary directory (about 500 MB
+for the default million rows; pass --rows for a smaller run).
+
+Run with:
+    python -m benchmarks.deferred_join [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import Column, Integer, String, Text, create_engine, insert
+from sqlalchemy.orm import Session, declarative_base
+
+from flask_devkit.core.repository import BaseRepository
+
+Base = declarative_base()
+
+OFFSETS = (10_000, 100_000, 1_000_000)
+PER_PAGE = 20
+
+
+class Article(Base):
+    __tablename__ = "bench_articles"
+    id = Column(Integer, primary_key=True)
+    rank = Column(Integer, nullable=False, index=True)
+    title = Column(String(200), nullable=False)
+    body = Column(Text, nullable=False)
+
+
+def populate(engine, rows: int, chunk: int = 20_000) -> None:
+    body = "lorem ipsum dolor sit amet " * 16
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for start in range(0, rows, chunk):
+            connection.execute(
+                insert(Article),
+                [
+                    {"rank": (i * 7919) % rows, "title": f"Article {i}", "body": body}
+                    for i in range(start, min(start + chunk, rows))
+                ],
+            )
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        print(f"Populating {rows} rows...")
+        populate(engine, rows)
+
+        for offset in OFFSETS:
+            if offset + PER_PAGE > rows:
+                print(f"offset {offset:>9}: skipped (only {rows} rows)")
+                continue
+            page = offset // PER_PAGE + 1
+            results = {}
+            for strategy in ("standard", "deferred_join"):
+                with Session(engine) as session:
+                    repo = BaseRepository(model=Article, db_session=session)
+
+                    def fetch():
+                        session.expunge_all()
+                        return repo.paginate(
+                            page=page,
+                            per_page=PER_PAGE,
+                            order_by=["rank"],
+                            with_total=False,
+                            strategy=strategy,
+                        )
+
+                    assert len(fetch().items) == PER_PAGE
+                    results[strategy] = best_of(repeat, fetch)
+            standard = results["standard"]
+            deferred = results["deferred_join"]
+            print(
+                f"offset {offset:>9}: standard {standard * 1000:8.1f} ms, "
+                f"deferred_join {deferred * 1000:8.1f} ms "
+                f"({standard / deferred:4.1f}x)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_020)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,73 @@
+# benchmarks/filter_plans.py
+"""
+Microbenchmark for the per-request cost of building filter clauses.
+
+Compares resolving fields and building the SQL expressions on every call
+(what `_apply_filters` did before filter plans were cached) against reusing
+the cached FilterPlan and only binding values.
+
+Run with:
+    python -m benchmarks.filter_plans
+"""
+
+import timeit
+
+from sqlalchemy import TIMESTAMP, Boolean, Column, Float, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from flask_devkit.core.filters import compile_filter_plan, parse_filters
+
+Base = declarative_base()
+
+
+class Order(Base):
+    __tablename__ = "bench_orders"
+    id = Column(Integer, primary_key=True)
+    status = Column(String(20))
+    customer_name = Column(String(100))
+    total = Column(Float)
+    quantity = Column(Integer)
+    is_paid = Column(Boolean)
+    created_at = Column(TIMESTAMP)
+
+
+FILTERS = {
+    "status": "in__shipped|delivered",
+    "customer_name": "ilike__bahaa",
+    "total": "gte__10.5,lt__99",
+    "quantity": "gt__2",
+    "missing_field": "eq__1",
+}
+
+
+def uncached():
+    signature, values = parse_filters(FILTERS)
+    plan = compile_filter_plan.__wrapped__(Order, signature)
+    return plan.clauses, plan.bind(values)
+
+
+def cached():
+    signature, values = parse_filters(FILTERS)
+    plan = compile_filter_plan(Order, signature)
+    return plan.clauses, plan.bind(values)
+
+
+def main(number: int = 20000) -> None:
+    import logging
+
+    # Unknown fields warn on every uncached compile; keep the output readable.
+    logging.getLogger("flask_devkit.core.filters").disabled = True
+
+    cached()  # warm the plan cache
+    results = {
+        "resolve every request": timeit.timeit(uncached, number=number),
+        "cached filter plan": timeit.timeit(cached, number=number),
+    }
+    baseline = results["resolve every request"]
+    for name, seconds in results.items():
+        per_call = seconds / number * 1e6
+        print(f"{name:>22}: {per_call:8.2f} us/call ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 from sqlalchemy import Column, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
-from flask_devkit.core.mixins import TimestampMixin, UUIDMixin
+from flask_devkit.core.mixins import FullTextSearchMixin, TimestampMixin, UUIDMixin
 from flask_devkit.database import db
 
 
-class Post(db.Model, TimestampMixin, UUIDMixin):
+class Post(db.Model, TimestampMixin, UUIDMixin, FullTextSearchMixin):
     __tablename__ = "posts"
+    # Indexed for the `search__` filter operator.
+    __searchable__ = ("title", "content")
 
     id = Column(Integer, primary_key=True)
     title = Column(String(120), nullable=False)
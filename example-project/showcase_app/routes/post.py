@@ -18,6 +18,8 @@ post_routes_config = {
     "delete": {"permission": "delete:post"},
     "list": {"auth_required": False},  # Make posts list public
     "get": {"auth_required": False},  # Make single post public
+    # Per-author post counts, e.g. GET /posts/stats?group_by=author_id
+    "stats": {"enabled": True, "group_by": ["author_id"]},
 }
 
 register_crud_routes(
@@ -40,4 +40,6 @@ post_schemas = create_crud_schemas(
     excluded_input_fields=["author_id", "author"],
     # Only title and content can be updated
     allowed_update_fields=["title", "content"],
+    # Filterable on the list route, e.g. ?content=search__flask
+    query_schema_fields=["title", "content"],
 )
@@ -30,3 +30,23 @@ def test_user_endpoints_are_public(client):
     """
     response = client.get("/api/v1/users/")
     assert response.status_code == 200
+
+
+def test_posts_can_be_searched(client, app):
+    """
+    Tests that the posts list matches words through the full-text index.
+    """
+    from flask_devkit.database import db
+    from showcase_app.models.post import Post
+
+    db.session.add_all(
+        [
+            Post(title="Flask tips", content="Blueprints and hooks", author_id=1),
+            Post(title="Cooking", content="Slow roasted tomatoes", author_id=1),
+        ]
+    )
+    db.session.commit()
+
+    response = client.get("/api/v1/posts/?content=search__hooks")
+    assert response.status_code == 200
+    assert [post["title"] for post in response.json["items"]] == ["Flask tips"]
@@ -131,11 +131,17 @@ class DevKit:
 
     def _register_cli(self, app: APIFlask):
         """Register CLI commands."""
-        from .core.cli import drop_db_command, init_db_command, truncate_db_command
+        from .core.cli import (
+            drop_db_command,
+            index_advice_command,
+            init_db_command,
+            truncate_db_command,
+        )
 
         app.cli.add_command(init_db_command)
         app.cli.add_command(truncate_db_command)
         app.cli.add_command(drop_db_command)
+        app.cli.add_command(index_advice_command)
 
         if self.get_service("user"):
             from .users.cli import main as seed_command
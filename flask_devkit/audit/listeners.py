@@ -1,11 +1,12 @@
 import datetime
 from flask import g
 from flask_jwt_extended import get_jwt
-from sqlalchemy import event
+from sqlalchemy import and_, event, insert, select, tuple_
 from sqlalchemy.orm import Session, object_session, RelationshipProperty
 from sqlalchemy.inspection import inspect
 
 from flask_devkit.audit.models import AuditLog
+from flask_devkit.core.soft_delete import active_unique_where
 
 def get_current_user_id():
     """Tries to get the current user's ID from flask.g or JWT token."""
@@ -55,6 +56,205 @@ def before_flush(session, flush_context, instances):
         if not isinstance(instance, AuditLog):
             _create_audit_log(instance, 'DELETE')
 
+@event.listens_for(Session, 'do_orm_execute')
+def audit_bulk_insert(orm_execute_state):
+    """
+    Log rows inserted by ORM bulk INSERT statements, which bypass the flush.
+    Where the database supports RETURNING, the entries are built from the
+    inserted rows, so they include generated keys and column defaults.
+    """
+    if not orm_execute_state.is_insert:
+        return
+    mapper = orm_execute_state.bind_mapper
+    params = orm_execute_state.parameters
+    if mapper is None or mapper.class_ is AuditLog or not params:
+        return
+    rows = [params] if isinstance(params, dict) else params
+    upsert_keys = orm_execute_state.execution_options.get("devkit_upsert_keys")
+    if upsert_keys:
+        return _audit_upsert(orm_execute_state, mapper, rows, upsert_keys)
+
+    session = orm_execute_state.session
+    statement = orm_execute_state.statement
+    dialect = session.get_bind(mapper=mapper).dialect
+    result = None
+    if (
+        dialect.insert_executemany_returning
+        if len(rows) > 1
+        else dialect.insert_returning
+    ):
+        attrs = list(mapper.column_attrs)
+        if not statement._returning:
+            orm_execute_state.statement = statement.returning(
+                *[attr.columns[0] for attr in attrs], sort_by_parameter_order=True
+            )
+        frozen = orm_execute_state.invoke_statement().freeze()
+        result = frozen()
+        inserted = []
+        for row in frozen():
+            entity = next((e for e in row if isinstance(e, mapper.class_)), None)
+            if entity is not None:
+                state = inspect(entity).dict
+                inserted.append({attr.key: state.get(attr.key) for attr in attrs})
+            elif not statement._returning:
+                inserted.append({attr.key: v for attr, v in zip(attrs, row)})
+        # Otherwise the statement returns some columns only: log its params.
+        if inserted or not statement._returning:
+            rows = inserted
+
+    user_id = get_current_user_id()
+    pk_keys = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+    audit_rows = [
+        {
+            "user_id": user_id,
+            "action": 'CREATE',
+            "table_name": mapper.local_table.name,
+            "record_pk": ",".join(str(row.get(key)) for key in pk_keys),
+            "old_values": {},
+            "new_values": {k: _serialize_value(v) for k, v in row.items()},
+        }
+        for row in rows
+    ]
+    if audit_rows:
+        session.execute(insert(AuditLog), audit_rows)
+    return result
+
+def _snapshot_rows(session, mapper, criteria, params=None):
+    """Returns the column values of the rows matching `criteria`, keyed by PK."""
+    attrs = list(mapper.column_attrs)
+    pk_keys = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+    rows = session.execute(
+        select(*[attr.columns[0] for attr in attrs]).where(criteria), params or {}
+    ).all()
+    snapshot = {}
+    for row in rows:
+        values = {attr.key: value for attr, value in zip(attrs, row)}
+        snapshot[tuple(values[key] for key in pk_keys)] = values
+    return snapshot
+
+def _in_criteria(columns, keys):
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    return tuple_(*columns).in_(keys)
+
+def _pk_criteria(mapper, pks):
+    return _in_criteria(list(mapper.primary_key), pks)
+
+def _audit_upsert(orm_execute_state, mapper, rows, upsert_keys):
+    """
+    Log rows written by an upsert: rows that did not exist before the
+    statement are logged as CREATE, existing rows it changed as UPDATE and
+    rows skipped on conflict not at all.
+    """
+    session = orm_execute_state.session
+    table = mapper.local_table
+    columns = [table.c[name] for name in upsert_keys]
+    keys = list({tuple(row.get(name) for name in upsert_keys) for row in rows})
+    # Only the rows a partial unique index covers can conflict (e.g. the
+    # active ones, as a deleted user's username may be taken again).
+    active = active_unique_where(table, upsert_keys)
+
+    def snapshot():
+        rows_by_pk = {}
+        for start in range(0, len(keys), 500):
+            criteria = _in_criteria(columns, keys[start : start + 500])
+            if active is not None:
+                criteria = and_(criteria, active)
+            rows_by_pk.update(_snapshot_rows(session, mapper, criteria))
+        return rows_by_pk
+
+    before = snapshot()
+    result = orm_execute_state.invoke_statement()
+    after = snapshot()
+
+    user_id = get_current_user_id()
+    table_name = table.name
+    audit_rows = []
+    for pk, new in after.items():
+        old = before.get(pk, {})
+        changed = [k for k in new if k not in old or new[k] != old[k]]
+        if not changed:
+            continue
+        audit_rows.append(
+            {
+                "user_id": user_id,
+                "action": 'UPDATE' if old else 'CREATE',
+                "table_name": table_name,
+                "record_pk": ",".join(map(str, pk)),
+                "old_values": {k: _serialize_value(old[k]) for k in changed if old},
+                "new_values": {k: _serialize_value(new[k]) for k in changed},
+            }
+        )
+    if audit_rows:
+        session.execute(insert(AuditLog), audit_rows)
+    return result
+
+@event.listens_for(Session, 'do_orm_execute')
+def audit_bulk_update_delete(orm_execute_state):
+    """
+    Log rows changed by ORM UPDATE/DELETE statements with WHERE criteria
+    (e.g. `update_where`), which bypass the flush. The matching rows are read
+    before and after the statement runs so each row gets its own log entry.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    params = orm_execute_state.parameters
+    criteria = orm_execute_state.statement.whereclause
+    if (
+        mapper is None
+        or mapper.class_ is AuditLog
+        or criteria is None
+        or isinstance(params, list)  # bulk UPDATE by primary key
+    ):
+        return
+
+    session = orm_execute_state.session
+    before = _snapshot_rows(session, mapper, criteria, params)
+    if not before:
+        return
+    result = orm_execute_state.invoke_statement()
+
+    user_id = get_current_user_id()
+    table_name = mapper.local_table.name
+    audit_rows = []
+    if orm_execute_state.is_delete:
+        for pk, old in before.items():
+            audit_rows.append(
+                {
+                    "user_id": user_id,
+                    "action": 'DELETE',
+                    "table_name": table_name,
+                    "record_pk": ",".join(map(str, pk)),
+                    "old_values": {k: _serialize_value(v) for k, v in old.items()},
+                    "new_values": {},
+                }
+            )
+    else:
+        after = {}
+        pks = list(before)
+        for start in range(0, len(pks), 500):
+            chunk = pks[start : start + 500]
+            after.update(_snapshot_rows(session, mapper, _pk_criteria(mapper, chunk)))
+        for pk, old in before.items():
+            new = after.get(pk, {})
+            changed = [k for k in new if new[k] != old[k]]
+            if not changed:
+                continue
+            audit_rows.append(
+                {
+                    "user_id": user_id,
+                    "action": 'UPDATE',
+                    "table_name": table_name,
+                    "record_pk": ",".join(map(str, pk)),
+                    "old_values": {k: _serialize_value(old[k]) for k in changed},
+                    "new_values": {k: _serialize_value(new[k]) for k in changed},
+                }
+            )
+    if audit_rows:
+        session.execute(insert(AuditLog), audit_rows)
+    return result
+
 def _create_audit_log(instance, action):
     """Helper function to create and add an audit log to the session."""
     session = object_session(instance)
@@ -0,0 +1,425 @@
+# flask_devkit/core/cache.py
+"""
+In-process caches used by the repository layer.
+
+This module contains the CountCache used by `BaseRepository.paginate` to
+avoid re-running COUNT queries for repeated list requests. Cached counts are
+dropped whenever a session writes to one of the tables they were computed
+from, and expire after a TTL to bound staleness from writes made outside the
+ORM.
+
+It also contains the EntityCache, an opt-in second-level cache for
+`BaseRepository.get_by_id`/`get_by_uuid` that stores the column values of
+loaded entities in a pluggable backend. Entries are invalidated when a
+session that changed the entity (or ran a set-based UPDATE/DELETE on its
+table) commits.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_PENDING_TABLES_KEY = "_devkit_written_tables"
+_PENDING_ENTITIES_KEY = "_devkit_written_entities"
+
+
+def mapped_tables(model_or_instance: Any) -> Set[str]:
+    """Returns the names of all tables an entity class or instance maps to."""
+    mapper = inspect(model_or_instance)
+    mapper = getattr(mapper, "mapper", mapper)
+    return {table.name for table in mapper.tables if hasattr(table, "name")}
+
+
+def _normalize_filter_value(value: Any) -> Any:
+    if isinstance(value, str):
+        parts = sorted(part.strip() for part in value.split(",") if part.strip())
+        return ",".join(parts)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_filter_value(v) for v in value)
+    return str(value)
+
+
+class CountCache:
+    """
+    A thread-safe, size-bounded cache of query counts with per-entry TTL.
+
+    Entries are keyed by `(table name, normalized filters, deleted_state, ...)`
+    and remember which tables they depend on so that a write to any of those
+    tables invalidates them.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Set[str]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        model: Any, filters: Optional[Dict[str, Any]], deleted_state: str, *extra
+    ) -> Tuple:
+        normalized = tuple(
+            sorted(
+                (name, _normalize_filter_value(value))
+                for name, value in (filters or {}).items()
+            )
+        )
+        return (inspect(model).local_table.name, normalized, deleted_state, *extra)
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self, key: Hashable, value: int, ttl: float, tables: Iterable[str]
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value, set(tables))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> None:
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            stale = [k for k, (_, _, deps) in self._entries.items() if deps & tables]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+count_cache = CountCache()
+
+
+class MemoryCacheBackend:
+    """A thread-safe, size-bounded LRU store with per-entry TTL for one process."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + ttl if ttl else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    A store in a local SQLite file, shared by all worker processes on a host.
+
+    Values are pickled, so the file must only be writable by the application.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS devkit_cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads or processes.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[Any]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM devkit_cache "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.time() + ttl if ttl else None
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO devkit_cache (key, value, expires) "
+                "VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM devkit_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM devkit_cache")
+
+
+_entity_caches: "weakref.WeakSet[EntityCache]" = weakref.WeakSet()
+
+
+def _lookup_attributes(mapper: Any) -> List[str]:
+    """The attributes entities can be looked up by: the primary key and `uuid`."""
+    names = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+    if "uuid" in mapper.column_attrs:
+        names.append("uuid")
+    return names
+
+
+class EntityCache:
+    """
+    Caches the column values of entities by primary key and `uuid`.
+
+    Keys carry a per-table generation token, so a set-based write can
+    invalidate every entry of a table at once by replacing the token.
+    """
+
+    def __init__(self, backend: Optional[Any] = None, ttl: float = 300):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        _entity_caches.add(self)
+
+    def _generation(self, table: str) -> str:
+        key = f"{table}:generation"
+        generation = self.backend.get(key)
+        if generation is None:
+            # A lost token must never come back, or stale entries would too.
+            generation = uuid.uuid4().hex
+            self.backend.set(key, generation)
+        return generation
+
+    def _key(self, table: str, attribute: str, value: Any) -> str:
+        return f"{table}:{self._generation(table)}:{attribute}:{value}"
+
+    def get(self, model: Any, attribute: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Returns the cached column values of the entity, or None on a miss."""
+        table = inspect(model).local_table.name
+        values = self.backend.get(self._key(table, attribute, value))
+        with self._lock:
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return values
+
+    def put(self, entity: Any) -> None:
+        """Caches a loaded entity under all of its lookup attributes."""
+        state = inspect(entity)
+        mapper = state.mapper
+        if state.expired_attributes or any(
+            attr.key not in state.dict for attr in mapper.column_attrs
+        ):
+            return  # Only fully loaded entities can be rebuilt from the cache.
+        values = {attr.key: state.dict[attr.key] for attr in mapper.column_attrs}
+        table = mapper.local_table.name
+        for attribute in _lookup_attributes(mapper):
+            if values.get(attribute) is not None:
+                key = self._key(table, attribute, values[attribute])
+                self.backend.set(key, values, self.ttl)
+
+    def invalidate(self, table: str, lookups: Iterable[Tuple[str, Any]]) -> None:
+        """Drops the entries of `table` for the given (attribute, value) pairs."""
+        for attribute, value in lookups:
+            self.backend.delete(self._key(table, attribute, value))
+
+    def invalidate_table(self, table: str) -> None:
+        self.backend.set(f"{table}:generation", uuid.uuid4().hex)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+def has_pending_writes(session: Session, model: Any) -> bool:
+    """
+    Returns True if `session` holds uncommitted changes to `model`'s tables.
+    Counts computed in such a session include rows other sessions cannot see
+    yet and must not be shared through the cache.
+    """
+    tables = mapped_tables(model)
+    if tables & session.info.get(_PENDING_TABLES_KEY, set()):
+        return True
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if tables & mapped_tables(instance):
+            return True
+    return False
+
+
+def session_has_writes(session: Session) -> bool:
+    """Returns True if `session` holds changes that were not committed yet."""
+    return bool(
+        session.info.get(_PENDING_TABLES_KEY)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+def _mark_written(session: Session, tables: Set[str]) -> None:
+    if not tables:
+        return
+    session.info.setdefault(_PENDING_TABLES_KEY, set()).update(tables)
+    count_cache.invalidate_tables(tables)
+
+
+def _entity_lookups(instance: Any) -> Optional[List[Tuple[str, Any]]]:
+    """
+    Returns the (attribute, value) pairs a flushed instance may be cached
+    under, including values it had before the flush, or None if they are not
+    all known without loading.
+    """
+    state = inspect(instance)
+    lookups = []
+    for attribute in _lookup_attributes(state.mapper):
+        history = state.attrs[attribute].history
+        values = [*history.added, *history.unchanged, *history.deleted]
+        if not values:
+            return None
+        lookups.extend((attribute, value) for value in values if value is not None)
+    return lookups
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_after_flush(session, flush_context):
+    tables: Set[str] = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tables |= mapped_tables(instance)
+    _mark_written(session, tables)
+
+    if not _entity_caches:
+        return
+    pending = session.info.setdefault(_PENDING_ENTITIES_KEY, [])
+    for instance in (*session.dirty, *session.deleted):
+        table = inspect(instance).mapper.local_table.name
+        pending.append((table, _entity_lookups(instance)))
+
+
+def _is_upsert(orm_execute_state) -> bool:
+    """Whether an INSERT may update existing rows on conflict."""
+    if orm_execute_state.execution_options.get("devkit_upsert_keys"):
+        return True
+    # ON CONFLICT DO UPDATE / ON DUPLICATE KEY UPDATE of dialect inserts.
+    statement = orm_execute_state.statement
+    return getattr(statement, "_post_values_clause", None) is not None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_after_bulk_statement(orm_execute_state):
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and hasattr(table, "name"):
+        session = orm_execute_state.session
+        _mark_written(session, {table.name})
+        if _entity_caches and (
+            not orm_execute_state.is_insert or _is_upsert(orm_execute_state)
+        ):
+            # The rows touched by a set-based write or upsert are unknown.
+            session.info.setdefault(_PENDING_ENTITIES_KEY, []).append(
+                (table.name, None)
+            )
+
+
+def _invalidate_entities(session: Session) -> None:
+    for table, lookups in session.info.pop(_PENDING_ENTITIES_KEY, []):
+        for cache in list(_entity_caches):
+            if lookups is None:
+                cache.invalidate_table(table)
+            else:
+                cache.invalidate(table, lookups)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    count_cache.invalidate_tables(session.info.pop(_PENDING_TABLES_KEY, set()))
+    _invalidate_entities(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_after_rollback(session, previous_transaction):
+    count_cache.invalidate_tables(session.info.pop(_PENDING_TABLES_KEY, set()))
+    # Pending entity invalidations are kept: applying them at the next commit
+    # is harmless, while dropping them after a SAVEPOINT rollback is not.
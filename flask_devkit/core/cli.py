@@ -5,6 +5,7 @@ from flask.cli import with_appcontext
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import make_url
 
+from flask_devkit.core.usage import read_usage_file, recommend_indexes, usage_recorder
 from flask_devkit.database import db
 
 
@@ -80,3 +81,44 @@ This action cannot be undone."""
 
     else:
         click.echo(f"Driver '{url.drivername}' is not supported by this command.")
+
+
+@click.command("devkit-index-advice")
+@click.option("--limit", default=10, show_default=True, help="Maximum suggestions.")
+@click.option(
+    "--usage-file",
+    default=None,
+    help="Query usage file to analyse. Defaults to DEVKIT_QUERY_USAGE_FILE.",
+)
+@with_appcontext
+def index_advice_command(limit, usage_file):
+    """Recommend indexes for the filters and sorts used by list queries."""
+    path = usage_file or current_app.config.get("DEVKIT_QUERY_USAGE_FILE")
+    if path:
+        usage_recorder.join()
+        usage_recorder.flush(path)
+        usage = read_usage_file(path)
+    else:
+        usage = usage_recorder.snapshot()
+    if not usage:
+        click.echo("No query usage has been recorded yet.")
+        return
+
+    tables = {}
+    for metadata in db.metadatas.values():
+        tables.update(metadata.tables)
+    advice = recommend_indexes(usage, tables)[:limit]
+    if not advice:
+        click.echo("Existing indexes cover all recorded filter and sort columns.")
+        return
+
+    quote = db.engine.dialect.identifier_preparer.quote
+    for number, item in enumerate(advice, 1):
+        name = quote(f"ix_{item.table}_{'_'.join(item.columns)}")
+        columns = ", ".join(quote(column) for column in item.columns)
+        click.echo(f"{number}. CREATE INDEX {name} ON {quote(item.table)} ({columns});")
+        click.echo(
+            f"   {item.calls} calls, avg {item.average_seconds * 1000:.1f} ms, "
+            f"max {item.max_seconds * 1000:.1f} ms, "
+            f"{item.share:.0%} of recorded list query time"
+        )
@@ -77,6 +77,36 @@ class DuplicateEntryError(AppBaseException):
         self.original_exception = original_exception
 
 
+class InvalidFilterError(AppBaseException):
+    """Raised when a filter value cannot be converted to its column's type."""
+
+    status_code = 422
+    error_code = "INVALID_FILTER"
+
+    def __init__(self, field: str, value: Any, message: str | None = None):
+        super().__init__(
+            message or f"Invalid value '{value}' for filter field '{field}'.",
+            status_code=422,
+            error_code=self.error_code,
+            payload={"field": field, "value": str(value)},
+        )
+
+
+class InvalidAggregateError(AppBaseException):
+    """Raised when an aggregate names an unknown or disallowed field or function."""
+
+    status_code = 422
+    error_code = "INVALID_AGGREGATE"
+
+    def __init__(self, field: str, message: str | None = None):
+        super().__init__(
+            message or f"Cannot aggregate on '{field}'.",
+            status_code=422,
+            error_code=self.error_code,
+            payload={"field": field},
+        )
+
+
 class BusinessLogicError(AppBaseException):
     """Raised for general business logic violations that
     are not covered by other exceptions."""
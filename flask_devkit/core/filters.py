@@ -0,0 +1,321 @@
+# flask_devkit/core/filters.py
+"""
+Compiles the repository filter mini-language into reusable filter plans.
+
+Filters are dictionaries of `{"field": "op__value,op__value"}` where the
+conditions for one field are OR-ed together and different fields are AND-ed.
+Resolving fields and operators against the model and building the SQL
+expressions is done once per (model, fields, operators) signature and cached
+as a FilterPlan whose clauses use named bind parameters. Applying a filter
+then only parses the values and returns them as execution parameters.
+"""
+
+import datetime
+import logging
+import uuid
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import (
+    CHAR,
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    Numeric,
+    Uuid,
+    bindparam,
+    or_,
+)
+
+from flask_devkit.core.exceptions import InvalidFilterError
+from flask_devkit.core.search import (
+    SearchMatch,
+    SearchRank,
+    is_searchable,
+    search_terms,
+)
+
+logger = logging.getLogger(__name__)
+
+Signature = Tuple[Tuple[str, Tuple[str, ...]], ...]
+Values = Tuple[Tuple[Any, ...], ...]
+
+OPERATORS = ("eq", "ne", "lt", "lte", "gt", "gte", "like", "ilike", "in", "search")
+
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on"})
+_FALSE_VALUES = frozenset({"false", "0", "no", "off"})
+
+_COMPARISONS = {
+    "eq": "__eq__",
+    "ne": "__ne__",
+    "lt": "__lt__",
+    "lte": "__le__",
+    "gt": "__gt__",
+    "gte": "__ge__",
+}
+
+
+def _warn(message: str) -> None:
+    (current_app.logger if has_app_context() else logger).warning(message)
+
+
+def parse_filters(filters: Optional[Dict[str, Any]]) -> Tuple[Signature, Values]:
+    """
+    Splits a filters dict into its signature (field names and operators) and
+    the raw values to bind. Non-string values are treated as a single
+    equality condition. A list of condition strings for one field produces
+    one OR-group per element, AND-ed together (e.g. a range).
+    """
+    signature = []
+    values = []
+    for field_name, conditions_value in (filters or {}).items():
+        groups = (
+            conditions_value
+            if isinstance(conditions_value, (list, tuple))
+            else [conditions_value]
+        )
+        for group in groups:
+            ops: List[str] = []
+            raw_values: List[Any] = []
+            if isinstance(group, str):
+                for condition in group.split(","):
+                    condition = condition.strip()
+                    if not condition:
+                        continue
+                    parts = condition.split("__", 1)
+                    op, value = ("eq", parts[0]) if len(parts) == 1 else parts
+                    ops.append(op.strip())
+                    raw_values.append(value.strip())
+            else:
+                ops.append("eq")
+                raw_values.append(group)
+            signature.append((field_name, tuple(ops)))
+            values.append(tuple(raw_values))
+    return tuple(signature), tuple(values)
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+def _parse_datetime(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.strip())
+
+
+def _parse_date(value: str) -> datetime.date:
+    return datetime.date.fromisoformat(value.strip())
+
+
+def _parse_uuid_string(value: str) -> str:
+    return str(uuid.UUID(value.strip()))
+
+
+def _type_converter(column_type: Any) -> Optional[Callable[[str], Any]]:
+    """Returns the function parsing a string into `column_type`'s Python type."""
+    if isinstance(column_type, Boolean):
+        return _parse_bool
+    if isinstance(column_type, Integer):
+        return int
+    if isinstance(column_type, Float):
+        return float
+    if isinstance(column_type, Numeric):
+        return Decimal
+    if isinstance(column_type, DateTime):
+        return _parse_datetime
+    if isinstance(column_type, Date):
+        return _parse_date
+    if isinstance(column_type, Uuid):
+        return uuid.UUID if column_type.as_uuid else _parse_uuid_string
+    if isinstance(column_type, CHAR) and column_type.length == 36:
+        # UUIDMixin stores UUIDs as CHAR(36).
+        return _parse_uuid_string
+    return None
+
+
+def _column_coercer(field_name: str, attribute: Any) -> Callable[[Any], Any]:
+    """
+    Returns a function converting raw filter values to the column's Python
+    type, so that values are bound with the column's type and comparisons can
+    use its indexes. Malformed values raise InvalidFilterError.
+    """
+    prop = getattr(attribute, "property", None)
+    columns = getattr(prop, "columns", None)
+    convert = _type_converter(columns[0].type) if columns else None
+    if convert is None:
+        return lambda value: value
+
+    def coerce(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        try:
+            return convert(value)
+        except (ValueError, TypeError, InvalidOperation) as e:
+            raise InvalidFilterError(field_name, value) from e
+
+    return coerce
+
+
+def _condition(
+    op: str, column: Any, coerce: Callable[[Any], Any], param_name: str
+) -> Optional[Tuple[Any, Callable[[Any], Any]]]:
+    """
+    Returns the prebuilt clause for one condition together with the function
+    that turns a raw value into the clause's bound parameter value.
+    """
+    if op in ("like", "ilike"):
+        param = bindparam(param_name)
+        clause = column.ilike(param) if op == "ilike" else column.like(param)
+        return clause, lambda value: f"%{value}%"
+    if op == "in":
+        clause = column.in_(bindparam(param_name, expanding=True))
+        return clause, lambda value: [
+            coerce(v.strip()) for v in str(value).split("|")
+        ]
+    if op == "search" and is_searchable(column):
+        column = column.__clause_element__()
+        clause = SearchMatch(column, bindparam(param_name, type_=column.type))
+        return clause, _search_converter(column)
+    if op in _COMPARISONS:
+        clause = getattr(column, _COMPARISONS[op])(bindparam(param_name))
+        return clause, coerce
+    return None
+
+
+def _search_converter(column: Any) -> Callable[[Any], Any]:
+    def convert(value: Any) -> str:
+        try:
+            return search_terms(value)
+        except ValueError as e:
+            raise InvalidFilterError(column.key, value) from e
+
+    return convert
+
+
+class FilterPlan(NamedTuple):
+    """
+    A compiled filter for one model and filter signature.
+
+    `clauses` are built once with named bind parameters; `binders` hold, per
+    field and condition, the parameter name and the value converter used by
+    `bind` (None for conditions with an unknown operator). Unknown fields and
+    (field, operator) pairs are kept so that strict callers can reject them.
+    `rankings` score the rows matched by `search` conditions, sharing their
+    bind parameters.
+    """
+
+    clauses: Tuple[Any, ...]
+    binders: Tuple[Tuple[Optional[Tuple[str, Callable[[Any], Any]]], ...], ...]
+    unknown_fields: Tuple[str, ...]
+    unknown_operators: Tuple[Tuple[str, str], ...] = ()
+    rankings: Tuple[Any, ...] = ()
+
+    def check(self) -> None:
+        """Raises InvalidFilterError if the plan ignores any condition."""
+        if self.unknown_fields:
+            field_name = self.unknown_fields[0]
+            raise InvalidFilterError(
+                field_name, field_name, f"Unknown filter field '{field_name}'."
+            )
+        if self.unknown_operators:
+            field_name, op = self.unknown_operators[0]
+            raise InvalidFilterError(
+                field_name, op, f"Unknown filter operator '{op}'."
+            )
+
+    def bind(self, values: Values) -> Dict[str, Any]:
+        """Returns the bound parameter values for the plan's clauses."""
+        params = {}
+        for field_binders, field_values in zip(self.binders, values):
+            for binder, value in zip(field_binders, field_values):
+                if binder is not None:
+                    name, convert = binder
+                    params[name] = convert(value)
+        return params
+
+
+@lru_cache(maxsize=512)
+def compile_filter_plan(model: Any, signature: Signature) -> FilterPlan:
+    """Resolves columns, coercers and operators for a filter signature."""
+    clauses = []
+    binders = []
+    unknown: List[str] = []
+    unknown_ops: List[Tuple[str, str]] = []
+    rankings = []
+    for field_index, (field_name, ops) in enumerate(signature):
+        attribute = getattr(model, field_name, None)
+        if attribute is None or not hasattr(attribute, "__clause_element__"):
+            _warn(
+                f"Filter field '{field_name}' "
+                f"does not exist on model '{model.__name__}'"
+            )
+            binders.append(())
+            unknown.append(field_name)
+            continue
+
+        coerce = _column_coercer(field_name, attribute)
+        conditions = []
+        field_binders = []
+        for op_index, op in enumerate(ops):
+            param_name = f"flt_{field_index}_{op_index}"
+            condition = _condition(op, attribute, coerce, param_name)
+            if condition is None:
+                _warn(f"Unknown filter operator: {op}")
+                field_binders.append(None)
+                unknown_ops.append((field_name, op))
+                continue
+            clause, convert = condition
+            conditions.append(clause)
+            field_binders.append((param_name, convert))
+            if isinstance(clause, SearchMatch):
+                rankings.append(SearchRank(clause.column, clause.terms))
+        if conditions:
+            clauses.append(or_(*conditions))
+        binders.append(tuple(field_binders))
+    return FilterPlan(
+        tuple(clauses),
+        tuple(binders),
+        tuple(unknown),
+        tuple(unknown_ops),
+        tuple(rankings),
+    )
+
+
+def build_filter_criteria(
+    model: Any, filters: Optional[Dict[str, Any]], strict: bool = False
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """
+    Parses `filters` and returns the WHERE clauses for `model` together with
+    the parameter values to execute them with.
+
+    Unknown fields and operators are skipped with a warning, unless `strict`
+    is set (as for bulk writes, where ignoring a condition would widen the
+    set of affected rows); then they raise InvalidFilterError.
+    """
+    if not filters:
+        return (), {}
+    _, plan, params = resolve_filters(model, filters, strict=strict)
+    return plan.clauses, params
+
+
+def resolve_filters(
+    model: Any, filters: Optional[Dict[str, Any]], strict: bool = False
+) -> Tuple[Signature, FilterPlan, Dict[str, Any]]:
+    """
+    Like build_filter_criteria, but returns the filter signature and the
+    cached plan itself, for callers that also cache what they build from
+    the plan's clauses.
+    """
+    signature, values = parse_filters(filters)
+    plan = compile_filter_plan(model, signature)
+    if strict:
+        plan.check()
+    return signature, plan, plan.bind(values)
@@ -0,0 +1,106 @@
+# flask_devkit/core/loader.py
+"""
+Batches individual entity lookups into one query.
+
+A BatchLoader collects the keys requested through `load` and resolves all of
+them with a single call to its batch function (e.g.
+`BaseService.get_many_by_uuids`) the first time one of the results is needed.
+Results are cached per loader, and `get_loader` keeps one loader per service
+and key field for the duration of the current request (or app context), so
+repeated lookups of the same entity within a request hit the database once.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from flask import g, has_app_context
+
+_LOADERS_KEY = "_devkit_loaders"
+
+
+class LoaderResult:
+    """A pending result of `BatchLoader.load`, resolved on first access."""
+
+    __slots__ = ("_loader", "_key")
+
+    def __init__(self, loader: "BatchLoader", key: Hashable):
+        self._loader = loader
+        self._key = key
+
+    def get(self) -> Optional[Any]:
+        """Returns the loaded entity, dispatching pending keys if needed."""
+        return self._loader._resolve(self._key)
+
+
+class BatchLoader:
+    """
+    Coalesces lookups by key into batched calls of `batch_fn`.
+
+    `batch_fn` receives a list of unique keys and must return a list of the
+    same length with the entity for each key, or None if it does not exist.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Optional[Any]]]):
+        self.batch_fn = batch_fn
+        self._pending: Dict[Hashable, None] = {}
+        self._results: Dict[Hashable, Optional[Any]] = {}
+
+    def load(self, key: Hashable) -> LoaderResult:
+        """Queues `key` for the next batch and returns its pending result."""
+        if key not in self._results:
+            self._pending[key] = None
+        return LoaderResult(self, key)
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[LoaderResult]:
+        return [self.load(key) for key in keys]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Loads a single key, together with any other queued keys."""
+        return self.load(key).get()
+
+    def get_many(self, keys: Iterable[Hashable]) -> List[Optional[Any]]:
+        """Loads `keys` in one batch and returns the entities in input order."""
+        return [result.get() for result in self.load_many(keys)]
+
+    def prime(self, key: Hashable, value: Optional[Any]) -> None:
+        """Stores a known result, e.g. an entity that was just created."""
+        self._pending.pop(key, None)
+        self._results[key] = value
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """Forgets the cached result for `key`, or all results."""
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+
+    def dispatch(self) -> None:
+        """Resolves all queued keys with one call to the batch function."""
+        if not self._pending:
+            return
+        keys = list(self._pending)
+        self._pending.clear()
+        self._results.update(zip(keys, self.batch_fn(keys)))
+
+    def _resolve(self, key: Hashable) -> Optional[Any]:
+        if key not in self._results:
+            self._pending[key] = None
+            self.dispatch()
+        return self._results[key]
+
+
+def get_loader(
+    owner: Any, field: str, batch_fn: Callable[[List[Any]], List[Optional[Any]]]
+) -> BatchLoader:
+    """
+    Returns the BatchLoader for `owner` and `field` in the current request,
+    creating it on first use. Outside of an app context a new, unshared
+    loader is returned.
+    """
+    if not has_app_context():
+        return BatchLoader(batch_fn)
+    loaders = g.setdefault(_LOADERS_KEY, {})
+    key = (id(owner), field)
+    loader = loaders.get(key)
+    if loader is None:
+        loader = loaders[key] = BatchLoader(batch_fn)
+    return loader
@@ -8,8 +8,11 @@ to quickly add common columns and functionality to your models.
 
 import uuid
 
-from sqlalchemy import CHAR, INTEGER, TIMESTAMP, Column, func, text
-from sqlalchemy.orm import declarative_mixin
+from sqlalchemy import CHAR, INTEGER, TIMESTAMP, Column, event, func, text
+from sqlalchemy.orm import Session, declarative_mixin
+
+from flask_devkit.core.search import install_search_index
+from flask_devkit.core.soft_delete import exclude_soft_deleted, install_active_indexes
 
 
 def generate_uuid() -> str:
@@ -26,10 +29,19 @@ class IDMixin:
 
 @declarative_mixin
 class UUIDMixin:
-    """Adds a unique, indexed, and auto-generating UUID column."""
+    """Adds a unique, indexed, and auto-generating UUID column.
+
+    The column is marked as an insert sentinel so that bulk INSERT ... RETURNING
+    statements can match returned rows to their parameters in a single batch.
+    """
 
     uuid = Column(
-        CHAR(36), unique=True, nullable=False, index=True, default=generate_uuid
+        CHAR(36),
+        unique=True,
+        nullable=False,
+        index=True,
+        default=generate_uuid,
+        insert_sentinel=True,
     )
 
 
@@ -54,6 +66,45 @@ class TimestampMixin:
 
 @declarative_mixin
 class SoftDeleteMixin:
-    """Adds a `deleted_at` timestamp for implementing soft deletes."""
+    """Adds a `deleted_at` timestamp for implementing soft deletes.
+
+    `__active_unique__` and `__active_indexes__` declare unique and regular
+    indexes covering only active rows, given as column names or tuples of
+    column names (see `flask_devkit.core.soft_delete`).
+    """
+
+    __active_unique__: tuple = ()
+    __active_indexes__: tuple = ()
 
     deleted_at = Column(TIMESTAMP, nullable=True, index=True)
+
+
+@declarative_mixin
+class FullTextSearchMixin:
+    """Adds a full-text index over the columns named in `__searchable__`.
+
+    The index is created with the table (an FTS5 table kept in sync by
+    triggers on SQLite, GIN indexes on PostgreSQL) and is queried with the
+    `search__` filter operator. `__search_config__` names the PostgreSQL
+    text search configuration used to parse the text.
+    """
+
+    __searchable__: tuple = ()
+    __search_config__: str = "simple"
+
+
+event.listen(
+    FullTextSearchMixin,
+    "after_mapper_constructed",
+    install_search_index,
+    propagate=True,
+)
+
+event.listen(
+    SoftDeleteMixin,
+    "after_mapper_constructed",
+    install_active_indexes,
+    propagate=True,
+)
+
+event.listen(Session, "do_orm_execute", exclude_soft_deleted(SoftDeleteMixin))
@@ -0,0 +1,140 @@
+# flask_devkit/core/replicas.py
+"""
+Routes repository reads to read replicas.
+
+Replicas are Flask-SQLAlchemy binds (`SQLALCHEMY_BINDS`) listed in the
+`DEVKIT_READ_REPLICAS` config value. Statements executed with the
+`devkit_replica` execution option (set by the `BaseRepository` read methods)
+are sent to one of them, picked by `DEVKIT_REPLICA_STRATEGY`:
+
+- "round_robin" (default) cycles through the replicas;
+- "least_busy" picks the replica with the fewest checked-out connections.
+
+Reads stay on the primary while the session holds writes that were not
+committed yet, and for `DEVKIT_REPLICA_STICKY_SECONDS` (default 5) after a
+commit that wrote, so a client sees its own writes despite replication lag.
+Stickiness applies to the rest of the current request and to the current
+JWT identity across requests. The per-identity window is kept in process
+memory, so with several workers it only covers requests served by the same
+process.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, g, has_app_context, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from flask_devkit.core.cache import session_has_writes
+
+REPLICA_OPTION = "devkit_replica"
+
+_STICKY_REQUEST_KEY = "_devkit_sticky_primary"
+
+_round_robin = itertools.count()
+_sticky_until: Dict[str, float] = {}
+_sticky_lock = threading.Lock()
+
+
+def _replica_engines() -> List[Any]:
+    bind_keys = current_app.config.get("DEVKIT_READ_REPLICAS") or ()
+    if not bind_keys:
+        return []
+    engines = current_app.extensions["sqlalchemy"].engines
+    return [engines[key] for key in bind_keys]
+
+
+def _checked_out(engine: Any) -> int:
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout else 0
+
+
+def choose_replica(engines: List[Any]) -> Any:
+    """Picks the engine for the next read according to the configured strategy."""
+    strategy = current_app.config.get("DEVKIT_REPLICA_STRATEGY", "round_robin")
+    if strategy == "least_busy":
+        return min(engines, key=_checked_out)
+    if strategy != "round_robin":
+        raise ValueError(f"Unknown replica strategy: {strategy!r}")
+    return engines[next(_round_robin) % len(engines)]
+
+
+def _sticky_identity() -> Optional[str]:
+    try:
+        identity = get_jwt_identity()
+    except (RuntimeError, KeyError):
+        return None
+    return str(identity) if identity is not None else None
+
+
+def stick_to_primary() -> None:
+    """Sends the current request's and identity's reads to the primary for a while."""
+    if not has_app_context():
+        return
+    if has_request_context():
+        g.setdefault(_STICKY_REQUEST_KEY, True)
+    identity = _sticky_identity()
+    seconds = current_app.config.get("DEVKIT_REPLICA_STICKY_SECONDS", 5)
+    if identity is None or not seconds:
+        return
+    now = time.monotonic()
+    with _sticky_lock:
+        for key in [k for k, until in _sticky_until.items() if until <= now]:
+            del _sticky_until[key]
+        _sticky_until[identity] = now + seconds
+
+
+def is_sticky() -> bool:
+    """Whether reads must currently go to the primary after a recent write."""
+    if has_request_context() and g.get(_STICKY_REQUEST_KEY):
+        return True
+    identity = _sticky_identity()
+    if identity is None:
+        return False
+    with _sticky_lock:
+        return _sticky_until.get(identity, 0) > time.monotonic()
+
+
+def clear_stickiness() -> None:
+    with _sticky_lock:
+        _sticky_until.clear()
+
+
+def replica_bind(session: Session) -> Optional[Any]:
+    """
+    Returns the replica engine for the next read made through `session`, or
+    None if it must read from the primary.
+    """
+    if not has_app_context():
+        return None
+    engines = _replica_engines()
+    if not engines or session_has_writes(session) or is_sticky():
+        return None
+    return choose_replica(engines)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _route_read_to_replica(orm_execute_state):
+    if (
+        not orm_execute_state.is_select
+        or not orm_execute_state.execution_options.get(REPLICA_OPTION)
+        or "bind" in orm_execute_state.bind_arguments
+    ):
+        return
+    bind = replica_bind(orm_execute_state.session)
+    if bind is not None:
+        orm_execute_state.bind_arguments["bind"] = bind
+
+
+@event.listens_for(Session, "before_commit")
+def _stick_after_write(session):
+    if (
+        has_app_context()
+        and current_app.config.get("DEVKIT_READ_REPLICAS")
+        and session_has_writes(session)
+    ):
+        stick_to_primary()
@@ -6,18 +6,95 @@ This module contains the BaseRepository class which encapsulates common
 database operations (CRUD, pagination, filtering) for a given model.
 """
 
+import base64
 import datetime
+import json
 import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from functools import wraps
-from typing import Any, Dict, Generic, List, NamedTuple, Optional, Type, TypeVar
+from inspect import isgeneratorfunction
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from flask import current_app
-from sqlalchemy import func, inspect, or_
+from flask import current_app, has_app_context
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Engine,
+    Integer,
+    Result,
+    ScalarResult,
+    Select,
+    Text,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import DeclarativeMeta, Query, Session
+from sqlalchemy.orm import (
+    DeclarativeMeta,
+    Session,
+    joinedload,
+    make_transient_to_detached,
+    selectinload,
+)
+from sqlalchemy.orm import load_only as orm_load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
 
 from flask_devkit.core.archive import ArchivedRecord
-from flask_devkit.core.exceptions import DatabaseError, DuplicateEntryError
+from flask_devkit.core.cache import (
+    EntityCache,
+    count_cache,
+    has_pending_writes,
+    mapped_tables,
+    session_has_writes,
+)
+from flask_devkit.core.exceptions import (
+    BusinessLogicError,
+    DatabaseError,
+    DuplicateEntryError,
+    InvalidAggregateError,
+)
+from flask_devkit.core.filters import (
+    FilterPlan,
+    Signature,
+    build_filter_criteria,
+    resolve_filters,
+)
+from flask_devkit.core.replicas import REPLICA_OPTION, replica_bind
+from flask_devkit.core.soft_delete import INCLUDE_DELETED_OPTION, active_unique_where
+from flask_devkit.core.statements import statement_cache
+from flask_devkit.core.usage import record_query
 
 T = TypeVar("T", bound=DeclarativeMeta)
 
@@ -26,30 +103,238 @@ class PaginationResult(Generic[T], NamedTuple):
     """A structured result for paginated queries."""
 
     items: List[T]
-    total: int
+    total: Optional[int]
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int]
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _encode_cursor_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _invalid_cursor() -> BusinessLogicError:
+    return BusinessLogicError("Invalid pagination cursor.", error_code="INVALID_CURSOR")
+
+
+def _decode_cursor_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (list, dict)):
+        raise _invalid_cursor()
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return value
+    try:
+        if python_type is int and (
+            isinstance(value, bool) or not isinstance(value, int)
+        ):
+            raise TypeError("Cursor value is not an integer")
+        if python_type in (datetime.datetime, datetime.date, datetime.time):
+            return python_type.fromisoformat(value)
+        if python_type is Decimal:
+            return Decimal(value)
+    except (ValueError, TypeError, ArithmeticError) as e:
+        raise _invalid_cursor() from e
+    return value
+
+
+def encode_cursor(keys: List[str], values: List[Any], direction: str) -> str:
+    """Encodes a keyset position into an opaque, URL-safe cursor string."""
+    payload = {
+        "k": keys,
+        "v": [_encode_cursor_value(v) for v in values],
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decodes a cursor produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise _invalid_cursor() from e
+    if (
+        not isinstance(payload, dict)
+        or payload.get("d") not in ("next", "prev")
+        or not isinstance(payload.get("k"), list)
+        or not isinstance(payload.get("v"), list)
+        or not all(isinstance(key, str) for key in payload["k"])
+        or len(payload["k"]) != len(payload["v"])
+    ):
+        raise _invalid_cursor()
+    return payload
+
+
+def _archive_data(row: Any) -> Dict[str, Any]:
+    """The JSON payload of an archived row, with dates as ISO 8601 strings."""
+    return {
+        key: (
+            value.isoformat()
+            if isinstance(value, (datetime.date, datetime.time))
+            else value
+        )
+        for key, value in dict(row).items()
+    }
+
+
+def _in_keys(columns: List[Any], keys: List[Tuple[Any, ...]]) -> Any:
+    """Matches the rows whose `columns` values are one of the `keys` tuples."""
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    return tuple_(*columns).in_(keys)
+
+
+# The MySQL/MariaDB error code of a duplicate value for a unique key.
+_MYSQL_DUPLICATE_ENTRY = 1062
+
+PAGINATION_STRATEGIES = ("standard", "window", "parallel", "deferred_join")
+
+# Isolation levels under which a second connection sees the same committed
+# data as the session's own, so a count can run beside the page query.
+_STATEMENT_SNAPSHOT_LEVELS = frozenset(
+    {"AUTOCOMMIT", "READ COMMITTED", "READ UNCOMMITTED"}
+)
+
+_count_executor: Optional[ThreadPoolExecutor] = None
+_count_executor_lock = threading.Lock()
+
+
+def _parallel_count_executor() -> ThreadPoolExecutor:
+    """The thread pool running the COUNT queries of the "parallel" strategy."""
+    global _count_executor
+    with _count_executor_lock:
+        if _count_executor is None:
+            workers = (
+                current_app.config.get("DEVKIT_PARALLEL_COUNT_WORKERS", 4)
+                if has_app_context()
+                else 4
+            )
+            _count_executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="devkit-count"
+            )
+        return _count_executor
+
+
+def _timed_count(
+    bind: Engine, statement: Select, params: Dict[str, Any]
+) -> Tuple[int, float]:
+    """Runs a COUNT statement on its own connection of `bind`."""
+    started = time.perf_counter()
+    with Session(bind=bind) as session:
+        total = session.execute(
+            statement, params, bind_arguments={"bind": bind}
+        ).scalar()
+    return total, time.perf_counter() - started
+
+
+class _Criteria(NamedTuple):
+    """
+    The resolved WHERE criteria of a read: the filters and `deleted_state`
+    it was asked for, the cached filter plan and the parameter values to
+    execute it with.
+    """
+
+    filters: Optional[Dict[str, Any]]
+    deleted_state: str
+    signature: Signature
+    plan: FilterPlan
+    params: Dict[str, Any]
+
+    @property
+    def shape(self) -> Tuple[str, Signature]:
+        return self.deleted_state, self.signature
+
+
+def _paged(statement: Select) -> Select:
+    """Slices `statement` by the `page_offset` and `page_limit` parameters."""
+    return statement.offset(bindparam("page_offset", type_=Integer)).limit(
+        bindparam("page_limit", type_=Integer)
+    )
+
+
+def _page_params(criteria: _Criteria, offset: int, limit: int) -> Dict[str, Any]:
+    return {**criteria.params, "page_offset": offset, "page_limit": limit}
+
+
+EAGER_LOAD_STRATEGIES = {"selectin": selectinload, "joined": joinedload}
+
+AGGREGATE_FUNCTIONS = {
+    "count": func.count,
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+}
+
+
+def parse_metric(metric: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits an aggregate metric such as "sum:amount" into its function and
+    field name. A bare "count" counts rows and has no field.
+    """
+    function, _, field = metric.strip().partition(":")
+    function, field = function.strip().lower(), field.strip()
+    if function not in AGGREGATE_FUNCTIONS or (not field and function != "count"):
+        raise InvalidAggregateError(
+            metric, f"Invalid metric '{metric}'. Use 'count' or 'function:field'."
+        )
+    return function, field or None
+
+
+def metric_label(function: str, field: Optional[str]) -> str:
+    """The key a metric's value is returned under, e.g. "sum_amount"."""
+    return f"{function}_{field}" if field else function
 
 
 def handle_db_errors(func):
-    """Decorator that wraps repository methods to handle SQLAlchemy errors."""
+    """
+    Decorator that wraps repository methods to handle SQLAlchemy errors.
+    Generator methods are wrapped so that errors raised while iterating are
+    handled as well.
+    """
+
+    def handle(self, e):
+        if isinstance(e, IntegrityError):
+            raise DuplicateEntryError(original_exception=e) from e
+        current_app.logger.error(
+            f"Database error in {func.__name__} for {self.model.__name__}: {e}",
+            exc_info=True,
+        )
+        self._db_session.rollback()
+        raise DatabaseError(original_exception=e) from e
+
+    if isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            try:
+                yield from func(self, *args, **kwargs)
+            except SQLAlchemyError as e:
+                handle(self, e)
+
+        return generator_wrapper
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         try:
             return func(self, *args, **kwargs)
-        except IntegrityError as e:
-            raise DuplicateEntryError(original_exception=e) from e
         except SQLAlchemyError as e:
-            current_app.logger.error(
-                f"Database error in {func.__name__} for {self.model.__name__}: {e}",
-                exc_info=True,
-            )
-            self._db_session.rollback()
-            raise DatabaseError(original_exception=e) from e
+            handle(self, e)
 
     return wrapper
 
@@ -57,96 +342,617 @@ def handle_db_errors(func):
 class BaseRepository(Generic[T]):
     """
     Generic repository providing common CRUD operations for a SQLAlchemy model.
+
+    Attributes:
+        count_cache_ttl: Seconds to cache `paginate` totals for identical
+            filters. `None` falls back to the `DEVKIT_COUNT_CACHE_TTL` config
+            value; `0` disables caching.
+        pagination_strategy: How `paginate` fetches a page and its total.
+            "standard" runs a COUNT query followed by the page query;
+            "window" fetches both in one statement with `COUNT(*) OVER ()`,
+            falling back to "standard" when the dialect lacks window
+            functions or the requested page is empty; "parallel" runs the
+            COUNT on a second pooled connection while the session fetches
+            the page (see `_parallel_count_bind` for when it falls back);
+            "deferred_join" pages through primary keys only and then loads
+            the full rows for those keys, which keeps deep OFFSETs from
+            reading every skipped row.
+        in_chunk_size: Maximum number of values bound into one `IN` list by
+            the multi-get methods.
+        eager_load: Relationships to load together with the entities returned
+            by the read methods, as `{"path": "selectin" | "joined"}`, e.g.
+            `{"roles": "selectin", "roles.permissions": "selectin"}`.
+        entity_cache: An EntityCache serving `get_by_id`/`get_by_uuid`
+            lookups without a query. `None` (the default) disables it.
+            Lookups with `load_only` or eager loading bypass the cache.
     """
 
+    count_cache_ttl: Optional[float] = None
+    pagination_strategy: str = "standard"
+    in_chunk_size: int = 500
+    eager_load: Dict[str, str] = {}
+    entity_cache: Optional[EntityCache] = None
+
     def __init__(self, model: Type[T], db_session: Session):
         self.model = model
         self._db_session = db_session
 
     def _query(self):
+        """
+        Returns a legacy `Query` of the model. The read methods are built on
+        `_select()`, which keeps honouring an override of this method.
+        """
         return self._db_session.query(self.model)
 
-    def _filter_soft_deleted(self, query, deleted_state: str = "active"):
-        """Adds a filter to handle soft-deleted records."""
+    def _select(self) -> Select:
+        """
+        Returns the `select()` of the model every read method starts from.
+        Override it to scope all reads, e.g. by the current tenant.
+        """
+        if type(self)._query is not BaseRepository._query:
+            # Scoping added by overriding the legacy `_query()` still applies.
+            return self._query().statement
+        return select(self.model)
+
+    def _caches_statements(self) -> bool:
+        """
+        Whether the statements built on `_select()` can be reused across
+        calls. An overridden `_select()` or `_query()` may scope reads by
+        per-call values, so its statements are rebuilt for every call.
+        """
+        cls = type(self)
+        return (
+            cls._select is BaseRepository._select
+            and cls._query is BaseRepository._query
+        )
+
+    def _statement(self, shape: Tuple, build: Callable[[], Select]) -> Select:
+        """
+        Returns the statement made by `build`, reused from the statement cache
+        for later calls with the same `shape`. The shape must identify
+        everything the statement depends on other than the values of its
+        named bind parameters, which are passed when it is executed.
+        """
+        if not self._caches_statements():
+            return build()
+        return statement_cache.get_or_build((self.model, *shape), build)
+
+    def _read(self, statement: Select, params: Dict[str, Any]) -> Result:
+        """
+        Executes a pure read, which is routed to a read replica when
+        `DEVKIT_READ_REPLICAS` is configured.
+        """
+        return self._db_session.execute(
+            statement, params, execution_options={REPLICA_OPTION: True}
+        )
+
+    def _read_entities(
+        self, statement: Select, params: Dict[str, Any]
+    ) -> ScalarResult:
+        """Executes a pure read returning entities (see `_read`)."""
+        # Rows repeat an entity when a collection is eager loaded with a join.
+        return self._read(statement, params).scalars().unique()
+
+    def _eager_options(self, eager_load: Optional[Dict[str, str]] = None) -> List[Any]:
+        """
+        Builds relationship loader options from the repository's `eager_load`
+        configuration merged with `eager_load`. Keys are relationship paths
+        such as "roles" or "roles.permissions"; values are "selectin" or
+        "joined".
+        """
+        options = []
+        for path, strategy in {**self.eager_load, **(eager_load or {})}.items():
+            if strategy not in EAGER_LOAD_STRATEGIES:
+                raise ValueError(
+                    f"Unknown eager load strategy '{strategy}' for '{path}'. "
+                    f"Expected one of {EAGER_LOAD_STRATEGIES}."
+                )
+            loader = EAGER_LOAD_STRATEGIES[strategy]
+            option = None
+            mapper = inspect(self.model)
+            for name in path.split("."):
+                if name not in mapper.relationships:
+                    raise ValueError(
+                        f"'{path}' is not a relationship path of "
+                        f"{self.model.__name__}."
+                    )
+                relationship = mapper.relationships[name]
+                attribute = getattr(mapper.class_, name)
+                option = (
+                    loader(attribute)
+                    if option is None
+                    else getattr(option, loader.__name__)(attribute)
+                )
+                mapper = relationship.mapper
+            options.append(option)
+        return options
+
+    def _loader_options(
+        self,
+        statement: Select,
+        load_only: Optional[List[str]] = None,
+        required: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
+    ) -> Select:
+        """
+        Applies column projection and relationship eager loading to a
+        statement returning model entities.
+
+        With `load_only`, only those column attributes plus the `required`
+        ones and the primary key are loaded; all other columns are deferred
+        and load on first access.
+        """
+        options = self._loader_option_list(load_only, required, eager_load)
+        return statement.options(*options) if options else statement
+
+    def _loader_shape(
+        self,
+        load_only: Optional[List[str]] = None,
+        required: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
+    ) -> Tuple:
+        """The part of a statement's shape set by `_loader_options`."""
+        return (
+            tuple(load_only or ()),
+            tuple(required or ()) if load_only else (),
+            tuple({**self.eager_load, **(eager_load or {})}.items()),
+        )
+
+    def _loader_option_list(
+        self,
+        load_only: Optional[List[str]] = None,
+        required: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
+    ) -> List[Any]:
+        """Builds the loader options applied by `_loader_options`."""
+        options = self._eager_options(eager_load)
+        if load_only:
+            names = dict.fromkeys([*load_only, *(required or [])])
+            column_keys = {attr.key for attr in inspect(self.model).column_attrs}
+            attributes = [
+                getattr(self.model, name) for name in names if name in column_keys
+            ]
+            if attributes:
+                options.append(orm_load_only(*attributes))
+        return options
+
+    def _soft_delete_criteria(self, deleted_state: str = "active") -> List[Any]:
+        """Returns the clauses selecting rows in the given soft-delete state."""
         if hasattr(self.model, "deleted_at"):
             if deleted_state == "active":
-                return query.filter(self.model.deleted_at.is_(None))
+                return [self.model.deleted_at.is_(None)]
             elif deleted_state == "deleted_only":
-                return query.filter(self.model.deleted_at.is_not(None))
-        return query
-
-    def _apply_filters(self, query: Query, filters: Optional[Dict[str, str]]) -> Query:
-        if not filters:
-            return query
-
-        op_map = {
-            "eq": "__eq__",
-            "ne": "__ne__",
-            "lt": "__lt__",
-            "lte": "__le__",
-            "gt": "__gt__",
-            "gte": "__ge__",
-        }
+                return [self.model.deleted_at.is_not(None)]
+        return []
+
+    def _filter_criteria(
+        self, filters: Optional[Dict[str, Any]], strict: bool = False
+    ) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        """
+        Returns the WHERE clauses for `filters` from the cached filter plan and
+        the bound parameter values they must be executed with.
+        """
+        return build_filter_criteria(self.model, filters, strict=strict)
+
+    def _criteria(
+        self, filters: Optional[Dict[str, Any]], deleted_state: str
+    ) -> _Criteria:
+        """Resolves the criteria of a read of the rows matching `filters`."""
+        signature, plan, params = resolve_filters(self.model, filters)
+        return _Criteria(filters, deleted_state, signature, plan, params)
 
-        for field_name, conditions_string in filters.items():
-            if not hasattr(self.model, field_name):
-                current_app.logger.warning(
-                    f"Filter field '{field_name}' "
-                    f"does not exist on model '{self.model.__name__}'"
+    @staticmethod
+    def _deleted_state_options(deleted_state: str) -> Dict[str, Any]:
+        """
+        Returns the execution options of a read in `deleted_state`. Reads that
+        may return deleted rows opt out of the global active-row criterion
+        (`DEVKIT_SOFT_DELETE_CRITERIA`).
+        """
+        if deleted_state == "active":
+            return {}
+        return {INCLUDE_DELETED_OPTION: True}
+
+    def _where(self, criteria: _Criteria) -> Select:
+        """Returns `_select()` restricted to the rows matching `criteria`."""
+        return (
+            self._select()
+            .where(
+                *self._soft_delete_criteria(criteria.deleted_state),
+                *criteria.plan.clauses,
+            )
+            .execution_options(**self._deleted_state_options(criteria.deleted_state))
+        )
+
+    def _resolve_ordering(
+        self, order_by: Optional[List[str]] = None
+    ) -> List[Tuple[str, Any, bool]]:
+        """Resolves `order_by` into (field name, column, descending) tuples."""
+        resolved = []
+        for field in order_by or []:
+            descending = field.startswith("-")
+            column_name = field[1:] if descending else field
+            if hasattr(self.model, column_name):
+                resolved.append(
+                    (column_name, getattr(self.model, column_name), descending)
                 )
-                continue
+        return resolved
 
-            column = getattr(self.model, field_name)
-            clauses = []
+    def _apply_ordering(
+        self, statement: Select, order_by: Optional[List[str]] = None
+    ) -> Select:
+        for _, column, descending in self._resolve_ordering(order_by):
+            statement = statement.order_by(
+                column.desc() if descending else column.asc()
+            )
+        return statement
 
-            conditions = conditions_string.split(",")
-            for condition in conditions:
-                condition = condition.strip()
-                if not condition:
-                    continue
+    def _keyset_ordering(
+        self, order_by: Optional[List[str]] = None
+    ) -> List[Tuple[str, Any, bool]]:
+        """
+        Returns the ordering used for keyset pagination: the requested sort
+        columns followed by the primary key as a unique tie-breaker.
+        """
+        ordering = self._resolve_ordering(order_by)
+        mapper = inspect(self.model)
+        sorted_names = {name for name, _, _ in ordering}
+        for pk_column in mapper.primary_key:
+            pk_name = mapper.get_property_by_column(pk_column).key
+            if pk_name not in sorted_names:
+                ordering.append((pk_name, getattr(self.model, pk_name), False))
+        return ordering
 
-                parts = condition.split("__", 1)
+    @staticmethod
+    def _keyset_clause(ordering: List[Tuple[str, Any, bool]], values: List[Any]):
+        """
+        Builds the seek predicate that selects rows strictly after `values`
+        in the given ordering, expanded as
+        `(a > x) OR (a = x AND b > y) OR ...` so that mixed sort directions
+        work on every dialect.
+        """
+        branches = []
+        for i, (_, column, descending) in enumerate(ordering):
+            equals = [ordering[j][1] == values[j] for j in range(i)]
+            seek = column < values[i] if descending else column > values[i]
+            branches.append(and_(*equals, seek))
+        return or_(*branches)
 
-                if len(parts) == 1:
-                    op, value = "eq", parts[0]
-                else:
-                    op, value = parts
+    def _keyset_page(
+        self,
+        criteria: _Criteria,
+        per_page: int,
+        order_by: Optional[List[str]],
+        cursor: Optional[str],
+        loader: Tuple[Any, ...] = (),
+    ) -> Tuple[List[T], Optional[str], Optional[str], bool, bool]:
+        ordering = self._keyset_ordering(order_by)
+        keys = [("-" if desc else "") + name for name, _, desc in ordering]
 
-                op = op.strip()
-                value = value.strip()
+        direction = "next"
+        params = dict(criteria.params)
+        if cursor:
+            payload = decode_cursor(cursor)
+            if payload["k"] != keys:
+                raise BusinessLogicError(
+                    "Pagination cursor does not match the requested ordering.",
+                    error_code="INVALID_CURSOR",
+                )
+            direction = payload["d"]
+            for i, ((_, column, _), value) in enumerate(zip(ordering, payload["v"])):
+                params[f"seek_{i}"] = _decode_cursor_value(column, value)
+        params["page_limit"] = per_page + 1
 
-                if op in ("like", "ilike"):
-                    clause = (
-                        column.ilike(f"%{value}%")
-                        if op == "ilike"
-                        else column.like(f"%{value}%")
-                    )
-                    clauses.append(clause)
-                elif op == "in":
-                    in_values = [v.strip() for v in value.split("|")]
-                    clauses.append(column.in_(in_values))
-                elif op in op_map:
-                    clause = getattr(column, op_map[op])(value)
-                    clauses.append(clause)
-                else:
-                    current_app.logger.warning(f"Unknown filter operator: {op}")
-
-            if clauses:
-                query = query.filter(or_(*clauses))
-
-        return query
-
-    def _apply_ordering(self, query, order_by: Optional[List[str]] = None):
-        if order_by:
-            for field in order_by:
-                if field.startswith("-"):
-                    column_name = field[1:]
-                    if hasattr(self.model, column_name):
-                        query = query.order_by(getattr(self.model, column_name).desc())
-                else:
-                    if hasattr(self.model, field):
-                        query = query.order_by(getattr(self.model, field).asc())
-        return query
+        def build():
+            # Walking backwards is a forward walk over the reversed ordering.
+            walk = (
+                [(n, c, not d) for n, c, d in ordering]
+                if direction == "prev"
+                else ordering
+            )
+            statement = self._loader_options(self._where(criteria), *loader)
+            if cursor:
+                seek = [
+                    bindparam(f"seek_{i}", type_=column.type)
+                    for i, (_, column, _) in enumerate(walk)
+                ]
+                statement = statement.where(self._keyset_clause(walk, seek))
+            for _, column, descending in walk:
+                statement = statement.order_by(
+                    column.desc() if descending else column.asc()
+                )
+            return statement.limit(bindparam("page_limit", type_=Integer))
+
+        shape = ("keyset", *criteria.shape, tuple(keys), direction, bool(cursor))
+        statement = self._statement((*shape, self._loader_shape(*loader)), build)
+        rows = self._read_entities(statement, params).all()
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
+        if direction == "prev":
+            items.reverse()
+
+        if direction == "next":
+            has_next, has_prev = has_more, bool(cursor)
+        else:
+            has_next, has_prev = True, has_more
+
+        def cursor_for(entity, cursor_direction):
+            values = [getattr(entity, name) for name, _, _ in ordering]
+            return encode_cursor(keys, values, cursor_direction)
+
+        next_cursor = cursor_for(items[-1], "next") if items and has_next else None
+        prev_cursor = cursor_for(items[0], "prev") if items and has_prev else None
+        return items, next_cursor, prev_cursor, has_next, has_prev
+
+    def _get_count_cache_ttl(self) -> float:
+        if self.count_cache_ttl is not None:
+            return self.count_cache_ttl
+        if has_app_context():
+            return current_app.config.get("DEVKIT_COUNT_CACHE_TTL", 0)
+        return 0
+
+    def _count_cache_key(
+        self, filters: Optional[Dict[str, Any]], deleted_state: str
+    ) -> Tuple:
+        """
+        Builds the count cache key. Repositories that scope `_select()` by
+        anything other than `filters` (e.g. the current tenant) must extend it.
+        """
+        return count_cache.make_key(self.model, filters, deleted_state)
+
+    def _cached_count(
+        self, filters: Optional[Dict[str, Any]], deleted_state: str
+    ) -> Optional[int]:
+        if not self._get_count_cache_ttl():
+            return None
+        return count_cache.get(self._count_cache_key(filters, deleted_state))
+
+    def _store_count(
+        self, filters: Optional[Dict[str, Any]], deleted_state: str, total: int
+    ) -> None:
+        ttl = self._get_count_cache_ttl()
+        if ttl and not has_pending_writes(self._db_session, self.model):
+            key = self._count_cache_key(filters, deleted_state)
+            count_cache.set(key, total, ttl, tables=mapped_tables(self.model))
+
+    def _count_statement(self, criteria: _Criteria) -> Select:
+        pk_column = inspect(self.model).primary_key[0]
+        return self._statement(
+            ("count", *criteria.shape),
+            lambda: self._where(criteria)
+            .with_only_columns(func.count(pk_column), maintain_column_froms=True)
+            .order_by(None),
+        )
+
+    def _run_count(self, criteria: _Criteria) -> int:
+        total = self._read(self._count_statement(criteria), criteria.params).scalar()
+        self._store_count(criteria.filters, criteria.deleted_state, total)
+        return total
+
+    def _count(self, criteria: _Criteria) -> int:
+        """Counts the rows matched by `criteria`, using the count cache if enabled."""
+        cached = self._cached_count(criteria.filters, criteria.deleted_state)
+        if cached is not None:
+            return cached
+        return self._run_count(criteria)
+
+    @staticmethod
+    def _total_pages(total: int, per_page: int) -> int:
+        return math.ceil(total / per_page) if total > 0 else 0
+
+    def _dialect_and_version(self) -> Tuple[Any, Tuple[int, ...]]:
+        """Returns the bound dialect and the database server version."""
+        bind = self._db_session.get_bind(mapper=inspect(self.model))
+        dialect = bind.dialect
+        version = dialect.server_version_info
+        if version is None:
+            # The version is only known once a connection has been made.
+            with bind.connect():
+                version = dialect.server_version_info
+        return dialect, version
+
+    def _supports_window_functions(self) -> bool:
+        """Whether the bound database supports `COUNT(*) OVER ()`."""
+        dialect, version = self._dialect_and_version()
+        if dialect.name == "postgresql":
+            return True
+        if dialect.name == "sqlite":
+            return version >= (3, 25)
+        if dialect.name in ("mysql", "mariadb"):
+            if getattr(dialect, "is_mariadb", False):
+                return version >= (10, 2)
+            return version >= (8,)
+        return False
+
+    def _ordered(
+        self, criteria: _Criteria, order_by: Optional[List[str]]
+    ) -> Select:
+        """
+        Returns `_where(criteria)` in page order. Without `order_by`, rows
+        matched by `search` conditions are ordered by relevance, best first.
+        """
+        statement = self._apply_ordering(self._where(criteria), order_by)
+        if not order_by:
+            rankings = criteria.plan.rankings
+            statement = statement.order_by(*(r.desc() for r in rankings))
+        return statement
+
+    def _page_statement(
+        self,
+        criteria: _Criteria,
+        order_by: Optional[List[str]],
+        loader: Tuple[Any, ...],
+        kind: str = "page",
+    ) -> Select:
+        """
+        Returns the statement selecting a numbered page of entities, sliced by
+        the `page_offset` and `page_limit` parameters. The "window" kind
+        adds the total row count to every row.
+        """
+
+        def build():
+            statement = self._loader_options(
+                self._ordered(criteria, order_by), *loader
+            )
+            if kind == "window":
+                statement = statement.add_columns(
+                    func.count().over().label("_total")
+                )
+            return _paged(statement)
+
+        ordering = tuple(order_by or ())
+        shape = (kind, *criteria.shape, ordering, self._loader_shape(*loader))
+        return self._statement(shape, build)
+
+    def _page_with_total(
+        self,
+        criteria: _Criteria,
+        order_by: Optional[List[str]],
+        loader: Tuple[Any, ...],
+        offset: int,
+        per_page: int,
+        strategy: str,
+    ) -> Tuple[List[T], int]:
+        """Fetches one page and the total count using the given strategy."""
+        if strategy not in PAGINATION_STRATEGIES:
+            raise ValueError(f"Unknown pagination strategy: {strategy!r}")
+
+        total = self._cached_count(criteria.filters, criteria.deleted_state)
+        if total is not None:
+            items = self._fetch_page(
+                criteria, order_by, loader, offset, per_page, strategy
+            )
+            return items, total
+
+        if strategy == "window" and self._supports_window_functions():
+            statement = self._page_statement(criteria, order_by, loader, "window")
+            params = _page_params(criteria, offset, per_page)
+            rows = self._read(statement, params).unique().all()
+            if rows:
+                total = rows[0][1]
+                self._store_count(criteria.filters, criteria.deleted_state, total)
+                return [row[0] for row in rows], total
+            # An empty page carries no total; count separately.
+            return [], self._run_count(criteria)
+
+        if strategy == "parallel":
+            bind = self._parallel_count_bind()
+            if bind is not None:
+                return self._page_with_parallel_count(
+                    criteria, order_by, loader, offset, per_page, bind
+                )
+
+        total = self._run_count(criteria)
+        items = self._fetch_page(criteria, order_by, loader, offset, per_page, strategy)
+        return items, total
+
+    def _fetch_page(
+        self,
+        criteria: _Criteria,
+        order_by: Optional[List[str]],
+        loader: Tuple[Any, ...],
+        offset: int,
+        limit: int,
+        strategy: str,
+    ) -> List[T]:
+        """
+        Fetches `limit` entities from `offset` of the rows matching
+        `criteria` in `order_by` order.
+
+        With the "deferred_join" strategy the OFFSET is applied to a query
+        selecting only the primary key, which the database can answer from
+        an index on the filter and sort columns without reading the skipped
+        rows. The entities for the resulting keys are then loaded with one
+        primary-key lookup and returned in the page's order.
+        """
+        params = _page_params(criteria, offset, limit)
+        if strategy != "deferred_join":
+            statement = self._page_statement(criteria, order_by, loader)
+            return self._read_entities(statement, params).all()
+        mapper = inspect(self.model)
+        pk_columns = list(mapper.primary_key)
+        keys_statement = self._statement(
+            ("page_keys", *criteria.shape, tuple(order_by or ())),
+            lambda: _paged(
+                self._ordered(criteria, order_by).with_only_columns(
+                    *pk_columns, maintain_column_froms=True
+                )
+            ),
+        )
+        keys = [tuple(row) for row in self._read(keys_statement, params)]
+        if not keys:
+            return []
+
+        def build():
+            key = pk_columns[0] if len(pk_columns) == 1 else tuple_(*pk_columns)
+            statement = self._loader_options(self._where(criteria), *loader)
+            return statement.where(key.in_(bindparam("page_keys", expanding=True)))
+
+        statement = self._statement(
+            ("page_rows", *criteria.shape, self._loader_shape(*loader)), build
+        )
+        values = [key[0] for key in keys] if len(pk_columns) == 1 else keys
+        entities = {
+            tuple(mapper.primary_key_from_instance(entity)): entity
+            for entity in self._read_entities(
+                statement, {**criteria.params, "page_keys": values}
+            )
+        }
+        # A row changed between the two queries may no longer match.
+        return [entities[key] for key in keys if key in entities]
+
+    def _parallel_count_bind(self) -> Optional[Engine]:
+        """
+        Returns the engine to run a concurrent COUNT on, or None when the
+        count must run on the session's own connection: while the session
+        holds uncommitted writes (e.g. inside a writing `unit_of_work`),
+        when its open transaction keeps a snapshot that another connection
+        would not share (isolation above READ COMMITTED), or when the pool
+        cannot hand out a second connection (in-memory SQLite).
+        """
+        session = self._db_session
+        if session_has_writes(session):
+            return None
+        bind = session.get_bind(mapper=inspect(self.model))
+        if not isinstance(bind, Engine) or isinstance(
+            bind.pool, (StaticPool, SingletonThreadPool)
+        ):
+            return None
+        if session.in_transaction():
+            connection = session.connection(bind_arguments={"bind": bind})
+            level = connection.get_isolation_level().upper()
+            if level not in _STATEMENT_SNAPSHOT_LEVELS:
+                return None
+        return replica_bind(session) or bind
+
+    def _page_with_parallel_count(
+        self,
+        criteria: _Criteria,
+        order_by: Optional[List[str]],
+        loader: Tuple[Any, ...],
+        offset: int,
+        per_page: int,
+        bind: Engine,
+    ) -> Tuple[List[T], int]:
+        """Fetches a page while its COUNT runs on another connection of `bind`."""
+        count = _parallel_count_executor().submit(
+            _timed_count, bind, self._count_statement(criteria), criteria.params
+        )
+        started = time.perf_counter()
+        items = self._read_entities(
+            self._page_statement(criteria, order_by, loader),
+            _page_params(criteria, offset, per_page),
+        ).all()
+        page_seconds = time.perf_counter() - started
+        total, count_seconds = count.result()
+        self._store_count(criteria.filters, criteria.deleted_state, total)
+        if has_app_context():
+            current_app.logger.debug(
+                f"Parallel pagination of {self.model.__name__}: "
+                f"page {page_seconds * 1000:.1f} ms, "
+                f"count {count_seconds * 1000:.1f} ms, "
+                f"total {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+        return items, total
 
     @handle_db_errors
     def create(self, data: Dict[str, Any]) -> T:
@@ -156,25 +962,446 @@ class BaseRepository(Generic[T]):
         return entity
 
     @handle_db_errors
-    def get_by_id(self, id_: Any, deleted_state: str = "active") -> Optional[T]:
-        query = self._query().filter(self.model.id == id_)
-        query = self._filter_soft_deleted(query, deleted_state)
-        return query.first()
+    def create_many(
+        self,
+        data_list: List[Dict[str, Any]],
+        batch_size: int = 1000,
+        return_entities: bool = True,
+    ) -> Optional[List[T]]:
+        """
+        Inserts many rows using ORM bulk INSERT statements.
+
+        Each batch of `batch_size` rows is sent as a single statement, which
+        SQLAlchemy executes with "insertmanyvalues" (multi-row VALUES with
+        RETURNING) where the driver supports it. With `return_entities=True`
+        the created entities are returned in input order, otherwise no rows
+        are fetched back or hydrated and None is returned.
+        """
+        dialect = self._db_session.get_bind().dialect
+        if return_entities and not dialect.insert_executemany_returning:
+            # e.g. MySQL: let the unit of work insert and fetch the keys.
+            entities = [self.model(**data) for data in data_list]
+            self._db_session.add_all(entities)
+            self._db_session.flush()
+            return entities
+
+        entities: List[T] = []
+        statement = insert(self.model)
+        if return_entities:
+            statement = statement.returning(
+                self.model, sort_by_parameter_order=True
+            )
+        for start in range(0, len(data_list), batch_size):
+            batch = data_list[start : start + batch_size]
+            if return_entities:
+                entities.extend(self._db_session.scalars(statement, batch).all())
+            else:
+                self._db_session.execute(statement, batch)
+        return entities if return_entities else None
+
+    def _upsert_statement(
+        self,
+        columns: List[str],
+        conflict_columns: List[str],
+        update_columns: Optional[List[str]],
+        target: Any,
+    ):
+        """
+        Builds the dialect-specific INSERT into `target` (the model, or its
+        table for a plain Core statement) that resolves conflicts on
+        `conflict_columns` by updating `update_columns` (by default all
+        inserted columns except the conflict columns), or by skipping the row
+        when there is nothing to update.
+        """
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in conflict_columns]
+        table = self.model.__table__
+        dialect = self._db_session.get_bind().dialect.name
+        # Lets listeners (e.g. auditing) tell inserted rows from updated ones.
+        options = {"devkit_upsert_keys": tuple(conflict_columns)}
+
+        if dialect in ("postgresql", "sqlite"):
+            insert_ = postgresql_insert if dialect == "postgresql" else sqlite_insert
+            statement = insert_(target).execution_options(**options)
+            # A partial unique index is only inferred given its predicate.
+            where = active_unique_where(table, conflict_columns)
+            if not update_columns:
+                return statement.on_conflict_do_nothing(
+                    index_elements=conflict_columns, index_where=where
+                )
+            values = {name: statement.excluded[name] for name in update_columns}
+        elif dialect in ("mysql", "mariadb"):
+            statement = mysql_insert(target).execution_options(**options)
+            if not update_columns:
+                # Skip the conflicting row with a no-op assignment: unlike
+                # INSERT IGNORE, this does not turn other errors into warnings.
+                keep = conflict_columns[0]
+                return statement.on_duplicate_key_update({keep: table.c[keep]})
+            values = {name: statement.inserted[name] for name in update_columns}
+        else:
+            raise NotImplementedError(f"Upserts are not supported on {dialect}.")
+
+        # ON CONFLICT updates bypass Column.onupdate, so apply SQL ones here.
+        for column in table.columns:
+            onupdate = column.onupdate
+            if onupdate is not None and onupdate.is_clause_element:
+                values.setdefault(column.name, onupdate.arg)
+        if dialect in ("mysql", "mariadb"):
+            return statement.on_duplicate_key_update(values)
+        return statement.on_conflict_do_update(
+            index_elements=conflict_columns, index_where=where, set_=values
+        )
+
+    @handle_db_errors
+    def upsert(
+        self,
+        data: Dict[str, Any],
+        conflict_columns: List[str],
+        update_columns: Optional[List[str]] = None,
+    ) -> Optional[T]:
+        """
+        Inserts `data`, or updates the existing row that conflicts with it on
+        `conflict_columns`, in a single statement.
+
+        Returns the inserted or updated entity. With `update_columns=[]` an
+        existing row is left untouched and None is returned instead, which
+        makes this an atomic "create unless it exists".
+        """
+        options = {"populate_existing": True}
+        if self._db_session.get_bind().dialect.insert_returning:
+            statement = self._upsert_statement(
+                list(data), conflict_columns, update_columns, self.model
+            )
+            return self._db_session.scalars(
+                statement.returning(self.model), [data], execution_options=options
+            ).first()
+
+        # Without RETURNING (MySQL), fall back to the affected row count.
+        if update_columns is None:
+            update_columns = [c for c in data if c not in conflict_columns]
+        if update_columns:
+            statement = self._upsert_statement(
+                list(data), conflict_columns, update_columns, self.model.__table__
+            )
+            result = self._db_session.execute(
+                statement, data, bind_arguments={"mapper": inspect(self.model)}
+            )
+            if not result.rowcount:
+                return None
+        elif not self._insert_unless_duplicate(data):
+            return None
+        key = {name: data[name] for name in conflict_columns}
+        options[INCLUDE_DELETED_OPTION] = True
+        statement = self._select().filter_by(**key).limit(1)
+        return self._db_session.scalars(statement, execution_options=options).first()
+
+    def _insert_unless_duplicate(self, data: Dict[str, Any]) -> bool:
+        """
+        Inserts `data` in a savepoint and returns False, instead of raising,
+        if the row violates a unique key (MySQL error 1062). Used by `upsert`
+        on MySQL, where the CLIENT_FOUND_ROWS flag set by SQLAlchemy counts a
+        row skipped by a no-op ON DUPLICATE KEY UPDATE as affected.
+        """
+        try:
+            with self._db_session.begin_nested():
+                self._db_session.execute(
+                    insert(self.model.__table__),
+                    data,
+                    bind_arguments={"mapper": inspect(self.model)},
+                )
+        except IntegrityError as e:
+            if getattr(e.orig, "args", (None,))[0] != _MYSQL_DUPLICATE_ENTRY:
+                raise
+            return False
+        return True
+
+    @handle_db_errors
+    def upsert_many(
+        self,
+        data_list: List[Dict[str, Any]],
+        conflict_columns: List[str],
+        update_columns: Optional[List[str]] = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Upserts many rows with one statement per batch of `batch_size` rows
+        (see `upsert`) and returns the number of rows inserted or updated.
+        All rows must have the same keys. On MySQL the count is the driver's
+        affected row count, which also includes rows skipped on conflict.
+        """
+        if not data_list:
+            return 0
+        columns = list(data_list[0])
+        returning = self._db_session.get_bind().dialect.insert_returning
+        target = self.model if returning else self.model.__table__
+        statement = self._upsert_statement(
+            columns, conflict_columns, update_columns, target
+        )
+        if returning:
+            # Rows skipped by a conflict are not returned, so counting the
+            # returned keys gives the number of rows written.
+            statement = statement.returning(*inspect(self.model).primary_key)
+        affected = 0
+        for start in range(0, len(data_list), batch_size):
+            batch = data_list[start : start + batch_size]
+            result = self._db_session.execute(
+                statement, batch, bind_arguments={"mapper": inspect(self.model)}
+            )
+            affected += len(result.all()) if returning else result.rowcount
+        return affected
+
+    def _matches_deleted_state(self, deleted_at: Any, deleted_state: str) -> bool:
+        """Checks a loaded `deleted_at` value against `deleted_state`."""
+        if not hasattr(self.model, "deleted_at"):
+            return True
+        if deleted_state == "active":
+            return deleted_at is None
+        if deleted_state == "deleted_only":
+            return deleted_at is not None
+        return True
+
+    def _pk_attribute(self) -> Optional[str]:
+        """The primary key attribute name, or None for composite keys."""
+        mapper = inspect(self.model)
+        if len(mapper.primary_key) != 1:
+            return None
+        return mapper.get_property_by_column(mapper.primary_key[0]).key
+
+    def _from_identity_map(self, id_: Any) -> Optional[T]:
+        """
+        Returns the entity with primary key `id_` if the session already holds
+        it with its attributes loaded, without emitting SQL.
+        """
+        mapper = inspect(self.model)
+        pk = list(id_) if isinstance(id_, (tuple, list)) else [id_]
+        if len(pk) != len(mapper.primary_key):
+            return None
+        entity = self._db_session.identity_map.get(
+            mapper.identity_key_from_primary_key(pk)
+        )
+        if (
+            entity is None
+            or inspect(entity).expired
+            or entity in self._db_session.deleted
+        ):
+            return None
+        return entity
+
+    def _entity_from_values(self, values: Dict[str, Any]) -> T:
+        """Attaches an entity rebuilt from cached column values to the session."""
+        mapper = inspect(self.model)
+        identity = mapper.identity_key_from_primary_key(
+            [values[mapper.get_property_by_column(c).key] for c in mapper.primary_key]
+        )
+        existing = self._db_session.identity_map.get(identity)
+        if existing is not None:
+            return existing
+        entity = mapper.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(entity, key, value)
+        make_transient_to_detached(entity)
+        return self._db_session.merge(entity, load=False)
+
+    def _cached_get(
+        self,
+        attribute: Optional[str],
+        value: Any,
+        deleted_state: str,
+        load_only: Optional[List[str]],
+        eager_load: Optional[Dict[str, str]],
+        load: Callable[[], Optional[T]],
+    ) -> Optional[T]:
+        """
+        Looks the entity up in the entity cache, falling back to `load` and
+        caching its result. The cache is skipped for lookups it cannot serve
+        faithfully: with loader options, or while the session has uncommitted
+        writes to the model.
+        """
+        cache = self.entity_cache
+        if (
+            cache is None
+            or attribute is None
+            or load_only
+            or eager_load
+            or self.eager_load
+            or has_pending_writes(self._db_session, self.model)
+        ):
+            return load()
+        values = cache.get(self.model, attribute, value)
+        if values is None:
+            entity = load()
+            if entity is not None:
+                cache.put(entity)
+            return entity
+        if not self._matches_deleted_state(values.get("deleted_at"), deleted_state):
+            return None
+        return self._entity_from_values(values)
+
+    @handle_db_errors
+    def get_by_id(
+        self,
+        id_: Any,
+        deleted_state: str = "active",
+        load_only: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
+    ) -> Optional[T]:
+        """
+        Returns the entity with primary key `id_` (a tuple for composite keys).
+
+        Like `Session.get`, an entity already loaded in the session is
+        returned without a query; its soft-delete state is checked in Python.
+        """
+        entity = self._from_identity_map(id_)
+        if entity is not None:
+            deleted_at = getattr(entity, "deleted_at", None)
+            if not self._matches_deleted_state(deleted_at, deleted_state):
+                return None
+            return entity
+
+        def load():
+            required = ["deleted_at"] if hasattr(self.model, "deleted_at") else []
+            found = self._db_session.get(
+                self.model,
+                id_,
+                options=self._loader_option_list(load_only, required, eager_load),
+                execution_options={
+                    REPLICA_OPTION: True,
+                    **self._deleted_state_options(deleted_state),
+                },
+            )
+            # Session.get returns objects pending deletion from the identity map.
+            if found is None or found in self._db_session.deleted:
+                return None
+            deleted_at = getattr(found, "deleted_at", None)
+            if not self._matches_deleted_state(deleted_at, deleted_state):
+                return None
+            return found
+
+        return self._cached_get(
+            self._pk_attribute(), id_, deleted_state, load_only, eager_load, load
+        )
+
+    @handle_db_errors
+    def get_by_uuid(
+        self,
+        uuid: str,
+        deleted_state: str = "active",
+        load_only: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
+    ) -> Optional[T]:
+        def load():
+            criteria = self._criteria(None, deleted_state)
+            loader_shape = self._loader_shape(load_only, None, eager_load)
+            statement = self._statement(
+                ("uuid", *criteria.shape, loader_shape),
+                lambda: self._loader_options(
+                    self._where(criteria), load_only, eager_load=eager_load
+                )
+                .where(self.model.uuid == bindparam("lookup_value"))
+                .limit(1),
+            )
+            return self._read_entities(statement, {"lookup_value": uuid}).first()
+
+        return self._cached_get(
+            "uuid", uuid, deleted_state, load_only, eager_load, load
+        )
+
+    def _get_many_by(
+        self, attributes: Tuple[str, ...], values: List[Any], deleted_state: str
+    ) -> List[Optional[T]]:
+        """
+        Loads the entities whose `attributes` are in `values` with `IN`
+        queries of at most `in_chunk_size` values and returns them in input
+        order, with None for values that have no match. With several
+        attributes (a composite key) each value is a tuple of theirs.
+        """
+        columns = [getattr(self.model, attribute) for attribute in attributes]
+        composite = len(columns) > 1
+        if composite:
+            values = [tuple(value) for value in values]
+            if any(len(value) != len(columns) for value in values):
+                raise ValueError(
+                    f"{self.model.__name__} keys are tuples of {attributes}."
+                )
+        target = tuple_(*columns) if composite else columns[0]
+        criteria = self._criteria(None, deleted_state)
+        statement = self._statement(
+            ("many", attributes, *criteria.shape, self._loader_shape()),
+            lambda: self._loader_options(self._where(criteria)).where(
+                target.in_(bindparam("lookup_values", expanding=True))
+            ),
+        )
+
+        def key_of(entity: T) -> Any:
+            key = tuple(getattr(entity, attribute) for attribute in attributes)
+            return key if composite else key[0]
+
+        unique_values = list(dict.fromkeys(values))
+        found: Dict[Any, T] = {}
+        for start in range(0, len(unique_values), self.in_chunk_size):
+            chunk = unique_values[start : start + self.in_chunk_size]
+            for entity in self._read_entities(statement, {"lookup_values": chunk}):
+                found[key_of(entity)] = entity
+        return [found.get(value) for value in values]
+
+    @handle_db_errors
+    def get_many_by_ids(
+        self, ids: List[Any], deleted_state: str = "active"
+    ) -> List[Optional[T]]:
+        """
+        Loads the entities with the given primary keys in input order (see
+        `_get_many_by`). Keys of composite primary keys are tuples, in the
+        order of the mapper's primary key columns.
+        """
+        mapper = inspect(self.model)
+        attributes = tuple(
+            mapper.get_property_by_column(column).key
+            for column in mapper.primary_key
+        )
+        return self._get_many_by(attributes, ids, deleted_state)
 
     @handle_db_errors
-    def get_by_uuid(self, uuid: str, deleted_state: str = "active") -> Optional[T]:
-        query = self._query().filter_by(uuid=uuid)
-        query = self._filter_soft_deleted(query, deleted_state)
-        return query.first()
+    def get_many_by_uuids(
+        self, uuids: List[str], deleted_state: str = "active"
+    ) -> List[Optional[T]]:
+        return self._get_many_by(("uuid",), uuids, deleted_state)
 
     @handle_db_errors
     def find_one_by(
         self, filters: Dict[str, Any], deleted_state: str = "active"
     ) -> Optional[T]:
-        query = self._query()
-        query = self._filter_soft_deleted(query, deleted_state)
-        query = self._apply_filters(query, filters)
-        return query.first()
+        criteria = self._criteria(filters, deleted_state)
+        statement = self._statement(
+            ("first", *criteria.shape), lambda: self._where(criteria).limit(1)
+        )
+        return self._read_entities(statement, criteria.params).first()
+
+    @handle_db_errors
+    def exists(
+        self, filters: Optional[Dict[str, Any]] = None, deleted_state: str = "active"
+    ) -> bool:
+        """
+        Returns whether any row matches `filters`, with a single
+        `SELECT EXISTS (...)` that loads no entity.
+        """
+        criteria = self._criteria(filters, deleted_state)
+        statement = self._statement(
+            ("exists", *criteria.shape),
+            lambda: select(self._where(criteria).exists()).execution_options(
+                **self._deleted_state_options(deleted_state)
+            ),
+        )
+        return bool(self._read(statement, criteria.params).scalar())
+
+    @handle_db_errors
+    def count(
+        self, filters: Optional[Dict[str, Any]] = None, deleted_state: str = "active"
+    ) -> int:
+        """
+        Returns the number of rows matching `filters` with a single COUNT
+        query, sharing the count cache with `paginate` totals.
+        """
+        return self._count(self._criteria(filters, deleted_state))
 
     @handle_db_errors
     def delete(self, entity: T, soft: bool = True) -> None:
@@ -186,21 +1413,16 @@ class BaseRepository(Generic[T]):
 
     @handle_db_errors
     def force_delete(self, entity: T) -> None:
-        pk_name = inspect(entity.__class__).primary_key[0].name
-        pk_value = getattr(entity, pk_name)
-
+        mapper = inspect(entity.__class__)
         data_to_archive = {
             c.name: getattr(entity, c.name) for c in entity.__table__.columns
         }
-
-        for key, value in data_to_archive.items():
-            if isinstance(value, datetime.datetime):
-                data_to_archive[key] = value.isoformat()
-
         archived_record = ArchivedRecord(
             original_table=entity.__table__.name,
-            original_pk=str(pk_value),
-            data=data_to_archive,
+            original_pk=",".join(
+                str(data_to_archive[column.name]) for column in mapper.primary_key
+            ),
+            data=_archive_data(data_to_archive),
         )
         self._db_session.add(archived_record)
         self._db_session.delete(entity)
@@ -211,6 +1433,311 @@ class BaseRepository(Generic[T]):
             entity.deleted_at = None
             self._db_session.add(entity)
 
+    def _where_criteria(
+        self,
+        filters: Optional[Dict[str, Any]],
+        deleted_state: str,
+        all_rows: bool = True,
+    ) -> Tuple[List[Any], Dict[str, Any]]:
+        """
+        Returns the WHERE clauses and bound parameters for a set-based write.
+        Filters are strict, so an unknown field or operator raises instead of
+        being dropped and widening the statement to more rows. Without
+        `all_rows`, empty filters raise instead of matching the whole table.
+        """
+        clauses, params = self._filter_criteria(filters, strict=True)
+        if not clauses and not all_rows:
+            raise BusinessLogicError(
+                f"Refusing to write every {self.model.__name__} row without "
+                "filters; pass all_rows=True to do so.",
+                error_code="FILTERS_REQUIRED",
+            )
+        return [*clauses, *self._soft_delete_criteria(deleted_state)], params
+
+    def _require_soft_delete(self) -> None:
+        if not hasattr(self.model, "deleted_at"):
+            raise BusinessLogicError(
+                f"{self.model.__name__} does not support soft deletes."
+            )
+
+    @handle_db_errors
+    def update_where(
+        self,
+        filters: Optional[Dict[str, Any]],
+        values: Dict[str, Any],
+        deleted_state: str = "active",
+        all_rows: bool = False,
+    ) -> int:
+        """
+        Updates every row matching `filters` with a single UPDATE statement,
+        without loading the entities, and returns the number of rows updated.
+
+        Empty filters raise a BusinessLogicError (FILTERS_REQUIRED) unless
+        `all_rows=True` confirms that every row is to be updated.
+        """
+        clauses, params = self._where_criteria(filters, deleted_state, all_rows)
+        statement = update(self.model).where(*clauses).values(**values)
+        result = self._db_session.execute(statement, params)
+        return result.rowcount
+
+    def soft_delete_where(
+        self, filters: Optional[Dict[str, Any]], all_rows: bool = False
+    ) -> int:
+        """Soft-deletes all active rows matching `filters`."""
+        self._require_soft_delete()
+        return self.update_where(
+            filters, {"deleted_at": func.now()}, all_rows=all_rows
+        )
+
+    def restore_where(
+        self, filters: Optional[Dict[str, Any]], all_rows: bool = False
+    ) -> int:
+        """Restores all soft-deleted rows matching `filters`."""
+        self._require_soft_delete()
+        return self.update_where(
+            filters,
+            {"deleted_at": None},
+            deleted_state="deleted_only",
+            all_rows=all_rows,
+        )
+
+    def _json_object_function(self) -> Optional[Any]:
+        """
+        Returns the SQL function building a JSON object from key/value pairs
+        on the bound database, or None if it has no such function.
+        """
+        dialect, version = self._dialect_and_version()
+        if dialect.name == "postgresql":
+            return func.json_build_object
+        if dialect.name == "sqlite" and version >= (3, 38):
+            return func.json_object
+        if dialect.name in ("mysql", "mariadb"):
+            if getattr(dialect, "is_mariadb", False):
+                return func.JSON_OBJECT if version >= (10, 2, 3) else None
+            return func.JSON_OBJECT if version >= (5, 7, 8) else None
+        return None
+
+    def _archive_json_value(self, column: Any) -> Any:
+        """
+        Returns the SQL expression archiving `column` in the JSON payload, in
+        the format `force_delete` writes from Python: JSON booleans, and
+        datetimes as `datetime.isoformat()` renders them.
+        """
+        dialect = self._db_session.get_bind().dialect.name
+        mysql = dialect in ("mysql", "mariadb")
+        if isinstance(column.type, Boolean) and dialect != "postgresql":
+            true, false = (
+                (cast(literal("true"), JSON), cast(literal("false"), JSON))
+                if mysql
+                else (func.json("true"), func.json("false"))
+            )
+            return case((column.is_(None), null()), (column, true), else_=false)
+        if isinstance(column.type, DateTime):
+            if dialect == "postgresql":
+                pattern = 'YYYY-MM-DD"T"HH24:MI:SS.US'
+                if column.type.timezone:
+                    pattern += "TZH:TZM"
+                text = func.to_char(column, pattern)
+            elif mysql:
+                text = func.DATE_FORMAT(column, "%Y-%m-%dT%H:%i:%s.%f")
+            else:
+                text = func.replace(column, " ", "T")
+            # isoformat() leaves out a zero microsecond part.
+            return func.replace(text, ".000000", "")
+        return column
+
+    def _archive_rows(self, pk_columns: List[Any], pk_values: List[Any]) -> None:
+        """
+        Copies the rows with the given primary keys (tuples of the values of
+        `pk_columns`) into ArchivedRecord. `original_pk` joins the values of
+        a composite key with commas.
+        """
+        table = self.model.__table__
+        where = _in_keys(pk_columns, pk_values)
+        json_object = self._json_object_function()
+        if json_object is not None:
+            pairs = []
+            for column in table.columns:
+                pairs.extend((literal(column.name), self._archive_json_value(column)))
+            original_pk = cast(pk_columns[0], Text)
+            for column in pk_columns[1:]:
+                original_pk = original_pk + literal(",") + cast(column, Text)
+            rows = select(
+                literal(table.name), original_pk, json_object(*pairs)
+            ).where(where)
+            self._db_session.execute(
+                insert(ArchivedRecord).from_select(
+                    ["original_table", "original_pk", "data"], rows
+                )
+            )
+            return
+
+        records = []
+        for row in self._db_session.execute(
+            select(*table.columns).where(where)
+        ).mappings():
+            records.append(
+                {
+                    "original_table": table.name,
+                    "original_pk": ",".join(
+                        str(row[column.name]) for column in pk_columns
+                    ),
+                    "data": _archive_data(row),
+                }
+            )
+        if records:
+            self._db_session.execute(insert(ArchivedRecord), records)
+
+    @handle_db_errors
+    def force_delete_where(
+        self,
+        filters: Optional[Dict[str, Any]],
+        deleted_state: str = "deleted_only",
+        limit: int = 1000,
+        all_rows: bool = False,
+    ) -> int:
+        """
+        Archives and permanently deletes up to `limit` rows matching `filters`
+        and returns how many were deleted.
+
+        The rows are copied into ArchivedRecord with one INSERT ... SELECT that
+        builds the JSON payload in the database where the dialect supports it
+        (otherwise the chunk is serialized in Python), then removed with one
+        DELETE. Call it repeatedly until it returns less than `limit` to purge
+        larger sets in bounded chunks; see `BaseService.force_delete_where`.
+
+        Empty filters raise unless `all_rows=True`, as for `update_where`.
+        The default "deleted_only" state requires a soft-delete model; pass
+        `deleted_state="all"` for other models.
+        """
+        if deleted_state == "deleted_only":
+            self._require_soft_delete()
+        pk_columns = list(inspect(self.model).primary_key)
+        clauses, params = self._where_criteria(filters, deleted_state, all_rows)
+        pk_values = self._db_session.execute(
+            select(*pk_columns).where(*clauses).order_by(*pk_columns).limit(limit),
+            params,
+        ).all()
+        if not pk_values:
+            return 0
+
+        pk_values = [tuple(row) for row in pk_values]
+        self._archive_rows(pk_columns, pk_values)
+        self._db_session.execute(
+            delete(self.model).where(_in_keys(pk_columns, pk_values))
+        )
+        return len(pk_values)
+
+    @handle_db_errors
+    def iter_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        chunk_size: int = 1000,
+        deleted_state: str = "active",
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        Iterates over all rows matching `filters` without materializing them.
+
+        Rows are streamed from the database in chunks of `chunk_size` using
+        `yield_per` (server-side cursors where the driver supports them).
+        Entities are expunged from the session once their chunk has been
+        processed, after flushing any pending changes, so memory use stays
+        flat however many rows are read. With `columns`, plain rows of those
+        attributes are yielded instead of entities.
+        """
+        criteria = self._criteria(filters, deleted_state)
+
+        def build():
+            statement = self._where(criteria)
+            if columns:
+                statement = statement.with_only_columns(
+                    *[getattr(self.model, name) for name in columns],
+                    maintain_column_froms=True,
+                )
+            return self._apply_ordering(statement, order_by)
+
+        shape = ("iter", *criteria.shape, tuple(order_by or ()), tuple(columns or ()))
+        result = self._db_session.execute(
+            self._statement(shape, build),
+            criteria.params,
+            execution_options={"yield_per": chunk_size},
+        )
+        batch: List[Any] = []
+        for item in result if columns else result.scalars():
+            yield item
+            if columns:
+                continue
+            batch.append(item)
+            if len(batch) >= chunk_size:
+                self._release(batch)
+                batch = []
+        self._release(batch)
+
+    def _release(self, entities: List[Any]) -> None:
+        """Flushes pending changes and expunges `entities` from the session."""
+        session = self._db_session
+        if session.new or session.dirty or session.deleted:
+            session.flush()
+        for entity in entities:
+            if entity in session:
+                session.expunge(entity)
+
+    def _aggregate_column(self, field: str) -> Any:
+        attribute = getattr(self.model, field, None)
+        if field not in inspect(self.model).column_attrs or attribute is None:
+            raise InvalidAggregateError(
+                field, f"'{field}' is not a column of {self.model.__name__}."
+            )
+        return attribute
+
+    @handle_db_errors
+    def aggregate(
+        self,
+        group_by: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        deleted_state: str = "active",
+    ) -> List[Dict[str, Any]]:
+        """
+        Computes `metrics` over the rows matching `filters`, per group of the
+        `group_by` columns, with a single GROUP BY query.
+
+        Metrics are "count" (the number of rows) or "function:field" with a
+        function of count, sum, avg, min or max, e.g. "sum:amount". They
+        default to ["count"]. Returns one dict per group, ordered by the
+        group columns, mapping each group field and each metric's label (see
+        `metric_label`, e.g. "sum_amount") to its value. Without `group_by`
+        a single row covers all matching rows.
+        """
+        group_by = list(group_by or [])
+        metrics = list(metrics or ["count"])
+        criteria = self._criteria(filters, deleted_state)
+
+        def build():
+            keys = [self._aggregate_column(field) for field in group_by]
+            group_columns = [key.label(field) for key, field in zip(keys, group_by)]
+            pk_column = inspect(self.model).primary_key[0]
+            metric_columns = []
+            for metric in metrics:
+                function, field = parse_metric(metric)
+                argument = self._aggregate_column(field) if field else pk_column
+                label = metric_label(function, field)
+                metric_columns.append(
+                    AGGREGATE_FUNCTIONS[function](argument).label(label)
+                )
+            statement = self._where(criteria).with_only_columns(
+                *group_columns, *metric_columns, maintain_column_froms=True
+            )
+            if keys:
+                statement = statement.group_by(*keys).order_by(*keys)
+            return statement
+
+        shape = ("aggregate", *criteria.shape, tuple(group_by), tuple(metrics))
+        statement = self._statement(shape, build)
+        return [dict(row._mapping) for row in self._read(statement, criteria.params)]
+
     @handle_db_errors
     def paginate(
         self,
@@ -219,21 +1746,117 @@ class BaseRepository(Generic[T]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[List[str]] = None,
         deleted_state: str = "active",
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        with_total: bool = True,
+        strategy: Optional[str] = None,
+        load_only: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
     ) -> PaginationResult[T]:
-        query = self._query()
-        query = self._filter_soft_deleted(query, deleted_state)
+        """
+        Returns one page of results.
 
-        filters_copy = filters.copy() if filters else {}
-        query = self._apply_filters(query, filters_copy)
+        By default pages are addressed by number (OFFSET/LIMIT). When `keyset`
+        is true or a `cursor` is given, the page is located by seeking past
+        the sort key of the previous page instead, so every page costs the
+        same regardless of depth. Keyset results carry opaque `next_cursor`
+        and `prev_cursor` values to pass back as `cursor`. Sort columns used
+        with keyset pagination should be non-nullable.
 
-        pk_column = inspect(self.model).primary_key[0]
-        count_query = query.with_entities(func.count(pk_column))
-        total_count = count_query.scalar()
+        With `with_total=False` the COUNT query is skipped: one extra row is
+        fetched to derive `has_next`, and `total`/`total_pages` are `None`.
+
+        `strategy` overrides the repository's `pagination_strategy` for
+        numbered pages. Only "deferred_join" also applies with
+        `with_total=False`.
+
+        `load_only` restricts the loaded columns to the given attribute names
+        (plus the primary key and sort columns); other columns are deferred.
+        `eager_load` adds relationships to load with the page, on top of the
+        repository's `eager_load` configuration.
 
-        total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
+        Numbered pages filtered with the `search` operator and without an
+        `order_by` are ordered by relevance, best match first.
 
-        query = self._apply_ordering(query, order_by)
-        items = query.offset((page - 1) * per_page).limit(per_page).all()
+        Each call is recorded with its latency in the query usage statistics
+        (see `flask_devkit.core.usage`).
+        """
+        started = time.perf_counter()
+        result = self._paginate(
+            page,
+            per_page,
+            filters,
+            order_by,
+            deleted_state,
+            cursor,
+            keyset,
+            with_total,
+            strategy,
+            load_only,
+            eager_load,
+        )
+        record_query(
+            self.model, filters, order_by, deleted_state, time.perf_counter() - started
+        )
+        return result
+
+    def _paginate(
+        self,
+        page: int,
+        per_page: int,
+        filters: Optional[Dict[str, Any]],
+        order_by: Optional[List[str]],
+        deleted_state: str,
+        cursor: Optional[str],
+        keyset: bool,
+        with_total: bool,
+        strategy: Optional[str],
+        load_only: Optional[List[str]],
+        eager_load: Optional[Dict[str, str]],
+    ) -> PaginationResult[T]:
+        filters_copy = filters.copy() if filters else {}
+        criteria = self._criteria(filters_copy, deleted_state)
+        loader = (
+            load_only,
+            [name for name, _, _ in self._resolve_ordering(order_by)],
+            eager_load,
+        )
+
+        if keyset or cursor:
+            total_count = total_pages = None
+            if with_total:
+                total_count = self._count(criteria)
+                total_pages = self._total_pages(total_count, per_page)
+            items, next_cursor, prev_cursor, has_next, has_prev = self._keyset_page(
+                criteria, per_page, order_by, cursor, loader
+            )
+            return PaginationResult(
+                items=items,
+                total=total_count,
+                page=page,
+                per_page=per_page,
+                total_pages=total_pages,
+                has_next=has_next,
+                has_prev=has_prev,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
+        offset = (page - 1) * per_page
+        strategy = strategy or self.pagination_strategy
+        if with_total:
+            items, total_count = self._page_with_total(
+                criteria, order_by, loader, offset, per_page, strategy
+            )
+            total_pages = self._total_pages(total_count, per_page)
+            has_next = page < total_pages
+        else:
+            rows = self._fetch_page(
+                criteria, order_by, loader, offset, per_page + 1, strategy
+            )
+            items = rows[:per_page]
+            total_count = total_pages = None
+            has_next = len(rows) > per_page
 
         return PaginationResult(
             items=items,
@@ -241,6 +1864,6 @@ class BaseRepository(Generic[T]):
             page=page,
             per_page=per_page,
             total_pages=total_pages,
-            has_next=(page < total_pages),
+            has_next=has_next,
             has_prev=(page > 1),
         )
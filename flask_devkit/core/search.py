@@ -0,0 +1,205 @@
+# flask_devkit/core/search.py
+"""
+Full-text search for models using `FullTextSearchMixin`.
+
+The mixin indexes the columns listed in the model's `__searchable__`:
+
+- on SQLite, in an FTS5 external-content table `<table>_fts`, kept in sync
+  with the model's table by triggers;
+- on PostgreSQL, with one GIN index per column on
+  `to_tsvector(<__search_config__>, coalesce(column, ''))`.
+
+The `search__` filter operator compiles to a query against that index
+(`SearchMatch`) and `SearchRank` scores matches so that list results can be
+ordered by relevance. Other dialects fall back to a LIKE on the search terms.
+"""
+
+import re
+from typing import Any, List
+
+from sqlalchemy import DDL, Boolean, Float, Index, event, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(value: Any) -> str:
+    """
+    Normalizes a search string into lowercase words separated by spaces,
+    which both FTS5 and `plainto_tsquery` read as "all of these words".
+    Raises ValueError if there is nothing to search for.
+    """
+    words = _WORD.findall(str(value).lower())
+    if not words:
+        raise ValueError(f"No search terms in {value!r}")
+    return " ".join(words)
+
+
+def is_searchable(column: Any) -> bool:
+    """Whether `column` (a Column or mapped attribute) has a full-text index."""
+    if hasattr(column, "__clause_element__"):
+        column = column.__clause_element__()
+    table = getattr(column, "table", None)
+    info = getattr(table, "info", None) or {}
+    return column.name in info.get("searchable", ())
+
+
+def _search_config(column: Any) -> str:
+    return column.table.info.get("search_config", "simple")
+
+
+class _SearchElement(ColumnElement):
+    inherit_cache = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("terms", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column: Any, terms: Any):
+        self.column = column
+        self.terms = terms
+
+
+class SearchMatch(_SearchElement):
+    """True for rows whose `column` matches the search `terms`."""
+
+    type = Boolean()
+    inherit_cache = True
+    _is_implicitly_boolean = True
+
+
+class SearchRank(_SearchElement):
+    """The relevance of a row's `column` for `terms`; higher is better."""
+
+    type = Float()
+    inherit_cache = True
+
+
+def _fts_parts(element: _SearchElement, compiler: Any, **kw: Any):
+    column = element.column
+    table = column.table
+    preparer = compiler.preparer
+    fts = preparer.quote(f"{table.name}_fts")
+    pk = compiler.process(list(table.primary_key)[0], **kw)
+    terms = compiler.process(element.terms, **kw)
+    return fts, f"{fts}.{preparer.quote(column.name)}", pk, terms
+
+
+@compiles(SearchMatch, "sqlite")
+def _sqlite_match(element, compiler, **kw):
+    fts, fts_column, pk, terms = _fts_parts(element, compiler, **kw)
+    return f"{pk} IN (SELECT rowid FROM {fts} WHERE {fts_column} MATCH {terms})"
+
+
+@compiles(SearchRank, "sqlite")
+def _sqlite_rank(element, compiler, **kw):
+    # FTS5's rank is bm25(), where more negative means more relevant.
+    fts, fts_column, pk, terms = _fts_parts(element, compiler, **kw)
+    return (
+        f"-(SELECT rank FROM {fts} "
+        f"WHERE {fts_column} MATCH {terms} AND {fts}.rowid = {pk})"
+    )
+
+
+def _tsvector(column: Any) -> Any:
+    config = _search_config(column)
+    return func.to_tsvector(
+        literal_column(f"'{config}'"), func.coalesce(column, literal_column("''"))
+    )
+
+
+def _tsquery(element: _SearchElement) -> Any:
+    config = _search_config(element.column)
+    return func.plainto_tsquery(literal_column(f"'{config}'"), element.terms)
+
+
+@compiles(SearchMatch, "postgresql")
+def _postgresql_match(element, compiler, **kw):
+    return compiler.process(
+        _tsvector(element.column).bool_op("@@")(_tsquery(element)), **kw
+    )
+
+
+@compiles(SearchRank, "postgresql")
+def _postgresql_rank(element, compiler, **kw):
+    return compiler.process(
+        func.ts_rank(_tsvector(element.column), _tsquery(element)), **kw
+    )
+
+
+@compiles(SearchMatch)
+def _fallback_match(element, compiler, **kw):
+    pattern = literal_column("'%'") + element.terms + literal_column("'%'")
+    return compiler.process(func.lower(element.column).like(pattern), **kw)
+
+
+@compiles(SearchRank)
+def _fallback_rank(element, compiler, **kw):
+    return "0"
+
+
+def install_search_index(mapper: Any, cls: Any) -> None:
+    """
+    Declares the full-text index DDL for a model using FullTextSearchMixin.
+    Called once the model's mapper has been constructed.
+    """
+    columns: List[str] = list(getattr(cls, "__searchable__", ()))
+    if not columns:
+        return
+    table = mapper.local_table
+    if "searchable" in table.info:
+        return
+    config = getattr(cls, "__search_config__", "simple")
+    if not re.fullmatch(r"\w+", config):
+        raise ValueError(f"Invalid text search configuration: {config!r}")
+    table.info["searchable"] = tuple(columns)
+    table.info["search_config"] = config
+
+    # PostgreSQL: one GIN expression index per column, matching _tsvector().
+    for name in columns:
+        Index(
+            f"ix_{table.name}_{name}_fts",
+            _tsvector(table.c[name]),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql")
+
+    # SQLite: an FTS5 table over the model's table, synced by triggers.
+    name = table.name
+    fts = f"{name}_fts"
+    pk = list(table.primary_key)[0].name
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    statements = [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{cols}, content='{name}', content_rowid='{pk}')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.{pk}, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.{pk}, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new}); END",
+    ]
+    for statement in statements:
+        ddl = DDL(statement).execute_if(dialect="sqlite")
+        event.listen(table, "after_create", ddl)
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite"),
+    )
+
+
+def rebuild_search_index(connection: Any, model: Any) -> None:
+    """
+    Re-indexes all rows of `model`, e.g. after adding the mixin to a table
+    that already holds data. PostgreSQL indexes need no rebuild.
+    """
+    if connection.dialect.name == "sqlite":
+        fts = f"{model.__table__.name}_fts"
+        connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -6,11 +6,25 @@ This module contains the BaseService class, which orchestrates repository
 operations and manages database transactions.
 """
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
-
+from inspect import signature
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
-from flask_devkit.core.exceptions import NotFoundError
+from flask_devkit.core.cache import session_has_writes
+from flask_devkit.core.exceptions import BusinessLogicError, NotFoundError
+from flask_devkit.core.loader import BatchLoader, get_loader
 from flask_devkit.core.repository import BaseRepository, PaginationResult
 
 TModel = TypeVar("TModel")
@@ -41,6 +55,16 @@ class BaseService(Generic[TModel]):
     def post_create_hook(self, instance: TModel) -> TModel:
         return instance
 
+    def pre_create_many_hook(
+        self, data_list: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        return [self.pre_create_hook(data) for data in data_list]
+
+    def post_create_many_hook(
+        self, instances: Optional[List[TModel]]
+    ) -> Optional[List[TModel]]:
+        return instances
+
     def pre_update_hook(self, instance: TModel, data: Dict[str, Any]):
         for key, value in data.items():
             if hasattr(instance, key):
@@ -90,6 +114,25 @@ class BaseService(Generic[TModel]):
         self._db_session.refresh(entity)
         return self.post_create_hook(entity)
 
+    def create_many(
+        self,
+        data_list: List[Dict[str, Any]],
+        batch_size: int = 1000,
+        return_entities: bool = True,
+    ) -> Optional[List[TModel]]:
+        """
+        Creates many entities with batched INSERT statements.
+
+        Unlike `create`, rows are not refreshed one by one. Pass
+        `return_entities=False` to skip fetching the created rows entirely,
+        e.g. for large imports.
+        """
+        processed_data = self.pre_create_many_hook(list(data_list))
+        entities = self.repo.create_many(
+            processed_data, batch_size=batch_size, return_entities=return_entities
+        )
+        return self.post_create_many_hook(entities)
+
     def update(
         self, entity_id: Any, data: Dict[str, Any], id_field: str = "id"
     ) -> TModel:
@@ -141,19 +184,217 @@ class BaseService(Generic[TModel]):
         self.post_force_delete_hook(entity)
         return None
 
+    # --- Set-Based Write Operations ---
+    # These issue a single statement for all matching rows and return the
+    # number of rows affected. Per-entity hooks are not run. Empty filters
+    # raise unless `all_rows=True` confirms that every row is targeted.
+    def update_where(
+        self, filters: Dict[str, Any], values: Dict[str, Any], all_rows: bool = False
+    ) -> int:
+        return self.repo.update_where(filters, values, all_rows=all_rows)
+
+    def soft_delete_where(self, filters: Dict[str, Any], all_rows: bool = False) -> int:
+        return self.repo.soft_delete_where(filters, all_rows=all_rows)
+
+    def restore_where(self, filters: Dict[str, Any], all_rows: bool = False) -> int:
+        return self.repo.restore_where(filters, all_rows=all_rows)
+
+    def force_delete_where(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        deleted_state: str = "deleted_only",
+        chunk_size: int = 1000,
+        all_rows: bool = False,
+        commit_chunks: bool = False,
+    ) -> int:
+        """
+        Archives and permanently deletes all rows matching `filters` (by
+        default only soft-deleted ones) in chunks of `chunk_size` rows. Empty
+        filters raise unless `all_rows=True`.
+
+        By default each chunk runs in a savepoint of the caller's transaction,
+        so a failure only rolls back the current chunk, and committing is
+        left to the caller, as for every other service method. Locks are then
+        held until that commit. With `commit_chunks=True` each chunk is
+        committed on a session of its own instead, which keeps locks and undo
+        bounded to one chunk; the caller's session must not hold uncommitted
+        changes then, since the purge would neither see nor include them.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size!r}")
+        if commit_chunks and session_has_writes(self._db_session):
+            raise BusinessLogicError(
+                "Commit or roll back pending changes before purging in "
+                "committed chunks.",
+                error_code="PENDING_CHANGES",
+            )
+        total = 0
+        while True:
+            if commit_chunks:
+                deleted = self._force_delete_committed_chunk(
+                    filters, deleted_state, chunk_size, all_rows
+                )
+            else:
+                with self._db_session.begin_nested():
+                    deleted = self.repo.force_delete_where(
+                        filters,
+                        deleted_state=deleted_state,
+                        limit=chunk_size,
+                        all_rows=all_rows,
+                    )
+            total += deleted
+            if deleted < chunk_size:
+                if commit_chunks and total:
+                    # Objects loaded before the purge may point at deleted rows.
+                    self._db_session.expire_all()
+                return total
+
+    def _force_delete_committed_chunk(
+        self,
+        filters: Optional[Dict[str, Any]],
+        deleted_state: str,
+        chunk_size: int,
+        all_rows: bool,
+    ) -> int:
+        bind = self._db_session.get_bind(mapper=inspect(self.model))
+        with Session(bind=bind) as chunk_session, chunk_session.begin():
+            repo = type(self.repo)(model=self.model, db_session=chunk_session)
+            return repo.force_delete_where(
+                filters,
+                deleted_state=deleted_state,
+                limit=chunk_size,
+                all_rows=all_rows,
+            )
+
     # --- Read Operations ---
-    def get_by_id(self, id_: Any, deleted_state: str = "active") -> Optional[TModel]:
+    @staticmethod
+    def _loader_kwargs(
+        repo_method: Callable,
+        load_only: Optional[List[str]],
+        eager_load: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """
+        Returns the loader options that are set and that `repo_method`
+        accepts. They only change how rows are loaded, so they are dropped
+        for repositories overriding it with the basic signature.
+        """
+        parameters = signature(repo_method).parameters
+        accepts_any = any(p.kind is p.VAR_KEYWORD for p in parameters.values())
+        options: Dict[str, Any] = {}
+        if load_only:
+            options["load_only"] = load_only
+        if eager_load:
+            options["eager_load"] = eager_load
+        return {
+            key: value
+            for key, value in options.items()
+            if accepts_any or key in parameters
+        }
+
+    def get_by_id(
+        self,
+        id_: Any,
+        deleted_state: str = "active",
+        load_only: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
+    ) -> Optional[TModel]:
         self.pre_get_hook(id_, "id")
-        entity = self.repo.get_by_id(id_, deleted_state=deleted_state)
+        # Loader options are only forwarded when set, as for `paginate` below.
+        options = self._loader_kwargs(self.repo.get_by_id, load_only, eager_load)
+        entity = self.repo.get_by_id(id_, deleted_state=deleted_state, **options)
         return self.post_get_hook(entity)
 
     def get_by_uuid(
-        self, uuid_: str, deleted_state: str = "active"
+        self,
+        uuid_: str,
+        deleted_state: str = "active",
+        load_only: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
     ) -> Optional[TModel]:
         self.pre_get_hook(uuid_, "uuid")
-        entity = self.repo.get_by_uuid(uuid_, deleted_state=deleted_state)
+        options = self._loader_kwargs(self.repo.get_by_uuid, load_only, eager_load)
+        entity = self.repo.get_by_uuid(uuid_, deleted_state=deleted_state, **options)
         return self.post_get_hook(entity)
 
+    def get_many_by_ids(
+        self, ids: List[Any], deleted_state: str = "active"
+    ) -> List[Optional[TModel]]:
+        """Fetches entities by id in one query, in input order (None if missing)."""
+        for id_ in ids:
+            self.pre_get_hook(id_, "id")
+        entities = self.repo.get_many_by_ids(ids, deleted_state=deleted_state)
+        return [self.post_get_hook(entity) for entity in entities]
+
+    def get_many_by_uuids(
+        self, uuids: List[str], deleted_state: str = "active"
+    ) -> List[Optional[TModel]]:
+        """Fetches entities by uuid in one query, in input order (None if missing)."""
+        for uuid_ in uuids:
+            self.pre_get_hook(uuid_, "uuid")
+        entities = self.repo.get_many_by_uuids(uuids, deleted_state=deleted_state)
+        return [self.post_get_hook(entity) for entity in entities]
+
+    def exists(
+        self, filters: Optional[Dict[str, Any]] = None, deleted_state: str = "active"
+    ) -> bool:
+        """Checks whether any entity matches `filters` without loading it."""
+        return self.repo.exists(filters=filters, deleted_state=deleted_state)
+
+    def count(
+        self, filters: Optional[Dict[str, Any]] = None, deleted_state: str = "active"
+    ) -> int:
+        """Counts the entities matching `filters` without loading them."""
+        return self.repo.count(filters=filters, deleted_state=deleted_state)
+
+    def aggregate(
+        self,
+        group_by: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        deleted_state: str = "active",
+    ) -> List[Dict[str, Any]]:
+        """
+        Computes metrics such as "count" or "sum:amount" per group in the
+        database. See `BaseRepository.aggregate`.
+        """
+        return self.repo.aggregate(
+            group_by=group_by,
+            metrics=metrics,
+            filters=filters,
+            deleted_state=deleted_state,
+        )
+
+    def iter_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[List[str]] = None,
+        chunk_size: int = 1000,
+        deleted_state: str = "active",
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[Any]:
+        """
+        Streams all matching entities (or rows of `columns`) in chunks of
+        `chunk_size`, e.g. for exports and backfills. See
+        `BaseRepository.iter_all`.
+        """
+        return self.repo.iter_all(
+            filters=filters,
+            order_by=order_by,
+            chunk_size=chunk_size,
+            deleted_state=deleted_state,
+            columns=columns,
+        )
+
+    def loader(self, id_field: str = "uuid") -> BatchLoader:
+        """
+        Returns the request-scoped BatchLoader resolving active entities by
+        `id_field` ("id" or "uuid"). Lookups queued with `loader.load(key)`
+        are fetched together with one `get_many_by_*` call, and repeated
+        lookups within the request are served from the loader's cache.
+        """
+        batch_fn = getattr(self, f"get_many_by_{id_field}s")
+        return get_loader(self, id_field, batch_fn)
+
     def paginate(
         self,
         page: int = 1,
@@ -161,6 +402,12 @@ class BaseService(Generic[TModel]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[List[str]] = None,
         deleted_state: str = "active",
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        with_total: bool = True,
+        strategy: Optional[str] = None,
+        load_only: Optional[List[str]] = None,
+        eager_load: Optional[Dict[str, str]] = None,
     ) -> PaginationResult[TModel]:
         params = {
             "page": page,
@@ -169,6 +416,17 @@ class BaseService(Generic[TModel]):
             "order_by": order_by,
             "deleted_state": deleted_state,
         }
+        # Optional pagination modes are only forwarded when requested so that
+        # repositories overriding `paginate` with the basic signature keep working.
+        if cursor is not None:
+            params["cursor"] = cursor
+        if keyset:
+            params["keyset"] = keyset
+        if not with_total:
+            params["with_total"] = with_total
+        if strategy is not None:
+            params["strategy"] = strategy
+        params.update(self._loader_kwargs(self.repo.paginate, load_only, eager_load))
         processed_params = self.pre_list_hook(params)
         result = self.repo.paginate(**processed_params)
         return self.post_list_hook(result)
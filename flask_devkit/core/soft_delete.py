@@ -0,0 +1,99 @@
+# flask_devkit/core/soft_delete.py
+"""
+Partial indexes and a global active-row filter for soft-deleted models.
+
+Models using SoftDeleteMixin can declare indexes covering only their active
+rows (`deleted_at IS NULL`), which every repository read of active rows
+filters on:
+
+    class User(Base, IDMixin, SoftDeleteMixin):
+        __active_unique__ = ("username",)
+        __active_indexes__ = (("is_active", "created_at"),)
+
+Each entry is a column name or a tuple of column names. On PostgreSQL and
+SQLite they become partial indexes, so deleted rows neither bloat them nor
+collide with active rows on `__active_unique__` columns: the username of a
+deleted user can be taken again. Other databases (MySQL) have no partial
+indexes and get regular ones instead. Upserts on the columns of an
+`__active_unique__` entry target its partial index.
+
+With `DEVKIT_SOFT_DELETE_CRITERIA = True`, every ORM SELECT, including
+relationship loads, skips the soft-deleted rows of SoftDeleteMixin models
+through `with_loader_criteria`. Statements executed with the
+`devkit_include_deleted` execution option are left alone; `BaseRepository`
+sets it for reads with a `deleted_state` of "all" or "deleted_only".
+"""
+
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import Index
+from sqlalchemy.orm import ORMExecuteState, with_loader_criteria
+
+INCLUDE_DELETED_OPTION = "devkit_include_deleted"
+
+
+def _column_groups(entries: Sequence[Any]) -> List[Tuple[str, ...]]:
+    return [(entry,) if isinstance(entry, str) else tuple(entry) for entry in entries]
+
+
+def install_active_indexes(mapper: Any, cls: Any) -> None:
+    """
+    Declares the partial indexes of a model using SoftDeleteMixin. Called once
+    the model's mapper has been constructed.
+    """
+    table = mapper.local_table
+    deleted_at = table.c.get("deleted_at")
+    if deleted_at is None or "active_unique" in table.info:
+        return
+    uniques = _column_groups(getattr(cls, "__active_unique__", ()))
+    indexes = _column_groups(getattr(cls, "__active_indexes__", ()))
+    table.info["active_unique"] = tuple(uniques)
+
+    active = deleted_at.is_(None)
+    for columns, unique in [(c, True) for c in uniques] + [(c, False) for c in indexes]:
+        prefix = "uq" if unique else "ix"
+        Index(
+            f"{prefix}_{table.name}_{'_'.join(columns)}_active",
+            *(table.c[name] for name in columns),
+            unique=unique,
+            postgresql_where=active,
+            sqlite_where=active,
+            info={"active_only": True},
+        )
+
+
+def active_unique_where(table: Any, columns: Sequence[str]) -> Optional[Any]:
+    """
+    Returns the predicate of the partial unique index over exactly `columns`,
+    as needed to infer it as an ON CONFLICT target, or None if there is none.
+    """
+    for unique in table.info.get("active_unique", ()):
+        if set(unique) == set(columns):
+            return table.c.deleted_at.is_(None)
+    return None
+
+
+def exclude_soft_deleted(mixin: type) -> Callable[[ORMExecuteState], None]:
+    """
+    Returns a `do_orm_execute` listener that adds the active-row criterion of
+    every model using `mixin` to ORM SELECTs while the current app enables
+    `DEVKIT_SOFT_DELETE_CRITERIA`.
+    """
+    option = with_loader_criteria(
+        mixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True
+    )
+
+    def listener(orm_execute_state: ORMExecuteState) -> None:
+        if (
+            not orm_execute_state.is_select
+            # Refreshing the attributes of an entity that was loaded anyway.
+            or orm_execute_state.is_column_load
+            or orm_execute_state.execution_options.get(INCLUDE_DELETED_OPTION)
+            or not has_app_context()
+            or not current_app.config.get("DEVKIT_SOFT_DELETE_CRITERIA", False)
+        ):
+            return
+        orm_execute_state.statement = orm_execute_state.statement.options(option)
+
+    return listener
@@ -0,0 +1,122 @@
+# flask_devkit/core/statements.py
+"""
+Reusable SELECT statements and SQL compilation statistics.
+
+`BaseRepository` builds its reads as 2.0-style `select()` statements whose
+varying values (filter values, limits, offsets, cursor keys, looked-up
+identifiers) are all named bind parameters supplied at execution time. A
+statement therefore only depends on its shape: the model, the kind of read,
+the filter signature, `deleted_state`, the ordering and the loader options.
+The StatementCache keeps the statement built for each shape, so a repeated
+read neither rebuilds it nor recomputes its cache key, and SQLAlchemy finds
+its SQL string in the engine's compiled cache instead of compiling it again.
+
+`compiled_cache_stats` counts, for every statement executed by any engine,
+whether its SQL came from the compiled cache (`hits`), had to be compiled
+(`misses`) or could not be cached at all (`uncached`, e.g. raw SQL strings
+and DDL). A low hit rate in a warmed-up process means statements are being
+built with varying shapes.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+
+class StatementCache:
+    """A thread-safe, size-bounded LRU cache of built statements by shape."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Returns the statement cached under `key`, building it on a miss."""
+        with self._lock:
+            statement = self._entries.get(key)
+            if statement is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return statement
+            self.misses += 1
+        # Built outside the lock: a concurrent miss builds an equal statement.
+        statement = build()
+        with self._lock:
+            self._entries[key] = statement
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return statement
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+statement_cache = StatementCache()
+
+
+class CompiledCacheStats:
+    """Thread-safe counters of compiled cache lookups made by executed statements."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def record(self, cache_hit: Any) -> None:
+        with self._lock:
+            if cache_hit == CacheStats.CACHE_HIT:
+                self.hits += 1
+            elif cache_hit == CacheStats.CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.uncached = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+compiled_cache_stats = CompiledCacheStats()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_compiled_cache_lookup(
+    conn, cursor, statement, parameters, context, executemany
+):
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is not None:
+        compiled_cache_stats.record(cache_hit)
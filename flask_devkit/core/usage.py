@@ -0,0 +1,371 @@
+# flask_devkit/core/usage.py
+"""
+Records which filter and sort combinations list queries use, and recommends
+indexes for them.
+
+`BaseRepository.paginate` reports every call to `usage_recorder`, which keeps
+per (table, filtered columns and operators, sort columns) call counts and
+latencies in a size-bounded in-memory table. Recording can be turned off
+with `DEVKIT_QUERY_USAGE = False`.
+
+When `DEVKIT_QUERY_USAGE_FILE` names a SQLite file, the counts are also
+merged into that file every `DEVKIT_QUERY_USAGE_FLUSH` (default 100) calls,
+so that usage from all worker processes can be analysed together by the
+`devkit-index-advice` command. The file is written on a background thread
+and once more at interpreter exit; a failing write is logged and never
+fails or delays the list request that triggered it.
+
+`recommend_indexes` turns the usage into composite index suggestions,
+ordering columns as equality filters, then sort columns, then one range
+filter, and skips combinations an existing index already serves.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import inspect
+
+from flask_devkit.core.filters import parse_filters
+
+EQUALITY_OPERATORS = frozenset({"eq", "in"})
+RANGE_OPERATORS = frozenset({"lt", "lte", "gt", "gte"})
+
+UsageKey = Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...], Tuple[str, ...]]
+
+
+class UsageStats(NamedTuple):
+    calls: int
+    total_seconds: float
+    max_seconds: float
+
+    def add(self, other: "UsageStats") -> "UsageStats":
+        return UsageStats(
+            self.calls + other.calls,
+            self.total_seconds + other.total_seconds,
+            max(self.max_seconds, other.max_seconds),
+        )
+
+
+class IndexAdvice(NamedTuple):
+    """A recommended index and the recorded list queries it would serve."""
+
+    table: str
+    columns: Tuple[str, ...]
+    calls: int
+    total_seconds: float
+    max_seconds: float
+    share: float
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+def usage_key(
+    model: Any,
+    filters: Optional[Dict[str, Any]],
+    order_by: Optional[List[str]],
+    deleted_state: str,
+) -> UsageKey:
+    """
+    Describes a list query by its table, the columns it filters on with the
+    operators used for each, and its sort columns. Values are not part of
+    the key. Names that are not mapped columns are left out.
+    """
+    mapper = inspect(model)
+    columns = {attr.key: attr.columns[0].name for attr in mapper.column_attrs}
+    conditions: Dict[str, set] = {}
+    signature, _ = parse_filters(filters)
+    for field_name, ops in signature:
+        if field_name in columns:
+            conditions.setdefault(columns[field_name], set()).update(ops)
+    if "deleted_at" in columns and deleted_state != "all":
+        # The soft-delete filter: IS NULL behaves like an equality.
+        op = "eq" if deleted_state == "active" else "gt"
+        conditions.setdefault(columns["deleted_at"], set()).add(op)
+    sort = tuple(
+        columns[name.lstrip("-")]
+        for name in order_by or ()
+        if name.lstrip("-") in columns
+    )
+    return (
+        mapper.local_table.name,
+        tuple(sorted((name, tuple(sorted(ops))) for name, ops in conditions.items())),
+        sort,
+    )
+
+
+class QueryUsageRecorder:
+    """
+    A thread-safe, size-bounded table of list query usage.
+
+    The least recently used combinations are evicted first. Counts recorded
+    since the last `flush` are kept apart so that they can be merged into a
+    shared file without counting anything twice.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, UsageStats]" = OrderedDict()
+        self._unflushed: Dict[Hashable, UsageStats] = {}
+        self._unflushed_calls = 0
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._exit_flush: Optional[Tuple[str, Any]] = None
+        self._atexit_registered = False
+
+    def record(self, key: UsageKey, seconds: float) -> int:
+        """Adds one call; returns the number of calls not flushed yet."""
+        sample = UsageStats(1, seconds, seconds)
+        with self._lock:
+            entry = self._entries.get(key)
+            self._entries[key] = entry.add(sample) if entry else sample
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            pending = self._unflushed.get(key)
+            self._unflushed[key] = pending.add(sample) if pending else sample
+            if len(self._unflushed) > self.maxsize:
+                self._unflushed.pop(next(iter(self._unflushed)))
+            self._unflushed_calls += 1
+            return self._unflushed_calls
+
+    def snapshot(self) -> Dict[UsageKey, UsageStats]:
+        with self._lock:
+            return dict(self._entries)
+
+    def flush(self, path: str) -> None:
+        """
+        Merges the calls recorded since the last flush into `path`. If the
+        write fails, the calls are kept for the next flush.
+        """
+        with self._lock:
+            pending, self._unflushed = self._unflushed, {}
+            self._unflushed_calls = 0
+        if not pending:
+            return
+        try:
+            write_usage_file(path, pending)
+        except Exception:
+            with self._lock:
+                for key, stats in self._unflushed.items():
+                    pending[key] = pending[key].add(stats) if key in pending else stats
+                self._unflushed = pending
+            raise
+
+    def flush_in_background(self, path: str, logger: Any) -> None:
+        """
+        Flushes into `path` on a background thread, logging failures to
+        `logger`, unless a flush is already running. Whatever is left
+        unflushed is written again when the interpreter exits.
+        """
+        with self._lock:
+            if not self._atexit_registered:
+                atexit.register(self._flush_at_exit)
+                self._atexit_registered = True
+            self._exit_flush = (path, logger)
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(
+                target=self._safe_flush,
+                args=(path, logger),
+                name="devkit-query-usage-flush",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Waits for a running background flush to finish."""
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join(timeout)
+
+    def _safe_flush(self, path: str, logger: Any) -> None:
+        try:
+            self.flush(path)
+        except Exception as e:
+            logger.warning(f"Could not write query usage to {path}: {e}")
+
+    def _flush_at_exit(self) -> None:
+        self.join()
+        if self._exit_flush is not None:
+            self._safe_flush(*self._exit_flush)
+
+    def clear(self) -> None:
+        self.join()
+        with self._lock:
+            self._entries.clear()
+            self._unflushed.clear()
+            self._unflushed_calls = 0
+            self._exit_flush = None
+
+
+usage_recorder = QueryUsageRecorder()
+
+_CREATE_USAGE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS devkit_query_usage ("
+    "table_name TEXT NOT NULL, conditions TEXT NOT NULL, sort TEXT NOT NULL, "
+    "calls INTEGER NOT NULL, total_seconds REAL NOT NULL, "
+    "max_seconds REAL NOT NULL, PRIMARY KEY (table_name, conditions, sort))"
+)
+
+
+def write_usage_file(path: str, usage: Dict[UsageKey, UsageStats]) -> None:
+    """Adds `usage` to the counts stored in the SQLite file at `path`."""
+    connection = sqlite3.connect(path, timeout=5)
+    try:
+        with connection:
+            connection.execute(_CREATE_USAGE_TABLE)
+            connection.executemany(
+                "INSERT INTO devkit_query_usage VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (table_name, conditions, sort) DO UPDATE SET "
+                "calls = calls + excluded.calls, "
+                "total_seconds = total_seconds + excluded.total_seconds, "
+                "max_seconds = max(max_seconds, excluded.max_seconds)",
+                [
+                    (table, json.dumps(conditions), json.dumps(sort), *stats)
+                    for (table, conditions, sort), stats in usage.items()
+                ],
+            )
+    finally:
+        connection.close()
+
+
+def read_usage_file(path: str) -> Dict[UsageKey, UsageStats]:
+    if not os.path.exists(path):
+        return {}
+    connection = sqlite3.connect(path, timeout=5)
+    try:
+        connection.execute(_CREATE_USAGE_TABLE)
+        rows = connection.execute("SELECT * FROM devkit_query_usage").fetchall()
+    finally:
+        connection.close()
+    usage = {}
+    for table, conditions, sort, calls, total, slowest in rows:
+        key = (
+            table,
+            tuple((name, tuple(ops)) for name, ops in json.loads(conditions)),
+            tuple(json.loads(sort)),
+        )
+        usage[key] = UsageStats(calls, total, slowest)
+    return usage
+
+
+def record_query(
+    model: Any,
+    filters: Optional[Dict[str, Any]],
+    order_by: Optional[List[str]],
+    deleted_state: str,
+    seconds: float,
+) -> None:
+    """
+    Records one list query, as configured by the current app. Errors are
+    logged instead of raised: recording must not fail the query.
+    """
+    in_app = has_app_context()
+    config = current_app.config if in_app else {}
+    logger = current_app.logger if in_app else logging.getLogger(__name__)
+    if not config.get("DEVKIT_QUERY_USAGE", True):
+        return
+    try:
+        key = usage_key(model, filters, order_by, deleted_state)
+        unflushed = usage_recorder.record(key, seconds)
+        path = config.get("DEVKIT_QUERY_USAGE_FILE")
+        if path and unflushed >= config.get("DEVKIT_QUERY_USAGE_FLUSH", 100):
+            usage_recorder.flush_in_background(path, logger)
+    except Exception as e:
+        logger.warning(f"Could not record query usage: {e}")
+
+
+def index_columns(
+    conditions: Iterable[Tuple[str, Tuple[str, ...]]], sort: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Returns the equality columns and the ordered remaining columns of the
+    index serving a query. Conditions no B-tree index can serve (`ne`,
+    `like`, `search`, ...) are ignored.
+    """
+    equality = []
+    ranges = []
+    for name, ops in conditions:
+        ops = set(ops)
+        if ops <= EQUALITY_OPERATORS:
+            equality.append(name)
+        elif ops <= EQUALITY_OPERATORS | RANGE_OPERATORS:
+            ranges.append(name)
+    rest = [name for name in sort if name not in equality]
+    if not rest and ranges:
+        # Without a sort, the index can also seek on one range.
+        rest.append(ranges[0])
+    return tuple(equality), tuple(dict.fromkeys(rest))
+
+
+def _existing_indexes(table: Any) -> List[Tuple[str, ...]]:
+    indexes = [tuple(c.name for c in table.primary_key.columns)]
+    for index in table.indexes:
+        if all(hasattr(c, "name") for c in index.expressions):
+            columns = tuple(c.name for c in index.expressions)
+            if index.info.get("active_only"):
+                # A partial index serves the `deleted_at IS NULL` equality.
+                columns = ("deleted_at", *columns)
+            indexes.append(columns)
+    for constraint in table.constraints:
+        columns = getattr(constraint, "columns", None)
+        if columns is not None:
+            indexes.append(tuple(c.name for c in columns))
+    return indexes
+
+
+def _is_covered(
+    equality: Tuple[str, ...], rest: Tuple[str, ...], indexes: List[Tuple[str, ...]]
+) -> bool:
+    for index in indexes:
+        if len(index) >= len(equality) + len(rest) and (
+            set(index[: len(equality)]) == set(equality)
+            and index[len(equality) : len(equality) + len(rest)] == rest
+        ):
+            return True
+    return False
+
+
+def recommend_indexes(
+    usage: Dict[UsageKey, UsageStats], tables: Dict[str, Any]
+) -> List[IndexAdvice]:
+    """
+    Suggests composite indexes for the recorded list queries on `tables`
+    (a name to Table mapping) that no existing index serves, with the most
+    time-consuming ones first. `share` is the fraction of all recorded list
+    query time spent on the queries an index would serve.
+    """
+    overall = sum(stats.total_seconds for stats in usage.values())
+    grouped: Dict[Tuple[str, Tuple[str, ...]], UsageStats] = {}
+    for (table_name, conditions, sort), stats in usage.items():
+        table = tables.get(table_name)
+        if table is None:
+            continue
+        equality, rest = index_columns(conditions, sort)
+        if not equality + rest or _is_covered(
+            equality, rest, _existing_indexes(table)
+        ):
+            continue
+        key = (table_name, equality + rest)
+        grouped[key] = grouped[key].add(stats) if key in grouped else stats
+    advice = [
+        IndexAdvice(
+            table,
+            columns,
+            stats.calls,
+            stats.total_seconds,
+            stats.max_seconds,
+            stats.total_seconds / overall if overall else 0.0,
+        )
+        for (table, columns), stats in grouped.items()
+    ]
+    return sorted(advice, key=lambda a: a.total_seconds, reverse=True)
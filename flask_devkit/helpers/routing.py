@@ -3,17 +3,24 @@
 Provides a powerful factory function to auto-generate CRUD REST endpoints.
 """
 
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from apiflask import APIBlueprint
 from apiflask.exceptions import HTTPError, _ValidationError
 from flask import current_app
 from flask_jwt_extended import jwt_required
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+from marshmallow import fields
 from marshmallow.exceptions import ValidationError
+from marshmallow_sqlalchemy.fields import Related
+from sqlalchemy import inspect as sa_inspect
 from werkzeug.exceptions import HTTPException
 
-from flask_devkit.core.exceptions import AppBaseException, NotFoundError
+from flask_devkit.core.exceptions import (
+    AppBaseException,
+    InvalidAggregateError,
+    NotFoundError,
+)
 
 try:
     from flask_jwt_extended.exceptions import (
@@ -30,9 +37,25 @@ except ImportError:
     RevokedTokenError = None
     WrongTokenError = None
 from flask_devkit.auth.decorators import permission_required
+from flask_devkit.core.repository import parse_metric
 from flask_devkit.core.service import BaseService
 from flask_devkit.core.unit_of_work import unit_of_work
-from flask_devkit.helpers.schemas import MessageSchema
+from flask_devkit.helpers.schemas import (
+    CountSchema,
+    MessageSchema,
+    StatsSchema,
+    create_stats_query_schema,
+)
+
+_RELATED_FIELDS = (fields.Nested, Related)
+
+# Routes that are only registered when enabled in `routes_config`.
+_OPT_IN_ROUTES = ("stats",)
+
+# Routes exposing the rows of another route, whose access settings they
+# default to unless their own config overrides them.
+_ACCESS_PARENTS = {"count": "list", "stats": "list"}
+_INHERITED_ACCESS = ("enabled", "auth_required", "permission")
 
 
 def register_error_handlers(bp: APIBlueprint):
@@ -168,6 +191,73 @@ def _get_schema_details(schema_info, default_location=None):
     return schema_info, default_location, None
 
 
+_MAX_EAGER_DEPTH = 3
+
+
+def _is_related_field(field: fields.Field) -> bool:
+    if isinstance(field, fields.List):
+        field = field.inner
+    return isinstance(field, _RELATED_FIELDS)
+
+
+def _nested_schema(field: fields.Field) -> Optional[Any]:
+    if isinstance(field, fields.List):
+        field = field.inner
+    return field.schema if isinstance(field, fields.Nested) else None
+
+
+def _collect_load_plan(
+    schema: Any, mapper: Any, prefix: str, eager_load: Dict[str, str], depth: int
+) -> Optional[List[str]]:
+    columns: List[str] = []
+    projectable = True
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        if attribute in mapper.column_attrs:
+            columns.append(attribute)
+            continue
+        if attribute in mapper.relationships and _is_related_field(field):
+            relationship = mapper.relationships[attribute]
+            path = f"{prefix}{attribute}"
+            eager_load[path] = "selectin"
+            # Relationships are loaded through the entity's local columns.
+            columns.extend(
+                mapper.get_property_by_column(column).key
+                for column in relationship.local_columns
+            )
+            nested = _nested_schema(field)
+            if nested is not None and depth < _MAX_EAGER_DEPTH:
+                _collect_load_plan(
+                    nested, relationship.mapper, f"{path}.", eager_load, depth + 1
+                )
+            continue
+        projectable = False
+    return columns if projectable and columns else None
+
+
+def _schema_load_plan(
+    schema: Any, model: Any
+) -> Tuple[Optional[List[str]], Dict[str, str]]:
+    """
+    Works out how to load the entities dumped by an output schema (or by the
+    item schema of a pagination schema).
+
+    Returns the column attributes to load, or None if the schema also dumps
+    computed fields that may need other columns, and the relationship paths
+    reached through Nested or related fields, to be eager loaded with
+    "selectin" so that serializing a page does not lazy load per row.
+    """
+    if schema is None or model is None:
+        return None, {}
+    instance = schema() if isinstance(schema, type) else schema
+    items = instance.fields.get("items")
+    if isinstance(items, fields.List) and isinstance(items.inner, fields.Nested):
+        instance = items.inner.schema
+    eager_load: Dict[str, str] = {}
+    columns = _collect_load_plan(instance, sa_inspect(model), "", eager_load, 0)
+    return columns, eager_load
+
+
 def _prepare_input_schemes(
     route_cfg: Dict[str, Any], default_schema: Any, http_method: str
 ) -> List[Dict[str, Any]]:
@@ -222,10 +312,21 @@ def register_crud_routes(
     """
     Registers a standard set of CRUD routes for a given entity.
     This version allows for custom schemas and flexible data location per route.
+
+    The `GET /stats` route is opt-in. It aggregates in the database over the
+    list filters and only accepts the fields whitelisted in its config, e.g.
+    `routes_config={"stats": {"enabled": True, "group_by": ["status"],
+    "aggregate": ["amount"]}}` allows `?group_by=status&metrics=count,sum:amount`.
+
+    The `GET /count` and `GET /stats` routes expose the rows of the list
+    route, so unless configured otherwise they share its `auth_required` and
+    `permission` settings, and `/count` is disabled along with it.
     """
     register_error_handlers(bp)
 
     cfg: Dict[str, Dict[str, Any]] = routes_config or {}
+    # Loader options for read routes, filled in when the routes are built.
+    loader_options: Dict[str, Dict[str, Any]] = {}
 
     # --- Helper to build a decorated view ---
     def build_view(
@@ -239,7 +340,16 @@ def register_crud_routes(
         uow: bool,
     ):
         route_cfg = cfg.get(route_name, {})
-        if not route_cfg.get("enabled", True):
+        parent_cfg = cfg.get(_ACCESS_PARENTS.get(route_name), {})
+        inherited = {
+            key: parent_cfg[key]
+            for key in _INHERITED_ACCESS
+            if key in parent_cfg
+            # An opt-in route is not enabled by its parent being enabled.
+            and not (key == "enabled" and route_name in _OPT_IN_ROUTES)
+        }
+        route_cfg = {**inherited, **route_cfg}
+        if not route_cfg.get("enabled", route_name not in _OPT_IN_ROUTES):
             return
 
         auth_required = route_cfg.get("auth_required", True)
@@ -255,6 +365,20 @@ def register_crud_routes(
         output_schema_info = route_cfg.get("output_schema", default_output)
         output_schema, _, _ = _get_schema_details(output_schema_info)
 
+        if route_name in ("list", "list_deleted", "get"):
+            columns, relationships = _schema_load_plan(
+                output_schema, getattr(service, "model", None)
+            )
+            # Projection is opt-in: hooks may read columns the schema does not
+            # dump, which would then be lazy loaded one row at a time.
+            load_only = route_cfg.get("load_only", False)
+            eager_load = route_cfg.get("eager_load", True)
+            options = {
+                "load_only": columns if load_only is True else list(load_only or []),
+                "eager_load": relationships if eager_load is True else eager_load,
+            }
+            loader_options[route_name] = {k: v for k, v in options.items() if v}
+
         def view_wrapper(**kwargs):
             data = _merge_schema_data(input_schema_configs, **kwargs)
             return view_logic(data=data, **kwargs)
@@ -295,39 +419,89 @@ def register_crud_routes(
         bp.route(rule, methods=[http_method])(final_view)
 
     # --- Define View Logics ---
-    def list_logic(data, **kwargs):
+    def list_params(data, route_name, deleted_state=None):
         filters = data.copy()
-        page = filters.pop("page", 1)
-        per_page = filters.pop("per_page", 10)
+        list_cfg = cfg.get(route_name, {})
         sort_by_str = filters.pop("sort_by", None)
-        deleted_state = filters.pop("deleted_state", "active")
         order_by = [s.strip() for s in sort_by_str.split(",")] if sort_by_str else None
-        return service.paginate(
-            page=page,
-            per_page=per_page,
-            filters=filters,
-            order_by=order_by,
-            deleted_state=deleted_state,
-        ), 200
+        requested_state = filters.pop("deleted_state", "active")
+
+        # Timestamp bounds from BaseFilterQuerySchema become a created_at range.
+        created_range = [
+            f"{op}__{filters.pop(param).isoformat()}"
+            for param, op in (("created_after", "gt"), ("created_before", "lt"))
+            if filters.get(param) is not None
+        ]
+        if created_range:
+            existing = filters.get("created_at")
+            filters["created_at"] = ([existing] if existing else []) + created_range
+
+        params = {
+            "page": filters.pop("page", 1),
+            "per_page": filters.pop("per_page", 10),
+            "cursor": filters.pop("cursor", None),
+            "with_total": filters.pop(
+                "with_total", list_cfg.get("with_total", True)
+            ),
+            "keyset": list_cfg.get("keyset", False),
+            "strategy": list_cfg.get("strategy"),
+            "order_by": order_by,
+            "deleted_state": deleted_state or requested_state,
+            "filters": filters,
+        }
+        params.update(loader_options.get(route_name, {}))
+        return params
+
+    def list_logic(data, **kwargs):
+        return service.paginate(**list_params(data, "list")), 200
 
     def list_deleted_logic(data, **kwargs):
-        filters = data.copy()
-        page = filters.pop("page", 1)
-        per_page = filters.pop("per_page", 10)
-        sort_by_str = filters.pop("sort_by", None)
-        order_by = [s.strip() for s in sort_by_str.split(",")] if sort_by_str else None
-        filters.pop("deleted_state", None)
-        return service.paginate(
-            page=page,
-            per_page=per_page,
-            filters=filters,
-            order_by=order_by,
-            deleted_state="deleted_only",
-        ), 200
+        params = list_params(data, "list_deleted", deleted_state="deleted_only")
+        return service.paginate(**params), 200
+
+    def count_logic(data, **kwargs):
+        params = list_params(data, "count")
+        total = service.count(
+            filters=params["filters"], deleted_state=params["deleted_state"]
+        )
+        # The header lets clients read the total from a HEAD request.
+        return {"total": total}, 200, {"X-Total-Count": str(total)}
+
+    def stats_logic(data, **kwargs):
+        stats_cfg = cfg.get("stats", {})
+        data = data.copy()
+        group_by = [f.strip() for f in (data.pop("group_by", "") or "").split(",")]
+        group_by = [field for field in group_by if field]
+        metrics = [m.strip() for m in data.pop("metrics", "count").split(",")]
+        metrics = [metric for metric in metrics if metric]
+
+        groupable = stats_cfg.get("group_by", [])
+        for field in group_by:
+            if field not in groupable:
+                raise InvalidAggregateError(
+                    field, f"Cannot group {entity_name} by '{field}'."
+                )
+        aggregatable = stats_cfg.get("aggregate", [])
+        for metric in metrics:
+            _, field = parse_metric(metric)
+            if field is not None and field not in aggregatable:
+                raise InvalidAggregateError(
+                    field, f"Cannot aggregate {entity_name} '{field}'."
+                )
+
+        params = list_params(data, "stats")
+        items = service.aggregate(
+            group_by=group_by,
+            metrics=metrics,
+            filters=params["filters"],
+            deleted_state=params["deleted_state"],
+        )
+        return {"items": items}, 200
 
     def get_logic(data, **kwargs):
         item_id = kwargs[id_field]
-        item = getattr(service, f"get_by_{id_field}")(item_id)
+        finder = getattr(service, f"get_by_{id_field}")
+        item = finder(item_id, **loader_options.get("get", {}))
         if item is None:
             raise NotFoundError(entity_name, item_id)
         return item
@@ -374,6 +548,26 @@ def register_crud_routes(
         200,
         False,
     )
+    build_view(
+        "count",
+        count_logic,
+        "GET",
+        "/count",
+        schemas.get("query"),
+        CountSchema,
+        200,
+        False,
+    )
+    build_view(
+        "stats",
+        stats_logic,
+        "GET",
+        "/stats",
+        create_stats_query_schema(schemas.get("query")),
+        StatsSchema,
+        200,
+        False,
+    )
     build_view(
         "get", get_logic, "GET", f"/<{id_field}>", None, schemas.get("main"), 200, False
     )
@@ -7,7 +7,7 @@ offering tools to auto-generate CRUD schemas from SQLAlchemy models.
 """
 
 from apiflask import Schema
-from apiflask.fields import Boolean, DateTime, Integer, List, Nested, String
+from apiflask.fields import Boolean, DateTime, Dict, Integer, List, Nested, String
 from apiflask.validators import Range, OneOf
 from marshmallow import ValidationError, pre_dump, validates_schema, INCLUDE
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
@@ -55,6 +55,21 @@ class BaseListQuerySchema(PaginationQuerySchema):
             " 'name' for ascending, '-created_at' for descending."
         },
     )
+    cursor = String(
+        required=False,
+        metadata={
+            "description": "Opaque cursor from a previous response's"
+            " 'next_cursor' or 'prev_cursor'. Switches to keyset pagination."
+        },
+    )
+    with_total = Boolean(
+        required=False,
+        metadata={
+            "description": "Set to false to skip counting matching items."
+            " 'total' and 'total_pages' are then null and 'has_next' is"
+            " derived by fetching one extra item."
+        },
+    )
     deleted_state = String(
         load_default="active",
         validate=OneOf(["active", "all", "deleted_only"]),
@@ -80,14 +95,30 @@ class BaseFilterQuerySchema(BaseListQuerySchema):
 class PaginationInfoSchema(BaseSchema):
     """Schema for displaying pagination metadata in the output."""
 
-    total = Integer(metadata={"description": "Total number of items."})
+    total = Integer(
+        allow_none=True,
+        metadata={"description": "Total number of items, or null if unknown."},
+    )
     page = Integer(metadata={"description": "Current page number."})
     per_page = Integer(metadata={"description": "Number of items per page."})
-    total_pages = Integer(metadata={"description": "Total number of pages."})
+    total_pages = Integer(
+        allow_none=True,
+        metadata={"description": "Total number of pages, or null if unknown."},
+    )
     has_next = Boolean(metadata={"description": "Indicates if there is a next page."})
     has_prev = Boolean(
         metadata={"description": "Indicates if there is a previous page."}
     )
+    next_cursor = String(
+        allow_none=True,
+        metadata={"description": "Cursor for the next page (keyset pagination)."},
+    )
+    prev_cursor = String(
+        allow_none=True,
+        metadata={
+            "description": "Cursor for the previous page (keyset pagination)."
+        },
+    )
 
 
 def create_pagination_schema(item_schema: type[Schema]) -> type[Schema]:
@@ -112,6 +143,8 @@ def create_pagination_schema(item_schema: type[Schema]) -> type[Schema]:
                         "total_pages": data.total_pages,
                         "has_next": data.has_next,
                         "has_prev": data.has_prev,
+                        "next_cursor": data.next_cursor,
+                        "prev_cursor": data.prev_cursor,
                     },
                 }
             return data
@@ -181,3 +214,45 @@ class MessageSchema(Schema):
     """A generic schema for simple message responses."""
 
     message = String()
+
+
+class CountSchema(Schema):
+    """Schema for the total returned by count routes."""
+
+    total = Integer(metadata={"description": "Number of matching items."})
+
+
+class StatsQuerySchema(Schema):
+    """Query parameters selecting the groups and metrics of a stats route."""
+
+    group_by = String(
+        required=False,
+        metadata={"description": "Comma-separated fields to group by."},
+    )
+    metrics = String(
+        load_default="count",
+        metadata={
+            "description": "Comma-separated metrics: 'count' or 'function:field'"
+            " with function count, sum, avg, min or max, e.g. 'count,sum:amount'."
+        },
+    )
+
+
+def create_stats_query_schema(query_schema: type[Schema] | None) -> type[Schema]:
+    """Adds the stats parameters to an entity's list query schema."""
+    if query_schema is None:
+        return StatsQuerySchema
+    return type(
+        f"{query_schema.__name__.removesuffix('QuerySchema')}StatsQuerySchema",
+        (StatsQuerySchema, query_schema),
+        {},
+    )
+
+
+class StatsSchema(Schema):
+    """Schema for the groups returned by stats routes."""
+
+    items = List(
+        Dict(),
+        metadata={"description": "One object per group with its fields and metrics."},
+    )
@@ -1,7 +1,9 @@
 # flask_devkit/users/bootstrap.py
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from flask_devkit.core.repository import BaseRepository
 from flask_devkit.users.models import (
     Permission,
     Role,
@@ -44,83 +46,60 @@ DEFAULT_PERMISSIONS: list[str] = [
 ]
 
 
-def _get_or_create_permission(session: Session, name: str) -> Permission:
-    perm = session.query(Permission).filter(Permission.name == name).first()
-    if perm is None:
-        perm = Permission(name=name)
-        session.add(perm)
-        session.flush()
-    return perm
-
-
-def _get_or_create_role(
-    session: Session, name: str, display_name: str, is_system_role: bool = False
-) -> Role:
-    role = session.query(Role).filter(Role.name == name).first()
-    if role is None:
-        role = Role(name=name, display_name=display_name, is_system_role=is_system_role)
-        session.add(role)
-        session.flush()
-    return role
-
-
 def seed_default_auth(
     session: Session, *, admin_username: str, admin_password: str
 ) -> dict:
     """
     Idempotently seed default permissions, an 'admin' role with full permissions,
     and an initial admin user assigned to that role.
+
+    Rows are created with conflict-skipping upserts, so concurrent seeding
+    (e.g. several workers starting at once) cannot fail on the unique names.
     """
-    # Fetch existing permissions in one query to avoid N+1 problem
-    existing_perms_query = session.query(Permission).filter(
-        Permission.name.in_(DEFAULT_PERMISSIONS)
+    created_perms = BaseRepository(Permission, session).upsert_many(
+        [{"name": name} for name in DEFAULT_PERMISSIONS],
+        ["name"],
+        update_columns=[],
     )
-    existing_perms_map = {p.name: p for p in existing_perms_query}
-
-    created_perms = 0
-    perms: list[Permission] = []
-    for name in DEFAULT_PERMISSIONS:
-        perm = existing_perms_map.get(name)
-        if perm is None:
-            perm = Permission(name=name)
-            session.add(perm)
-            created_perms += 1
-        perms.append(perm)
-
-    # Flush to get instances ready for association
-    session.flush()
-
-    admin_role = _get_or_create_role(
-        session, name="admin", display_name="مدير", is_system_role=True
+    perms = session.scalars(
+        select(Permission).where(Permission.name.in_(DEFAULT_PERMISSIONS))
+    ).all()
+
+    BaseRepository(Role, session).upsert(
+        {"name": "admin", "display_name": "مدير", "is_system_role": True},
+        ["name"],
+        update_columns=[],
     )
+    admin_role = session.scalars(select(Role).where(Role.name == "admin")).one()
 
     current_perm_names = {p.name for p in (admin_role.permissions or [])}
     for perm in perms:
         if perm.name not in current_perm_names:
             admin_role.permissions.append(perm)
 
-    admin_user = session.query(User).filter(User.username == admin_username).first()
-    created_user = False
+    # Hash once: the same hash is inserted or set on an existing admin.
+    password_holder = User()
+    password_holder.set_password(admin_password)
+    password_hash = password_holder.password_hash
+    admin_user = BaseRepository(User, session).upsert(
+        {"username": admin_username, "password_hash": password_hash},
+        ["username"],
+        update_columns=[],
+    )
+    created_user = admin_user is not None
     if admin_user is None:
-        admin_user = User(username=admin_username)
-        admin_user.set_password(admin_password)
-        session.add(admin_user)
-        created_user = True
-        session.flush()  # Flush to get the admin_user.id before association
-    else:
         # If user exists, just update the password to the provided one
-        admin_user.set_password(admin_password)
+        admin_user = session.scalars(
+            select(User).where(User.username == admin_username)
+        ).one()
+        admin_user.password_hash = password_hash
         session.add(admin_user)
 
-    # Check if the role is already assigned to the user
-    existing_association = (
-        session.query(UserRoleAssociation)
-        .filter_by(user_id=admin_user.id, role_id=admin_role.id)
-        .first()
+    BaseRepository(UserRoleAssociation, session).upsert(
+        {"user_id": admin_user.id, "role_id": admin_role.id},
+        ["user_id", "role_id"],
+        update_columns=[],
     )
-    if not existing_association:
-        association = UserRoleAssociation(user_id=admin_user.id, role_id=admin_role.id)
-        session.add(association)
 
     session.commit()
 
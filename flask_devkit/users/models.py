@@ -28,7 +28,10 @@ Base = db.Model
 
 class User(Base, IDMixin, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "users"
-    username = Column(String(80), unique=True, nullable=False)
+    # Usernames of deleted users can be taken again.
+    __active_unique__ = ("username",)
+
+    username = Column(String(80), nullable=False)
     password_hash = Column(VARCHAR(255), nullable=False)
     is_active = Column(BOOLEAN, nullable=False, default=True)
     last_login_at = Column(TIMESTAMP, nullable=True)
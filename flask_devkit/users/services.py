@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token
+from sqlalchemy import select
 
 from flask_devkit.core.exceptions import (
     AuthenticationError,
@@ -36,17 +37,17 @@ class UserService(BaseService[User]):
         if not (has_alpha and has_digit):
             raise BusinessLogicError("Password must include letters and numbers.")
 
-    def _username_exists(self, username: str) -> bool:
-        return (
-            self.repo.find_one_by({"username": username}, deleted_state="all")
-            is not None
-        )
-
-    def pre_create_hook(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        username = data.get("username")
-        if username and self._username_exists(username):
+    def create(self, data: Dict[str, Any]) -> User:
+        # The unique username is enforced by the INSERT itself, which skips
+        # the row instead of failing when the username is already taken.
+        processed_data = self.pre_create_hook(data)
+        user = self.repo.upsert(processed_data, ["username"], update_columns=[])
+        if user is None:
             raise BusinessLogicError("Username already exists.")
+        return self.post_create_hook(user)
 
+    def _hash_password(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Replaces the plain `password` of `data` with its validated hash."""
         password = data.pop("password", None)
         if password:
             self._validate_password_strength(password)
@@ -55,6 +56,27 @@ class UserService(BaseService[User]):
             data["password_hash"] = temp_user.password_hash
         return data
 
+    def pre_create_hook(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._hash_password(data)
+
+    def pre_create_many_hook(
+        self, data_list: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        usernames = [data["username"] for data in data_list if data.get("username")]
+        if len(set(usernames)) != len(usernames):
+            raise BusinessLogicError("Username already exists.")
+        for start in range(0, len(usernames), 500):
+            chunk = usernames[start : start + 500]
+            existing = self._db_session.scalars(
+                select(self.model.username).where(
+                    self.model.username.in_(chunk), self.model.deleted_at.is_(None)
+                )
+            ).first()
+            if existing is not None:
+                raise BusinessLogicError("Username already exists.")
+
+        return [self._hash_password(data) for data in data_list]
+
     def login_user(self, username: str, password: str) -> Tuple[User, str, str]:
         user = self.repo.find_one_by({"username": username})
 
@@ -150,18 +172,15 @@ class RoleService(BaseService[Role]):
         if not role:
             raise NotFoundError("Role", "N/A")
 
-        existing = (
-            self._db_session.query(UserRoleAssociation)
-            .filter_by(user_id=user.id, role_id=role.id)
-            .first()
-        )
-        if existing:
-            return
-
-        association = UserRoleAssociation(
-            user_id=user.id, role_id=role.id, assigned_by_user_id=assigned_by_user_id
+        BaseRepository(UserRoleAssociation, self._db_session).upsert(
+            {
+                "user_id": user.id,
+                "role_id": role.id,
+                "assigned_by_user_id": assigned_by_user_id,
+            },
+            ["user_id", "role_id"],
+            update_columns=[],
         )
-        self._db_session.add(association)
 
     def get_roles_for_user(self, user: User):
         if not user:
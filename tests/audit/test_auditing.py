@@ -67,3 +67,103 @@ def test_delete_audit(client, db_session, admin_auth_headers):
     assert log.table_name == "users"
     assert log.record_pk == str(user.id)
     assert log.new_values['deleted_at'] is not None
+
+
+def test_bulk_create_audit(db_session, user_service):
+    """Test that bulk inserts through create_many are audited per row."""
+    db_session.query(AuditLog).delete()
+    db_session.commit()
+
+    user_service.create_many(
+        [
+            {"username": "bulk_audit_1", "password_hash": "x"},
+            {"username": "bulk_audit_2", "password_hash": "x"},
+        ],
+        return_entities=False,
+    )
+
+    logs = db_session.query(AuditLog).filter(AuditLog.table_name == "users").all()
+    assert sorted(log.new_values["username"] for log in logs) == [
+        "bulk_audit_1",
+        "bulk_audit_2",
+    ]
+    assert all(log.action == "CREATE" for log in logs)
+    # Generated values come from the inserted rows, not the input params.
+    users = db_session.query(User).filter(User.username.like("bulk_audit_%")).all()
+    assert sorted(log.record_pk for log in logs) == sorted(str(u.id) for u in users)
+    assert all(log.new_values["uuid"] for log in logs)
+
+
+def test_bulk_create_audit_with_entities(db_session, user_service):
+    """Test that create_many returning entities logs their generated keys."""
+    db_session.query(AuditLog).delete()
+    db_session.commit()
+
+    users = user_service.create_many(
+        [
+            {"username": "bulk_entity_1", "password_hash": "x"},
+            {"username": "bulk_entity_2", "password_hash": "x"},
+        ]
+    )
+
+    logs = db_session.query(AuditLog).filter(AuditLog.table_name == "users").all()
+    assert [log.record_pk for log in logs] == [str(u.id) for u in users]
+    assert [log.new_values["uuid"] for log in logs] == [str(u.uuid) for u in users]
+    assert [u.username for u in users] == ["bulk_entity_1", "bulk_entity_2"]
+
+
+def test_bulk_update_audit(db_session, user_service):
+    """Test that set-based updates are audited per affected row."""
+    users = user_service.create_many(
+        [
+            {"username": "bulk_update_1", "password_hash": "x"},
+            {"username": "bulk_update_2", "password_hash": "x"},
+        ]
+    )
+    db_session.query(AuditLog).delete()
+    db_session.commit()
+
+    assert user_service.soft_delete_where({"username": "like__bulk_update_"}) == 2
+
+    logs = db_session.query(AuditLog).filter(AuditLog.action == "UPDATE").all()
+    assert sorted(log.record_pk for log in logs) == sorted(str(u.id) for u in users)
+    assert all(log.old_values["deleted_at"] is None for log in logs)
+    assert all(log.new_values["deleted_at"] is not None for log in logs)
+
+
+def test_upsert_audit(db_session, user_service):
+    """Test that upserts log created and changed rows but not skipped ones."""
+    db_session.query(AuditLog).delete()
+    db_session.commit()
+
+    repo = user_service.repo
+    repo.upsert({"username": "upsert_audit", "password_hash": "x"}, ["username"])
+    repo.upsert(
+        {"username": "upsert_audit", "password_hash": "y"},
+        ["username"],
+        update_columns=[],
+    )
+    repo.upsert({"username": "upsert_audit", "password_hash": "z"}, ["username"])
+
+    logs = db_session.query(AuditLog).filter(AuditLog.table_name == "users").all()
+    assert [log.action for log in logs] == ["CREATE", "UPDATE"]
+    assert logs[0].new_values["username"] == "upsert_audit"
+    assert logs[1].old_values["password_hash"] == "x"
+    assert logs[1].new_values["password_hash"] == "z"
+
+
+def test_reregistered_username_is_audited_as_create(db_session, user_service):
+    """Test that reusing a deleted user's username logs a new row, not an update."""
+    old_user = user_service.create({"username": "reused", "password_hash": "x"})
+    user_service.delete(old_user.uuid, id_field="uuid")
+    db_session.commit()
+    db_session.query(AuditLog).delete()
+    db_session.commit()
+
+    new_user = user_service.create({"username": "reused", "password_hash": "y"})
+
+    logs = db_session.query(AuditLog).filter(AuditLog.table_name == "users").all()
+    assert [(log.action, log.record_pk) for log in logs] == [
+        ("CREATE", str(new_user.id))
+    ]
+    assert new_user.id != old_user.id
@@ -0,0 +1,103 @@
+# tests/core/test_count_cache.py
+import pytest
+from sqlalchemy import Column, Integer, String, event
+
+from flask_devkit.core.cache import CountCache, count_cache
+from flask_devkit.core.repository import BaseRepository
+from tests.helpers import Base
+
+
+class CountedItem(Base):
+    __tablename__ = "counted_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+class CachedRepository(BaseRepository):
+    count_cache_ttl = 60
+
+
+@pytest.fixture
+def count_queries(db_session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "count(" in statement.lower():
+            statements.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def cached_repo(db_session):
+    Base.metadata.create_all(db_session.bind)
+    count_cache.clear()
+    repo = CachedRepository(model=CountedItem, db_session=db_session)
+    repo.create({"name": "alpha"})
+    repo.create({"name": "beta"})
+    db_session.commit()
+    try:
+        yield repo
+    finally:
+        count_cache.clear()
+        Base.metadata.drop_all(db_session.bind)
+
+
+def test_repeated_paginate_skips_count(cached_repo, count_queries):
+    first = cached_repo.paginate(filters={"name": "ilike__a"})
+    second = cached_repo.paginate(filters={"name": "ilike__a"})
+
+    assert first.total == second.total == 2
+    assert len(count_queries) == 1
+    assert count_cache.stats()["hits"] == 1
+    assert count_cache.stats()["misses"] == 1
+
+
+def test_cache_key_depends_on_filters_and_deleted_state(cached_repo, count_queries):
+    cached_repo.paginate(filters={"name": "alpha"})
+    cached_repo.paginate(filters={"name": "beta"})
+    cached_repo.paginate(filters={"name": "alpha"}, deleted_state="all")
+
+    assert len(count_queries) == 3
+
+
+def test_write_to_model_invalidates_cached_count(
+    db_session, cached_repo, count_queries
+):
+    assert cached_repo.paginate().total == 2
+
+    cached_repo.create({"name": "gamma"})
+    # Uncommitted writes are visible to this session but must not be cached.
+    assert cached_repo.paginate().total == 3
+    db_session.commit()
+
+    assert cached_repo.paginate().total == 3
+    assert cached_repo.paginate().total == 3
+    assert len(count_queries) == 3
+
+
+def test_count_cache_is_disabled_by_default(db_session, cached_repo, count_queries):
+    repo = BaseRepository(model=CountedItem, db_session=db_session)
+    repo.paginate()
+    repo.paginate()
+
+    assert len(count_queries) == 2
+
+
+def test_count_cache_entries_expire_and_are_bounded():
+    cache = CountCache(maxsize=2)
+    cache.set("a", 1, ttl=-1, tables={"t"})
+    assert cache.get("a") is None
+
+    cache.set("b", 2, ttl=60, tables={"t"})
+    cache.set("c", 3, ttl=60, tables={"t"})
+    cache.set("d", 4, ttl=60, tables={"u"})
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    cache.invalidate_tables({"t"})
+    assert cache.get("c") is None
+    assert cache.get("d") == 4
@@ -0,0 +1,111 @@
+# tests/core/test_entity_cache.py
+import pytest
+from sqlalchemy import Column, String, event
+
+from flask_devkit.core.cache import EntityCache, SQLiteCacheBackend
+from flask_devkit.core.mixins import IDMixin, SoftDeleteMixin, UUIDMixin
+from flask_devkit.core.repository import BaseRepository
+from tests.helpers import Base
+
+
+class CachedThing(Base, IDMixin, UUIDMixin, SoftDeleteMixin):
+    __tablename__ = "cached_things"
+    name = Column(String(50), nullable=False)
+
+
+@pytest.fixture
+def selects(db_session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "cached_things" in statement:
+            statements.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def repo(db_session):
+    Base.metadata.create_all(db_session.bind)
+
+    class CachedRepository(BaseRepository):
+        entity_cache = EntityCache(ttl=60)
+
+    repo = CachedRepository(model=CachedThing, db_session=db_session)
+    thing = repo.create({"name": "first"})
+    repo.thing_id, repo.thing_uuid = thing.id, thing.uuid
+    db_session.commit()
+    db_session.expunge_all()
+    try:
+        yield repo
+    finally:
+        Base.metadata.drop_all(db_session.bind)
+
+
+def test_lookups_are_served_from_cache(db_session, repo, selects):
+    assert repo.get_by_id(repo.thing_id).name == "first"
+    db_session.expunge_all()
+
+    by_id = repo.get_by_id(repo.thing_id)
+    by_uuid = repo.get_by_uuid(repo.thing_uuid)
+    assert by_id is by_uuid
+    assert by_id.name == "first"
+    assert len(selects) == 1
+    assert repo.entity_cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+    # Loader options bypass the cache.
+    db_session.expunge_all()
+    repo.get_by_id(repo.thing_id, load_only=["name"])
+    assert len(selects) == 2
+
+
+def test_commit_invalidates_changed_entities(db_session, repo):
+    thing = repo.get_by_uuid(repo.thing_uuid)
+    thing.name = "renamed"
+    assert repo.get_by_uuid(repo.thing_uuid).name == "renamed"
+    db_session.commit()
+    db_session.expunge_all()
+    assert repo.get_by_id(repo.thing_id).name == "renamed"
+
+    repo.delete(repo.get_by_id(repo.thing_id))
+    db_session.commit()
+    db_session.expunge_all()
+    assert repo.get_by_id(repo.thing_id) is None
+    assert repo.get_by_id(repo.thing_id, deleted_state="all").name == "renamed"
+
+
+def test_set_based_writes_invalidate_the_table(db_session, repo):
+    repo.get_by_id(repo.thing_id)
+    repo.update_where({"name": "first"}, {"name": "bulk"})
+    db_session.commit()
+    db_session.expunge_all()
+    assert repo.get_by_id(repo.thing_id).name == "bulk"
+
+
+def test_upserts_invalidate_the_table(db_session, repo):
+    assert repo.get_by_id(repo.thing_id).name == "first"
+    repo.upsert({"uuid": repo.thing_uuid, "name": "upserted"}, ["uuid"])
+    db_session.commit()
+    db_session.expunge_all()
+    assert repo.get_by_id(repo.thing_id).name == "upserted"
+
+    repo.upsert_many([{"uuid": repo.thing_uuid, "name": "again"}], ["uuid"])
+    db_session.commit()
+    db_session.expunge_all()
+    assert repo.get_by_uuid(repo.thing_uuid).name == "again"
+
+
+def test_sqlite_backend_is_shared_between_caches(db_session, repo, tmp_path):
+    path = str(tmp_path / "entities.db")
+    repo.entity_cache = EntityCache(SQLiteCacheBackend(path), ttl=60)
+    other = EntityCache(SQLiteCacheBackend(path), ttl=60)
+
+    repo.get_by_id(repo.thing_id)
+    assert other.get(CachedThing, "uuid", repo.thing_uuid)["name"] == "first"
+
+    repo.get_by_id(repo.thing_id).name = "changed"
+    db_session.commit()
+    assert other.get(CachedThing, "id", repo.thing_id) is None
@@ -0,0 +1,105 @@
+# tests/core/test_filters.py
+import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import CHAR, TIMESTAMP, Boolean, Column, Integer, String
+
+from flask_devkit.core.exceptions import InvalidFilterError
+from flask_devkit.core.filters import (
+    build_filter_criteria,
+    compile_filter_plan,
+    parse_filters,
+)
+from tests.helpers import Base
+
+
+class PlannedItem(Base):
+    __tablename__ = "planned_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+    qty = Column(Integer)
+
+
+def test_parse_filters_splits_signature_and_values():
+    signature, values = parse_filters({"name": "ilike__ap, pear", "qty": 5})
+
+    assert signature == (("name", ("ilike", "eq")), ("qty", ("eq",)))
+    assert values == (("ap", "pear"), (5,))
+
+
+def test_plan_is_cached_per_signature():
+    first, _ = parse_filters({"qty": "gt__1"})
+    second, _ = parse_filters({"qty": "gt__99"})
+
+    assert compile_filter_plan(PlannedItem, first) is compile_filter_plan(
+        PlannedItem, second
+    )
+
+
+def test_plan_binds_values_without_rebuilding_clauses():
+    clauses, params = build_filter_criteria(
+        PlannedItem, {"qty": "gte__10", "name": "in__a|b,ilike__c"}
+    )
+    again, other_params = build_filter_criteria(
+        PlannedItem, {"qty": "gte__20", "name": "in__x,ilike__y"}
+    )
+
+    assert clauses is again
+    assert params == {"flt_0_0": 10, "flt_1_0": ["a", "b"], "flt_1_1": "%c%"}
+    assert other_params == {"flt_0_0": 20, "flt_1_0": ["x"], "flt_1_1": "%y%"}
+
+
+def test_unknown_field_is_reported_once():
+    compile_filter_plan.cache_clear()
+    with patch("flask_devkit.core.filters._warn") as warn:
+        for _ in range(3):
+            assert build_filter_criteria(PlannedItem, {"missing": "x"}) == ((), {})
+
+    warn.assert_called_once()
+
+
+class TypedItem(Base):
+    __tablename__ = "typed_filter_items"
+    id = Column(Integer, primary_key=True)
+    uuid = Column(CHAR(36))
+    is_active = Column(Boolean)
+    created_at = Column(TIMESTAMP)
+
+
+def test_values_are_coerced_by_column_type():
+    _, params = build_filter_criteria(
+        TypedItem,
+        {
+            "id": "in__1|2",
+            "is_active": "false",
+            "created_at": ["gte__2025-06-01", "lt__2025-07-01T12:30:00"],
+            "uuid": "3F2504E0-4F89-11D3-9A0C-0305E82C3301",
+        },
+    )
+
+    assert list(params.values()) == [
+        [1, 2],
+        False,
+        datetime.datetime(2025, 6, 1),
+        datetime.datetime(2025, 7, 1, 12, 30),
+        "3f2504e0-4f89-11d3-9a0c-0305e82c3301",
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"id": "gt__abc"},
+        {"id": "in__1|x"},
+        {"is_active": "maybe"},
+        {"created_at": "gte__yesterday"},
+        {"uuid": "not-a-uuid"},
+    ],
+)
+def test_malformed_values_raise_invalid_filter(filters):
+    with pytest.raises(InvalidFilterError) as exc_info:
+        build_filter_criteria(TypedItem, filters)
+
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.payload["field"] == next(iter(filters))
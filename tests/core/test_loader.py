@@ -0,0 +1,49 @@
+# tests/core/test_loader.py
+from flask_devkit.core.loader import BatchLoader, get_loader
+
+
+def make_loader():
+    calls = []
+
+    def batch_fn(keys):
+        calls.append(list(keys))
+        return [f"entity-{key}" if key != "missing" else None for key in keys]
+
+    return BatchLoader(batch_fn), calls
+
+
+def test_queued_loads_are_dispatched_in_one_batch():
+    loader, calls = make_loader()
+
+    results = loader.load_many(["a", "b", "a", "missing"])
+    assert calls == []
+
+    assert [r.get() for r in results] == ["entity-a", "entity-b", "entity-a", None]
+    assert calls == [["a", "b", "missing"]]
+
+
+def test_results_are_cached_and_can_be_primed_or_cleared():
+    loader, calls = make_loader()
+
+    assert loader.get("a") == "entity-a"
+    assert loader.get_many(["a", "b"]) == ["entity-a", "entity-b"]
+    assert calls == [["a"], ["b"]]
+
+    loader.prime("c", "primed")
+    assert loader.get("c") == "primed"
+
+    loader.clear("a")
+    assert loader.get("a") == "entity-a"
+    assert calls == [["a"], ["b"], ["a"]]
+
+
+def test_get_loader_is_scoped_to_the_app_context(app):
+    owner = object()
+
+    with app.app_context():
+        first = get_loader(owner, "uuid", lambda keys: keys)
+        assert get_loader(owner, "uuid", lambda keys: keys) is first
+        assert get_loader(owner, "id", lambda keys: keys) is not first
+
+    with app.app_context():
+        assert get_loader(owner, "uuid", lambda keys: keys) is not first
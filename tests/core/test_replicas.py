@@ -0,0 +1,125 @@
+# tests/core/test_replicas.py
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+from apiflask import APIFlask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Column, Integer, String, insert
+
+from flask_devkit.audit.models import AuditLog
+from flask_devkit.core import replicas
+from flask_devkit.core.repository import BaseRepository
+from tests.helpers import Base
+
+# A separate extension instance keeps the replica binds out of the shared one.
+db = SQLAlchemy()
+
+
+class ReplicaItem(Base):
+    __tablename__ = "replica_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    app = APIFlask(__name__)
+    app.config.update(
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+            "SQLALCHEMY_BINDS": {
+                "replica_a": f"sqlite:///{tmp_path / 'replica_a.db'}",
+                "replica_b": f"sqlite:///{tmp_path / 'replica_b.db'}",
+            },
+            "DEVKIT_READ_REPLICAS": ["replica_a", "replica_b"],
+        }
+    )
+    db.init_app(app)
+    with app.app_context():
+        AuditLog.__table__.create(db.engine)
+        for key, name in [(None, "primary"), ("replica_a", "a"), ("replica_b", "b")]:
+            engine = db.engines[key]
+            ReplicaItem.__table__.create(engine)
+            with engine.begin() as connection:
+                connection.execute(insert(ReplicaItem), {"id": 1, "name": name})
+        replicas.clear_stickiness()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def repo(replica_app):
+    return BaseRepository(model=ReplicaItem, db_session=db.session)
+
+
+@contextmanager
+def request(app):
+    # A fresh app context per request, as when serving, so `g` is not shared.
+    with app.app_context(), app.test_request_context():
+        yield
+        db.session.remove()
+
+
+def read_name(repo):
+    db.session.expunge_all()
+    return repo.get_by_id(1).name
+
+
+def test_reads_round_robin_across_replicas(replica_app, repo):
+    names = {read_name(repo) for _ in range(4)}
+    assert names == {"a", "b"}
+    assert repo.find_one_by({"id": 1}).name in ("a", "b")
+    assert repo.paginate().total == 1
+
+
+def test_least_busy_strategy(replica_app, repo):
+    replica_app.config["DEVKIT_REPLICA_STRATEGY"] = "least_busy"
+    assert read_name(repo) in ("a", "b")
+
+    replica_app.config["DEVKIT_REPLICA_STRATEGY"] = "fastest"
+    with pytest.raises(ValueError, match="Unknown replica strategy"):
+        replicas.choose_replica([db.engines["replica_a"]])
+
+
+def test_pending_writes_read_from_primary(replica_app, repo):
+    repo.create({"name": "new"})
+    assert repo.paginate().total == 2
+    assert read_name(repo) == "primary"
+
+    db.session.rollback()
+    assert read_name(repo) in ("a", "b")
+
+
+def test_request_sticks_to_primary_after_commit(replica_app, repo):
+    with request(replica_app):
+        repo.create({"name": "new"})
+        db.session.commit()
+        assert read_name(repo) == "primary"
+
+    with request(replica_app):
+        assert read_name(repo) in ("a", "b")
+
+
+def test_identity_sticks_to_primary_across_requests(replica_app, repo):
+    with patch.object(replicas, "get_jwt_identity", return_value="user-1"):
+        with request(replica_app):
+            repo.create({"name": "new"})
+            db.session.commit()
+
+        with request(replica_app):
+            assert read_name(repo) == "primary"
+
+    with patch.object(replicas, "get_jwt_identity", return_value="user-2"):
+        with request(replica_app):
+            assert read_name(repo) in ("a", "b")
+
+    replica_app.config["DEVKIT_REPLICA_STICKY_SECONDS"] = 0
+    replicas.clear_stickiness()
+    with patch.object(replicas, "get_jwt_identity", return_value="user-1"):
+        with request(replica_app):
+            repo.create({"name": "newer"})
+            db.session.commit()
+
+        with request(replica_app):
+            assert read_name(repo) in ("a", "b")
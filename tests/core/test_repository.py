@@ -1,8 +1,19 @@
 # tests/core/test_repository.py
+import datetime
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
+
 import pytest
-from sqlalchemy import Column, Float, String
+from sqlalchemy import Boolean, Column, DateTime, Float, String, event, inspect
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
 
 from flask_devkit.core.archive import ArchivedRecord
+from flask_devkit.core.exceptions import (
+    BusinessLogicError,
+    InvalidAggregateError,
+    InvalidFilterError,
+)
 from flask_devkit.core.mixins import (
     IDMixin,
     SoftDeleteMixin,
@@ -137,4 +148,467 @@ def test_pagination_with_deleted_states(db_session, product_repo):
         "Active Product 1",
         "Active Product 2",
         "Deleted Product",
-    }
\ No newline at end of file
+    }
+
+def test_pagination_without_total_probes_next_page(db_session, product_repo):
+    for i in range(5):
+        product_repo.create({"name": f"Item {i}", "price": float(i)})
+
+    first = product_repo.paginate(page=1, per_page=2, with_total=False)
+    assert first.total is None
+    assert first.total_pages is None
+    assert len(first.items) == 2
+    assert first.has_next is True
+    assert first.has_prev is False
+
+    last = product_repo.paginate(page=3, per_page=2, with_total=False)
+    assert len(last.items) == 1
+    assert last.has_next is False
+    assert last.has_prev is True
+
+
+def test_created_at_range_filter_uses_index(db_session, product_repo):
+    product_repo.create({"name": "Old", "price": 1.0})
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = product_repo.paginate(
+            filters={"created_at": ["gte__2020-01-01", "lt__2999-01-01T00:00:00"]},
+            deleted_state="all",
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert result.total == 1
+
+    statement, parameters = executed[-1]
+    plan = (
+        db_session.connection()
+        .exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        .all()
+    )
+    details = " ".join(row[-1] for row in plan).replace(" ", "")
+    assert "USINGINDEXix_products_test_created_at(created_at>?ANDcreated_at<?)" in (
+        details
+    ), details
+
+
+def test_create_many_returns_entities_in_order(db_session, product_repo):
+    data = [{"name": f"Bulk {i}", "price": float(i)} for i in range(5)]
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO products_test"):
+            executed.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        products = product_repo.create_many(data, batch_size=2)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert [p.name for p in products] == [d["name"] for d in data]
+    assert all(p.id is not None and p.uuid for p in products)
+    assert len(executed) == 3
+    assert product_repo.paginate().total == 5
+
+
+def test_create_many_without_returning_entities(db_session, product_repo):
+    data = [{"name": f"Bulk {i}", "price": 1.0} for i in range(3)]
+
+    assert product_repo.create_many(data, return_entities=False) is None
+    assert product_repo.paginate().total == 3
+
+
+def test_update_where_issues_single_update(db_session, product_repo):
+    product_repo.create_many(
+        [{"name": f"P{i}", "price": float(i)} for i in range(5)],
+        return_entities=False,
+    )
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE products_test"):
+            executed.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        updated = product_repo.update_where({"price": "gte__3"}, {"name": "Pricey"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert updated == 2
+    assert len(executed) == 1
+    assert product_repo.paginate(filters={"name": "Pricey"}).total == 2
+
+
+def test_soft_delete_and_restore_where(db_session, product_repo):
+    product_repo.create_many(
+        [{"name": name, "price": 1.0} for name in ("A", "B", "C")],
+        return_entities=False,
+    )
+
+    assert product_repo.soft_delete_where({"name": "in__A|B"}) == 2
+    assert product_repo.soft_delete_where({"name": "in__A|B"}) == 0
+    assert product_repo.paginate().total == 1
+    assert product_repo.paginate(deleted_state="deleted_only").total == 2
+
+    assert product_repo.restore_where({"name": "A"}) == 1
+    assert product_repo.paginate().total == 2
+
+
+def test_update_where_rejects_unknown_fields(db_session, product_repo):
+    product_repo.create({"name": "Safe", "price": 1.0})
+
+    with pytest.raises(InvalidFilterError):
+        product_repo.update_where({"nmae": "Safe"}, {"price": 0.0})
+    with pytest.raises(InvalidFilterError):
+        product_repo.soft_delete_where({"name": "equals__Safe"})
+
+    assert product_repo.paginate(filters={"price": "1.0"}).total == 1
+
+
+def test_set_based_writes_require_filters(db_session, product_repo):
+    product_repo.create_many(
+        [{"name": name, "price": 1.0} for name in ("A", "B")],
+        return_entities=False,
+    )
+
+    for filters in (None, {}):
+        with pytest.raises(BusinessLogicError) as excinfo:
+            product_repo.update_where(filters, {"price": 0.0})
+        assert excinfo.value.error_code == "FILTERS_REQUIRED"
+        with pytest.raises(BusinessLogicError):
+            product_repo.soft_delete_where(filters)
+        with pytest.raises(BusinessLogicError):
+            product_repo.restore_where(filters)
+    assert product_repo.paginate(filters={"price": "1.0"}).total == 2
+
+    assert product_repo.soft_delete_where(None, all_rows=True) == 2
+    assert product_repo.restore_where({}, all_rows=True) == 2
+
+
+@pytest.mark.parametrize("json_in_database", [True, False])
+def test_force_delete_where_archives_in_chunks(
+    db_session, product_repo, json_in_database
+):
+    products = product_repo.create_many(
+        [{"name": f"Old {i}", "price": float(i)} for i in range(5)]
+    )
+    product_repo.create({"name": "Kept", "price": 1.0})
+    product_repo.soft_delete_where({"name": "like__Old"})
+
+    fallback = patch.object(BaseRepository, "_json_object_function", return_value=None)
+    with nullcontext() if json_in_database else fallback:
+        assert product_repo.force_delete_where({"price": "lt__4"}, limit=3) == 3
+        assert product_repo.force_delete_where({"price": "lt__4"}, limit=3) == 1
+        assert product_repo.force_delete_where({"price": "lt__4"}, limit=3) == 0
+
+    assert product_repo.paginate(deleted_state="all").total == 2
+    archived = {
+        record.original_pk: record
+        for record in db_session.query(ArchivedRecord).all()
+    }
+    assert sorted(archived) == sorted(str(p.id) for p in products[:4])
+    record = archived[str(products[0].id)]
+    assert record.original_table == "products_test"
+    assert record.data["name"] == "Old 0"
+    assert record.data["uuid"] == products[0].uuid
+    assert record.data["deleted_at"] is not None
+
+
+def test_force_delete_where_guards_its_scope(db_session, product_repo):
+    product_repo.create({"name": "Old", "price": 1.0})
+    product_repo.soft_delete_where({"name": "Old"})
+
+    for filters in (None, {}):
+        with pytest.raises(BusinessLogicError) as excinfo:
+            product_repo.force_delete_where(filters)
+        assert excinfo.value.error_code == "FILTERS_REQUIRED"
+    assert product_repo.force_delete_where(None, all_rows=True) == 1
+
+    plain_repo = BaseRepository(model=Plain, db_session=db_session)
+    plain_repo.create({"name": "Kept"})
+    with pytest.raises(BusinessLogicError):
+        plain_repo.force_delete_where({"name": "Kept"})
+    assert plain_repo.force_delete_where({"name": "Kept"}, deleted_state="all") == 1
+
+
+class Plain(Base, IDMixin):
+    __tablename__ = "plain_test"
+    name = Column(String(50), nullable=False)
+
+
+class Coupon(Base, IDMixin, TimestampMixin, SoftDeleteMixin):
+    __tablename__ = "coupons_test"
+    active = Column(Boolean)
+    expires_at = Column(DateTime)
+
+
+_EXPIRY = datetime.datetime(2026, 10, 17, 0, 11, 55)
+
+
+@pytest.mark.parametrize(
+    "active, expires_at",
+    [
+        (True, _EXPIRY),
+        (False, _EXPIRY.replace(microsecond=250)),
+        (None, None),
+    ],
+)
+def test_force_delete_where_archives_like_force_delete(
+    db_session, product_repo, active, expires_at
+):
+    repo = BaseRepository(model=Coupon, db_session=db_session)
+    single, chunked = repo.create({"active": active}), repo.create({"active": active})
+    for coupon in (single, chunked):
+        repo.update_where(
+            {"id": coupon.id},
+            {
+                "expires_at": expires_at,
+                "created_at": _EXPIRY,
+                "updated_at": _EXPIRY,
+                "deleted_at": _EXPIRY,
+            },
+        )
+    db_session.refresh(single)
+    repo.force_delete(single)
+    assert repo.force_delete_where({"id": chunked.id}) == 1
+    db_session.flush()
+
+    payloads = {
+        record.original_pk: record.data
+        for record in db_session.query(ArchivedRecord).all()
+    }
+    expected = payloads[str(single.id)]
+    assert expected["active"] is active
+    assert expected["expires_at"] == (expires_at and expires_at.isoformat())
+    assert payloads[str(chunked.id)] == {**expected, "id": chunked.id}
+
+
+def test_get_many_by_uuids_returns_input_order(db_session, product_repo):
+    products = product_repo.create_many(
+        [{"name": f"M{i}", "price": 1.0} for i in range(5)]
+    )
+    product_repo.soft_delete_where({"name": "M4"})
+    product_repo.in_chunk_size = 2
+    uuids = [products[3].uuid, "missing", products[0].uuid, products[4].uuid]
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            executed.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        found = product_repo.get_many_by_uuids(uuids + [products[3].uuid])
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert found == [products[3], None, products[0], None, products[3]]
+    assert len(executed) == 2
+    assert product_repo.get_many_by_ids(
+        [products[4].id, products[1].id], deleted_state="all"
+    ) == [products[4], products[1]]
+
+
+def test_load_only_defers_other_columns(db_session, product_repo):
+    product = product_repo.create({"name": "Lamp", "price": 30.0})
+    db_session.expunge_all()
+
+    page = product_repo.paginate(load_only=["name"], order_by=["-price"])
+    item = page.items[0]
+    unloaded = inspect(item).unloaded
+    assert "name" not in unloaded and "id" not in unloaded
+    assert "price" not in unloaded  # sort columns are always loaded
+    assert "uuid" in unloaded and "created_at" in unloaded
+
+    db_session.expunge_all()
+    fetched = product_repo.get_by_uuid(product.uuid, load_only=["name"])
+    assert "price" in inspect(fetched).unloaded
+    assert fetched.price == 30.0
+
+
+def test_iter_all_streams_and_expunges(db_session, product_repo):
+    product_repo.create_many(
+        [{"name": f"S{i:02d}", "price": float(i)} for i in range(25)],
+        return_entities=False,
+    )
+    product_repo.soft_delete_where({"name": "S00"})
+    db_session.expunge_all()
+
+    seen = []
+    for product in product_repo.iter_all(order_by=["name"], chunk_size=10):
+        seen.append(product.name)
+        product.price += 100  # pending changes are flushed before expunging
+        assert len(db_session.identity_map) <= 10
+
+    assert seen == [f"S{i:02d}" for i in range(1, 25)]
+    assert len(db_session.identity_map) == 0
+    assert product_repo.paginate(filters={"price": "gte__100"}).total == 24
+
+    rows = list(
+        product_repo.iter_all(
+            filters={"price": "lt__103"}, columns=["name"], deleted_state="all"
+        )
+    )
+    assert sorted(row.name for row in rows) == ["S00", "S01", "S02"]
+
+
+def test_upsert_inserts_updates_or_skips(db_session, product_repo):
+    created = product_repo.upsert({"uuid": "u-1", "name": "A", "price": 1.0}, ["uuid"])
+    assert created.id is not None and created.name == "A"
+
+    updated = product_repo.upsert({"uuid": "u-1", "name": "B", "price": 2.0}, ["uuid"])
+    assert updated.id == created.id
+    assert (updated.name, updated.price) == ("B", 2.0)
+
+    skipped = product_repo.upsert(
+        {"uuid": "u-1", "name": "C", "price": 3.0}, ["uuid"], update_columns=[]
+    )
+    assert skipped is None
+    assert product_repo.get_by_id(created.id).name == "B"
+
+
+def test_upsert_many_counts_written_rows(db_session, product_repo):
+    rows = [{"uuid": f"m-{i}", "name": f"M{i}", "price": float(i)} for i in range(3)]
+    assert product_repo.upsert_many(rows[:2], ["uuid"], batch_size=1) == 2
+    assert product_repo.upsert_many(rows, ["uuid"], update_columns=[]) == 1
+
+    rows[0]["name"] = "changed"
+    assert product_repo.upsert_many(rows, ["uuid"], update_columns=["name"]) == 3
+    assert product_repo.paginate(filters={"name": "changed"}).total == 1
+    assert product_repo.paginate().total == 3
+
+
+def test_mysql_upsert_skips_conflicts_without_insert_ignore():
+    session = MagicMock()
+    session.get_bind.return_value.dialect = mysql.dialect()
+    repo = BaseRepository(model=Product, db_session=session)
+
+    statement = repo._upsert_statement(["uuid", "name"], ["uuid"], [], Product)
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert "IGNORE" not in sql
+    assert sql.endswith("ON DUPLICATE KEY UPDATE uuid = products_test.uuid")
+
+
+@pytest.mark.parametrize("errno, skipped", [(1062, True), (1452, False)])
+def test_insert_unless_duplicate_only_skips_duplicates(
+    db_session, product_repo, errno, skipped
+):
+    error = IntegrityError("INSERT", {}, Exception(errno, "MySQL error"))
+    with patch.object(db_session, "execute", side_effect=error):
+        if skipped:
+            assert product_repo._insert_unless_duplicate({"name": "A"}) is False
+        else:
+            with pytest.raises(IntegrityError):
+                product_repo._insert_unless_duplicate({"name": "A"})
+
+
+def test_upsert_without_returning_inserts_or_skips(db_session, product_repo):
+    dialect = db_session.get_bind().dialect
+    data = {"uuid": "r-1", "name": "A", "price": 1.0}
+    with patch.object(dialect, "insert_returning", False):
+        created = product_repo.upsert(dict(data), ["uuid"], update_columns=[])
+        assert created is not None and created.name == "A"
+        with patch.object(
+            product_repo, "_insert_unless_duplicate", return_value=False
+        ):
+            assert product_repo.upsert(dict(data), ["uuid"], []) is None
+        updated = product_repo.upsert({**data, "name": "B"}, ["uuid"])
+        assert updated.id == created.id and updated.name == "B"
+
+
+def test_get_by_id_uses_identity_map(db_session, product_repo):
+    product = product_repo.create({"name": "Mapped", "price": 1.0})
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert product_repo.get_by_id(product.id) is product
+        assert product_repo.get_by_id(product.id, deleted_state="deleted_only") is None
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == []
+
+    product_repo.delete(product)
+    db_session.flush()
+    assert product_repo.get_by_id(product.id) is None
+    assert product_repo.get_by_id(product.id, deleted_state="all") is product
+
+    db_session.expunge_all()
+    assert product_repo.get_by_id(product.id) is None
+    assert product_repo.get_by_id(product.id, deleted_state="deleted_only").name == (
+        "Mapped"
+    )
+
+
+def test_exists_and_count_do_not_load_entities(db_session, product_repo):
+    product_repo.create_many(
+        [{"name": f"C{i}", "price": float(i)} for i in range(4)],
+        return_entities=False,
+    )
+    product_repo.soft_delete_where({"name": "C0"})
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert product_repo.exists({"price": "gte__3"}) is True
+        assert product_repo.exists({"name": "C0"}) is False
+        assert product_repo.exists({"name": "C0"}, deleted_state="all") is True
+        assert product_repo.count() == 3
+        assert product_repo.count({"price": "lt__2"}, deleted_state="all") == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 5
+    assert all(s.startswith("SELECT EXISTS") for s in statements[:3])
+    assert all("count(" in s for s in statements[3:])
+
+
+def test_aggregate_groups_in_sql(db_session, product_repo):
+    product_repo.create_many(
+        [
+            {"name": "Pen", "price": 1.0},
+            {"name": "Pen", "price": 3.0},
+            {"name": "Ink", "price": 10.0},
+            {"name": "Ink", "price": 20.0},
+        ],
+        return_entities=False,
+    )
+    product_repo.soft_delete_where({"price": "eq__20"})
+
+    rows = product_repo.aggregate(
+        group_by=["name"], metrics=["count", "sum:price", "avg:price", "max:price"]
+    )
+    assert list(rows[0]) == ["name", "count", "sum_price", "avg_price", "max_price"]
+    assert [tuple(row.values()) for row in rows] == [
+        ("Ink", 1, 10.0, 10.0, 10.0),
+        ("Pen", 2, 4.0, 2.0, 3.0),
+    ]
+    assert product_repo.aggregate(
+        metrics=["min:price"], filters={"name": "Ink"}, deleted_state="all"
+    ) == [{"min_price": 10.0}]
+    assert product_repo.aggregate() == [{"count": 3}]
+
+    with pytest.raises(InvalidAggregateError):
+        product_repo.aggregate(group_by=["nope"])
+    with pytest.raises(InvalidAggregateError):
+        product_repo.aggregate(metrics=["median:price"])
+    with pytest.raises(InvalidAggregateError):
+        product_repo.aggregate(metrics=["sum"])
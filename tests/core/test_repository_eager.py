@@ -0,0 +1,64 @@
+# tests/core/test_repository_eager.py
+import pytest
+from sqlalchemy import event
+
+from flask_devkit.core.repository import BaseRepository
+from flask_devkit.users.models import Role, User
+
+
+@pytest.fixture
+def users_with_roles(db_session):
+    roles = [Role(name=f"role{i}") for i in range(3)]
+    for i in range(10):
+        db_session.add(User(username=f"eager{i}", password_hash="x", roles=roles))
+    db_session.flush()
+    db_session.expunge_all()
+
+
+def count_selects(db_session, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_eager_load_avoids_per_row_queries(db_session, users_with_roles):
+    repo = BaseRepository(model=User, db_session=db_session)
+
+    def list_roles(**kwargs):
+        page = repo.paginate(per_page=10, **kwargs)
+        return [[role.name for role in user.roles] for user in page.items]
+
+    lazy = count_selects(db_session, list_roles)
+    db_session.expunge_all()
+    eager = count_selects(
+        db_session, lambda: list_roles(eager_load={"roles": "selectin"})
+    )
+
+    # COUNT, page and one SELECT ... IN for all roles, instead of one per user.
+    assert eager == 3
+    assert lazy == 12
+
+
+def test_repository_level_eager_load_config(db_session, users_with_roles):
+    class UserRepository(BaseRepository):
+        eager_load = {"roles": "joined"}
+
+    repo = UserRepository(model=User, db_session=db_session)
+    user = repo.find_one_by({"username": "eager0"})
+    fetched = repo.get_many_by_uuids([user.uuid])[0]
+    assert "roles" in fetched.__dict__
+
+    with pytest.raises(ValueError):
+        repo.paginate(eager_load={"roles": "lazy"})
+    with pytest.raises(ValueError):
+        repo.paginate(eager_load={"nope": "selectin"})
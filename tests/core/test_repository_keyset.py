@@ -0,0 +1,113 @@
+# tests/core/test_repository_keyset.py
+import base64
+import json
+
+import pytest
+from sqlalchemy import Column, Integer, String
+
+from flask_devkit.core.exceptions import BusinessLogicError
+from flask_devkit.core.repository import BaseRepository, decode_cursor
+from tests.helpers import Base
+
+
+class KeysetItem(Base):
+    __tablename__ = "keyset_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    rank = Column(Integer, nullable=False)
+
+
+@pytest.fixture
+def keyset_repo(db_session):
+    Base.metadata.create_all(db_session.bind)
+    repo = BaseRepository(model=KeysetItem, db_session=db_session)
+    # Duplicate ranks make the primary key tie-breaker matter.
+    for i in range(1, 8):
+        repo.create({"name": f"item{i}", "rank": (i + 1) // 2})
+    try:
+        yield repo
+    finally:
+        Base.metadata.drop_all(db_session.bind)
+
+
+def _walk_forward(repo, **kwargs):
+    pages = []
+    result = repo.paginate(per_page=3, keyset=True, **kwargs)
+    pages.append([item.name for item in result.items])
+    while result.next_cursor:
+        result = repo.paginate(per_page=3, cursor=result.next_cursor, **kwargs)
+        pages.append([item.name for item in result.items])
+    return pages, result
+
+
+def test_keyset_walks_all_rows_in_primary_key_order(keyset_repo):
+    pages, last = _walk_forward(keyset_repo)
+
+    assert pages == [
+        ["item1", "item2", "item3"],
+        ["item4", "item5", "item6"],
+        ["item7"],
+    ]
+    assert last.has_next is False
+    assert last.has_prev is True
+
+
+def test_keyset_with_mixed_sort_directions(keyset_repo):
+    pages, _ = _walk_forward(keyset_repo, order_by=["-rank", "name"])
+
+    flat = [name for page in pages for name in page]
+    assert flat == ["item7", "item5", "item6", "item3", "item4", "item1", "item2"]
+
+
+def test_keyset_prev_cursor_returns_previous_page(keyset_repo):
+    first = keyset_repo.paginate(per_page=3, keyset=True)
+    assert first.prev_cursor is None
+    assert first.has_prev is False
+
+    second = keyset_repo.paginate(per_page=3, cursor=first.next_cursor)
+    back = keyset_repo.paginate(per_page=3, cursor=second.prev_cursor)
+
+    assert [item.name for item in back.items] == ["item1", "item2", "item3"]
+    assert back.has_prev is False
+    assert back.has_next is True
+
+
+def test_keyset_is_not_affected_by_inserts_before_cursor(keyset_repo):
+    first = keyset_repo.paginate(per_page=3, keyset=True, order_by=["rank"])
+    keyset_repo.create({"name": "early", "rank": 0})
+
+    second = keyset_repo.paginate(
+        per_page=3, cursor=first.next_cursor, order_by=["rank"]
+    )
+    assert [item.name for item in second.items] == ["item4", "item5", "item6"]
+
+
+def test_keyset_cursor_is_opaque_and_validated(keyset_repo):
+    first = keyset_repo.paginate(per_page=3, keyset=True)
+    assert decode_cursor(first.next_cursor)["d"] == "next"
+
+    with pytest.raises(BusinessLogicError):
+        keyset_repo.paginate(per_page=3, cursor="not-a-cursor")
+
+    with pytest.raises(BusinessLogicError):
+        keyset_repo.paginate(per_page=3, cursor=first.next_cursor, order_by=["name"])
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"v": [1], "d": "next"},
+        {"k": ["id"], "v": 1, "d": "next"},
+        {"k": [["id"]], "v": [1], "d": "next"},
+        {"k": ["id"], "v": ["not-an-id"], "d": "next"},
+        {"k": ["id"], "v": [{"id": 1}], "d": "next"},
+        ["id", 1],
+    ],
+)
+def test_tampered_cursor_is_rejected(keyset_repo, payload):
+    raw = json.dumps(payload).encode("utf-8")
+    cursor = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    with pytest.raises(BusinessLogicError) as excinfo:
+        keyset_repo.paginate(per_page=3, cursor=cursor)
+    assert excinfo.value.error_code == "INVALID_CURSOR"
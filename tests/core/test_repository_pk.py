@@ -1,6 +1,7 @@
 # tests/core/test_repository_pk.py
 import pytest
 from sqlalchemy import Column, Integer, String
+from flask_devkit.core.archive import ArchivedRecord
 from flask_devkit.core.repository import BaseRepository
 from tests.helpers import Base
 
@@ -35,3 +36,53 @@ def test_paginate_with_custom_pk(custom_pk_repo):
     assert pagination_result.total == 2
     assert len(pagination_result.items) == 2
     assert pagination_result.items[0].name == "Widget 1"
+
+
+def test_get_by_id_with_custom_pk(db_session, custom_pk_repo):
+    """get_by_id and get_many_by_ids resolve the mapper's primary key."""
+    db_session.expunge_all()
+    widget = custom_pk_repo.get_by_id(2)
+    assert widget.name == "Widget 2"
+    assert custom_pk_repo.get_many_by_ids([2, 3, 1]) == [
+        widget,
+        None,
+        custom_pk_repo.get_by_id(1),
+    ]
+
+
+class CompositePKWidget(Base):
+    __tablename__ = "composite_pk_widgets"
+    shop = Column(String(20), primary_key=True)
+    code = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+def test_get_many_by_ids_with_composite_pk(db_session):
+    Base.metadata.create_all(db_session.bind)
+    repo = BaseRepository(model=CompositePKWidget, db_session=db_session)
+    try:
+        repo.create({"shop": "a", "code": 1, "name": "A1"})
+        repo.create({"shop": "b", "code": 1, "name": "B1"})
+        db_session.expunge_all()
+
+        found = repo.get_many_by_ids([("b", 1), ["a", 1], ("a", 2), ("b", 1)])
+        assert [w.name if w else None for w in found] == ["B1", "A1", None, "B1"]
+        with pytest.raises(ValueError):
+            repo.get_many_by_ids([("a",)])
+    finally:
+        Base.metadata.drop_all(db_session.bind)
+
+
+def test_force_delete_where_with_composite_pk(db_session):
+    Base.metadata.create_all(db_session.bind)
+    repo = BaseRepository(model=CompositePKWidget, db_session=db_session)
+    try:
+        for shop, code in (("a", 1), ("a", 2), ("b", 1)):
+            repo.create({"shop": shop, "code": code, "name": f"{shop}{code}"})
+
+        assert repo.force_delete_where({"code": 1}, deleted_state="all") == 2
+        assert [w.name for w in repo.paginate(deleted_state="all").items] == ["a2"]
+        archived = db_session.query(ArchivedRecord).all()
+        assert sorted(r.original_pk for r in archived) == ["a,1", "b,1"]
+    finally:
+        Base.metadata.drop_all(db_session.bind)
@@ -0,0 +1,189 @@
+# tests/core/test_repository_strategies.py
+import logging
+import threading
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from flask_devkit.audit.models import AuditLog
+from flask_devkit.core.repository import BaseRepository
+from tests.helpers import Base
+
+
+class StrategyItem(Base):
+    __tablename__ = "strategy_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+class WindowRepository(BaseRepository):
+    pagination_strategy = "window"
+
+
+class DeferredJoinRepository(BaseRepository):
+    pagination_strategy = "deferred_join"
+
+
+class CompositeItem(Base):
+    __tablename__ = "composite_items"
+    group = Column(Integer, primary_key=True)
+    number = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+@pytest.fixture
+def statements(db_session):
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            recorded.append(statement.lower())
+
+    engine = db_session.bind.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def window_repo(db_session):
+    Base.metadata.create_all(db_session.bind)
+    repo = WindowRepository(model=StrategyItem, db_session=db_session)
+    for i in range(5):
+        repo.create({"name": f"item{i}"})
+    try:
+        yield repo
+    finally:
+        Base.metadata.drop_all(db_session.bind)
+
+
+def test_window_strategy_uses_single_statement(window_repo, statements):
+    result = window_repo.paginate(page=2, per_page=2, order_by=["name"])
+
+    assert [item.name for item in result.items] == ["item2", "item3"]
+    assert result.total == 5
+    assert result.total_pages == 3
+    assert result.has_next is True
+    assert len(statements) == 1
+    assert "over ()" in statements[0]
+
+
+def test_window_strategy_falls_back_on_empty_page(window_repo, statements):
+    result = window_repo.paginate(page=10, per_page=2)
+
+    assert result.items == []
+    assert result.total == 5
+    assert len(statements) == 2
+
+
+def test_window_strategy_falls_back_without_dialect_support(
+    window_repo, statements, monkeypatch
+):
+    monkeypatch.setattr(window_repo, "_supports_window_functions", lambda: False)
+
+    result = window_repo.paginate(page=1, per_page=2)
+
+    assert result.total == 5
+    assert len(statements) == 2
+    assert not any("over ()" in s for s in statements)
+
+
+def test_strategy_can_be_selected_per_call(db_session, window_repo, statements):
+    repo = BaseRepository(model=StrategyItem, db_session=db_session)
+    result = repo.paginate(per_page=2, strategy="window")
+
+    assert result.total == 5
+    assert len(statements) == 1
+
+    with pytest.raises(ValueError):
+        repo.paginate(strategy="unknown")
+
+
+@pytest.fixture
+def parallel_session(tmp_path):
+    # A file database, so the pool can hand out a second connection.
+    engine = create_engine(f"sqlite:///{tmp_path / 'parallel.db'}")
+    StrategyItem.__table__.create(engine)
+    AuditLog.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(StrategyItem), [{"name": f"item{i}"} for i in range(5)]
+        )
+    threads = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            threads.append(threading.current_thread().name)
+
+    event.listen(engine, "before_cursor_execute", record)
+    session = Session(engine)
+    session.threads = threads
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_parallel_strategy_counts_on_another_connection(
+    app, parallel_session, caplog
+):
+    caplog.set_level(logging.DEBUG, logger=app.logger.name)
+    repo = BaseRepository(model=StrategyItem, db_session=parallel_session)
+
+    result = repo.paginate(
+        per_page=2, filters={"name": "ne__item0"}, strategy="parallel"
+    )
+
+    assert [item.name for item in result.items] == ["item1", "item2"]
+    assert result.total == 4
+    threads = parallel_session.threads
+    assert sorted(name.startswith("devkit-count") for name in threads) == [False, True]
+    assert "Parallel pagination of StrategyItem: page" in caplog.text
+
+
+def test_parallel_strategy_falls_back(db_session, window_repo, parallel_session):
+    repo = BaseRepository(model=StrategyItem, db_session=parallel_session)
+
+    # Uncommitted writes are invisible to other connections.
+    repo.create({"name": "pending"})
+    assert repo.paginate(strategy="parallel").total == 6
+    parallel_session.rollback()
+
+    # The open SQLite transaction is SERIALIZABLE.
+    repo.get_by_id(1)
+    assert repo.paginate(strategy="parallel").total == 5
+    assert not any(n.startswith("devkit-count") for n in parallel_session.threads)
+
+    # The shared test session is bound to a single connection.
+    assert window_repo.paginate(strategy="parallel").total == 5
+
+
+def test_deferred_join_strategy_pages_through_keys(
+    db_session, window_repo, statements
+):
+    repo = DeferredJoinRepository(model=StrategyItem, db_session=db_session)
+
+    result = repo.paginate(page=2, per_page=2, order_by=["-name"])
+
+    assert [item.name for item in result.items] == ["item2", "item1"]
+    assert result.total == 5
+    assert result.has_next is True
+    # COUNT, then the keys of the page, then the rows for those keys.
+    assert len(statements) == 3
+    assert statements[1].startswith("select strategy_items.id \nfrom")
+    assert "offset" in statements[1]
+    assert "in (" in statements[2] and "offset" not in statements[2]
+
+    result = repo.paginate(page=3, per_page=2, order_by=["name"], with_total=False)
+    assert [item.name for item in result.items] == ["item4"]
+    assert result.has_next is False
+    assert repo.paginate(page=9, per_page=2).items == []
+
+
+def test_deferred_join_strategy_with_composite_key(db_session, window_repo):
+    repo = DeferredJoinRepository(model=CompositeItem, db_session=db_session)
+    for group, number in [(1, 2), (1, 1), (2, 1)]:
+        repo.create({"group": group, "number": number, "name": f"{group}-{number}"})
+
+    result = repo.paginate(page=1, per_page=2, order_by=["-group", "number"])
+    assert [item.name for item in result.items] == ["2-1", "1-1"]
@@ -0,0 +1,97 @@
+# tests/core/test_search.py
+import pytest
+from sqlalchemy import Column, String, Text, text
+from sqlalchemy.dialects import postgresql
+
+from flask_devkit.core.exceptions import InvalidFilterError
+from flask_devkit.core.filters import build_filter_criteria
+from flask_devkit.core.mixins import FullTextSearchMixin, IDMixin
+from flask_devkit.core.repository import BaseRepository
+from flask_devkit.core.search import rebuild_search_index
+from tests.helpers import Base
+
+
+class Article(Base, IDMixin, FullTextSearchMixin):
+    __tablename__ = "articles"
+    __searchable__ = ("title", "body")
+    __search_config__ = "english"
+
+    title = Column(String(100), nullable=False)
+    body = Column(Text)
+
+
+@pytest.fixture
+def repo(db_session):
+    Article.__table__.create(db_session.bind)
+    repo = BaseRepository(model=Article, db_session=db_session)
+    repo.create_many(
+        [
+            {"title": "Flask tips", "body": "Flask blueprints and flask extensions"},
+            {"title": "Cooking", "body": "A flask of soup for the long walk home"},
+            {"title": "Gardening", "body": "Tomatoes in spring"},
+        ]
+    )
+    try:
+        yield repo
+    finally:
+        Article.__table__.drop(db_session.bind)
+
+
+def titles(result):
+    return [article.title for article in result.items]
+
+
+def test_search_matches_and_ranks(repo):
+    result = repo.paginate(filters={"body": "search__FLASK"})
+    assert titles(result) == ["Flask tips", "Cooking"]
+    assert result.total == 2
+
+    assert titles(repo.paginate(filters={"body": "search__soup, flask"})) == [
+        "Cooking"
+    ]
+    ordered = repo.paginate(filters={"body": "search__flask"}, order_by=["title"])
+    assert titles(ordered) == ["Cooking", "Flask tips"]
+    assert repo.count({"title": "search__gardening"}) == 1
+
+
+def test_index_follows_writes(db_session, repo):
+    repo.find_one_by({"title": "Gardening"}).body = "Peppers in summer"
+    repo.delete(repo.find_one_by({"title": "Cooking"}))
+    db_session.flush()
+
+    assert repo.count({"body": "search__tomatoes"}) == 0
+    assert repo.count({"body": "search__peppers"}) == 1
+    assert repo.count({"body": "search__soup"}) == 0
+
+    rebuild_search_index(db_session.connection(), Article)
+    assert repo.count({"body": "search__peppers"}) == 1
+
+
+def test_search_uses_the_index(db_session, repo):
+    clauses, params = build_filter_criteria(Article, {"body": "search__flask"})
+    statement = repo._select().where(*clauses)
+    assert len(repo._read(statement, params).all()) == 2
+
+    compiled = statement.params(params).compile(
+        dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+    plan = [row[-1] for row in plan]
+    assert any(d.startswith("SEARCH articles USING INTEGER PRIMARY KEY") for d in plan)
+    assert any("articles_fts VIRTUAL TABLE INDEX" in d for d in plan)
+    assert "SCAN articles" not in plan
+
+
+def test_search_validation(repo):
+    with pytest.raises(InvalidFilterError):
+        repo.paginate(filters={"body": "search__ ?! "})
+    with pytest.raises(InvalidFilterError):
+        build_filter_criteria(Article, {"id": "search__1"}, strict=True)
+
+
+def test_postgresql_compilation():
+    clauses, params = build_filter_criteria(Article, {"title": "search__Flask Tips"})
+    sql = str(clauses[0].compile(dialect=postgresql.dialect()))
+    assert "to_tsvector('english', coalesce(articles.title, ''))" in sql
+    assert "@@ plainto_tsquery('english'" in sql
+    assert list(params.values()) == ["flask tips"]
@@ -2,8 +2,13 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from sqlalchemy import Column, String
+from flask_devkit.core.archive import ArchivedRecord
 from flask_devkit.core.service import BaseService
-from flask_devkit.core.exceptions import DatabaseError, NotFoundError
+from flask_devkit.core.exceptions import (
+    BusinessLogicError,
+    DatabaseError,
+    NotFoundError,
+)
 from flask_devkit.core.mixins import IDMixin
 from tests.helpers import Base
 
@@ -66,6 +71,86 @@ class TestBaseService:
         service.create(data)
         mock_repo.create.assert_called_once_with(data)
 
+    def test_create_many_runs_hook_per_row_and_delegates(self, service, mock_repo):
+        service.pre_create_hook = lambda data: {**data, "hooked": True}
+        service.create_many([{"name": "a"}, {"name": "b"}], return_entities=False)
+        mock_repo.create_many.assert_called_once_with(
+            [{"name": "a", "hooked": True}, {"name": "b", "hooked": True}],
+            batch_size=1000,
+            return_entities=False,
+        )
+
+    def test_set_based_writes_delegate_to_repo(self, service, mock_repo):
+        mock_repo.update_where.return_value = 3
+        assert service.update_where({"name": "a"}, {"name": "b"}) == 3
+        service.soft_delete_where({"name": "a"})
+        service.restore_where({"name": "a"})
+        mock_repo.update_where.assert_called_once_with(
+            {"name": "a"}, {"name": "b"}, all_rows=False
+        )
+        mock_repo.soft_delete_where.assert_called_once_with(
+            {"name": "a"}, all_rows=False
+        )
+        mock_repo.restore_where.assert_called_once_with({"name": "a"}, all_rows=False)
+
+    def test_force_delete_where_uses_a_savepoint_per_chunk(self, service, mock_repo):
+        mock_repo.force_delete_where.side_effect = [2, 2, 1]
+        assert service.force_delete_where({"name": "a"}, chunk_size=2) == 5
+        assert mock_repo.force_delete_where.call_count == 3
+        mock_repo.force_delete_where.assert_called_with(
+            {"name": "a"}, deleted_state="deleted_only", limit=2, all_rows=False
+        )
+        assert service._db_session.begin_nested.call_count == 3
+        service._db_session.commit.assert_not_called()
+
+    @pytest.mark.parametrize("chunk_size", [0, -1])
+    def test_force_delete_where_rejects_empty_chunks(
+        self, service, mock_repo, chunk_size
+    ):
+        with pytest.raises(ValueError):
+            service.force_delete_where({"name": "a"}, chunk_size=chunk_size)
+        mock_repo.force_delete_where.assert_not_called()
+
+    def test_loader_batches_uuid_lookups(self, service, mock_repo):
+        mock_repo.get_many_by_uuids.side_effect = lambda uuids, **kw: [
+            f"entity-{u}" for u in uuids
+        ]
+        loader = service.loader("uuid")
+        pending = loader.load_many(["u1", "u2", "u1"])
+
+        assert [p.get() for p in pending] == ["entity-u1", "entity-u2", "entity-u1"]
+        mock_repo.get_many_by_uuids.assert_called_once_with(
+            ["u1", "u2"], deleted_state="active"
+        )
+
+    def test_iter_all_delegates_to_repo(self, service, mock_repo):
+        mock_repo.iter_all.return_value = iter(["a", "b"])
+        assert list(service.iter_all({"name": "x"}, chunk_size=50)) == ["a", "b"]
+        mock_repo.iter_all.assert_called_once_with(
+            filters={"name": "x"},
+            order_by=None,
+            chunk_size=50,
+            deleted_state="active",
+            columns=None,
+        )
+
+    def test_exists_and_count_delegate_to_repo(self, service, mock_repo):
+        mock_repo.exists.return_value = True
+        mock_repo.count.return_value = 3
+        assert service.exists({"name": "x"}) is True
+        assert service.count(deleted_state="all") == 3
+        mock_repo.exists.assert_called_once_with(
+            filters={"name": "x"}, deleted_state="active"
+        )
+        mock_repo.count.assert_called_once_with(filters=None, deleted_state="all")
+
+    def test_aggregate_delegates_to_repo(self, service, mock_repo):
+        mock_repo.aggregate.return_value = [{"count": 2}]
+        assert service.aggregate(metrics=["count"]) == [{"count": 2}]
+        mock_repo.aggregate.assert_called_once_with(
+            group_by=None, metrics=["count"], filters=None, deleted_state="active"
+        )
+
     def test_update_fetches_and_updates(self, service, mock_repo):
         mock_entity = MagicMock()
         mock_repo.get_by_id.return_value = mock_entity
@@ -187,3 +272,28 @@ def test_service_rolls_back_on_repo_error(db_session, test_service):
     # We query it again to see its state before the final fixture rollback.
     entity_after_failed_update = db_session.query(ServiceTestModel).get(entity_id)
     assert entity_after_failed_update.name == "Initial Name"
+
+
+def test_force_delete_where_can_commit_each_chunk(db_session, test_service):
+    ArchivedRecord.metadata.create_all(db_session.bind)
+    test_service.create_many(
+        [{"name": f"Old {i}"} for i in range(5)], return_entities=False
+    )
+    with pytest.raises(BusinessLogicError) as excinfo:
+        test_service.force_delete_where(
+            {"name": "like__Old"}, deleted_state="all", commit_chunks=True
+        )
+    assert excinfo.value.error_code == "PENDING_CHANGES"
+
+    db_session.commit()
+    assert (
+        test_service.force_delete_where(
+            {"name": "like__Old"},
+            deleted_state="all",
+            chunk_size=2,
+            commit_chunks=True,
+        )
+        == 5
+    )
+    assert db_session.query(ServiceTestModel).count() == 0
+    assert db_session.query(ArchivedRecord).count() == 5
@@ -0,0 +1,97 @@
+# tests/core/test_soft_delete.py
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, func
+from sqlalchemy.orm import relationship
+
+from flask_devkit.core.exceptions import DuplicateEntryError
+from flask_devkit.core.mixins import IDMixin, SoftDeleteMixin
+from flask_devkit.core.repository import BaseRepository
+from tests.helpers import Base
+
+
+class Writer(Base, IDMixin, SoftDeleteMixin):
+    __tablename__ = "writers"
+    __active_unique__ = ("email",)
+    __active_indexes__ = (("team", "email"),)
+
+    email = Column(String(100), nullable=False)
+    team = Column(String(20))
+    books = relationship("Book", back_populates="writer")
+
+
+class Book(Base, IDMixin, SoftDeleteMixin):
+    __tablename__ = "books"
+    title = Column(String(100), nullable=False)
+    writer_id = Column(Integer, ForeignKey("writers.id"))
+    writer = relationship(Writer, back_populates="books")
+
+
+@pytest.fixture
+def repo(db_session):
+    for table in (Writer.__table__, Book.__table__):
+        table.create(db_session.bind)
+    try:
+        yield BaseRepository(model=Writer, db_session=db_session)
+    finally:
+        for table in (Book.__table__, Writer.__table__):
+            table.drop(db_session.bind)
+
+
+def test_partial_indexes_are_declared():
+    indexes = {i.name: i for i in Writer.__table__.indexes if "active" in i.name}
+    assert sorted(indexes) == [
+        "ix_writers_team_email_active",
+        "uq_writers_email_active",
+    ]
+    unique = indexes["uq_writers_email_active"]
+    assert unique.unique
+    for dialect in ("sqlite", "postgresql"):
+        where = unique.dialect_options[dialect]["where"]
+        assert str(where) == "writers.deleted_at IS NULL"
+
+
+def test_active_unique_ignores_deleted_rows(db_session, repo):
+    first = repo.create({"email": "a@example.com"})
+    with pytest.raises(DuplicateEntryError):
+        with db_session.begin_nested():
+            repo.create({"email": "a@example.com"})
+
+    repo.delete(first)
+    db_session.flush()
+    second = repo.create({"email": "a@example.com"})
+    assert second.id != first.id
+
+    # Upserts target the partial index, so only active rows conflict.
+    assert repo.upsert({"email": "a@example.com"}, ["email"], []) is None
+    second.deleted_at = func.now()
+    db_session.flush()
+    assert repo.upsert({"email": "a@example.com"}, ["email"], []) is not None
+
+
+def test_global_criteria_skips_deleted_rows(app, db_session, repo):
+    writer = repo.create({"email": "w@example.com"})
+    kept = Book(title="Kept", writer=writer)
+    dropped = Book(title="Dropped", writer=writer)
+    db_session.add_all([kept, dropped])
+    db_session.flush()
+    dropped.deleted_at = func.now()
+    db_session.flush()
+    dropped_id = dropped.id
+    db_session.expunge(dropped)
+    db_session.expire_all()
+
+    app.config["DEVKIT_SOFT_DELETE_CRITERIA"] = True
+    assert [book.title for book in writer.books] == ["Kept"]
+    assert db_session.get(Book, dropped_id) is None
+
+    repo.delete(writer)
+    db_session.flush()
+    assert repo.count() == 0
+    assert repo.count(deleted_state="all") == 1
+    assert repo.get_by_id(writer.id, deleted_state="deleted_only") is writer
+    assert repo.paginate(deleted_state="deleted_only").total == 1
+    assert repo.exists({"email": "w@example.com"}, deleted_state="all")
+
+    app.config["DEVKIT_SOFT_DELETE_CRITERIA"] = False
+    db_session.expire_all()
+    assert len(writer.books) == 2
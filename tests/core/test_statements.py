@@ -0,0 +1,93 @@
+# tests/core/test_statements.py
+import pytest
+from sqlalchemy import Column, Integer, String, select
+
+from flask_devkit.core.repository import BaseRepository
+from flask_devkit.core.statements import (
+    StatementCache,
+    compiled_cache_stats,
+    statement_cache,
+)
+from tests.helpers import Base
+
+
+class TenantItem(Base):
+    __tablename__ = "tenant_items"
+    id = Column(Integer, primary_key=True)
+    tenant = Column(String(20), nullable=False)
+    name = Column(String(50), nullable=False)
+
+
+class ScopedRepository(BaseRepository):
+    tenant = "a"
+
+    def _select(self):
+        return select(self.model).where(self.model.tenant == self.tenant)
+
+
+class LegacyScopedRepository(BaseRepository):
+    def _query(self):
+        return super()._query().filter(self.model.tenant == "b")
+
+
+@pytest.fixture
+def items(db_session):
+    TenantItem.__table__.create(db_session.bind)
+    statement_cache.clear()
+    repo = BaseRepository(model=TenantItem, db_session=db_session)
+    repo.create_many(
+        [
+            {"tenant": "a", "name": "apple"},
+            {"tenant": "a", "name": "avocado"},
+            {"tenant": "b", "name": "banana"},
+        ]
+    )
+    try:
+        yield repo
+    finally:
+        statement_cache.clear()
+        TenantItem.__table__.drop(db_session.bind)
+
+
+def test_repeated_reads_reuse_statements(items):
+    first = items.paginate(filters={"tenant": "a"}, per_page=1)
+    built = statement_cache.stats()
+    compiled_cache_stats.clear()
+
+    second = items.paginate(filters={"tenant": "b"}, page=1, per_page=5)
+    third = items.paginate(filters={"tenant": "a"}, page=2, per_page=1)
+
+    assert first.total == 2 and [i.name for i in first.items] == ["apple"]
+    assert [i.name for i in second.items] == ["banana"]
+    assert [i.name for i in third.items] == ["avocado"]
+    # The COUNT and page statements were built once and found in both caches.
+    assert statement_cache.stats()["size"] == built["size"] == 2
+    assert statement_cache.stats()["hits"] == built["hits"] + 4
+    assert compiled_cache_stats.stats()["hits"] == 4
+    assert compiled_cache_stats.stats()["misses"] == 0
+
+
+def test_overridden_select_scopes_every_read(db_session, items):
+    repo = ScopedRepository(model=TenantItem, db_session=db_session)
+    assert repo.count() == 2
+    assert repo.find_one_by({"name": "banana"}) is None
+    assert repo.exists({"name": "apple"})
+
+    repo.tenant = "b"
+    assert [i.name for i in repo.paginate().items] == ["banana"]
+    assert repo.aggregate(group_by=["tenant"]) == [{"tenant": "b", "count": 1}]
+    assert statement_cache.stats()["size"] == 0
+
+
+def test_overridden_query_still_scopes_reads(db_session, items):
+    repo = LegacyScopedRepository(model=TenantItem, db_session=db_session)
+    assert [i.name for i in repo.paginate().items] == ["banana"]
+    assert repo.count() == 1
+    assert repo.count({"name": "apple"}) == 0
+
+
+def test_statement_cache_is_bounded():
+    cache = StatementCache(maxsize=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get_or_build(key, lambda: select(TenantItem))
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 2, "hit_rate": 0.25}
@@ -0,0 +1,118 @@
+# tests/core/test_usage.py
+from unittest.mock import patch
+
+import pytest
+
+from flask_devkit.core.repository import BaseRepository
+from flask_devkit.core.usage import (
+    QueryUsageRecorder,
+    UsageStats,
+    read_usage_file,
+    recommend_indexes,
+    usage_key,
+    usage_recorder,
+)
+from flask_devkit.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def clean_recorder():
+    usage_recorder.clear()
+    yield
+    usage_recorder.clear()
+
+
+def test_usage_key_describes_the_query():
+    key = usage_key(
+        User,
+        {"is_active": "eq__true", "username": "like__ad", "nope": "x"},
+        ["-created_at", "nope"],
+        "active",
+    )
+    assert key == (
+        "users",
+        (("deleted_at", ("eq",)), ("is_active", ("eq",)), ("username", ("like",))),
+        ("created_at",),
+    )
+    assert usage_key(User, None, None, "all") == ("users", (), ())
+
+
+def test_paginate_records_usage(app, db_session, tmp_path):
+    repo = BaseRepository(model=User, db_session=db_session)
+    path = str(tmp_path / "usage.db")
+    app.config.update(DEVKIT_QUERY_USAGE_FILE=path, DEVKIT_QUERY_USAGE_FLUSH=2)
+
+    repo.paginate(filters={"is_active": "true"}, order_by=["-created_at"])
+    repo.paginate(filters={"is_active": "false"}, order_by=["-created_at"])
+    key = usage_key(User, {"is_active": "true"}, ["created_at"], "active")
+    stats = usage_recorder.snapshot()[key]
+    assert stats.calls == 2
+    assert stats.max_seconds > 0
+    usage_recorder.join()
+    assert read_usage_file(path)[key].calls == 2
+
+    app.config["DEVKIT_QUERY_USAGE"] = False
+    repo.paginate()
+    assert len(usage_recorder.snapshot()) == 1
+
+
+def test_failing_usage_file_does_not_fail_the_query(app, db_session, tmp_path, caplog):
+    repo = BaseRepository(model=User, db_session=db_session)
+    path = str(tmp_path / "missing" / "usage.db")
+    app.config.update(DEVKIT_QUERY_USAGE_FILE=path, DEVKIT_QUERY_USAGE_FLUSH=1)
+
+    assert repo.paginate(filters={"is_active": "true"}).total == 0
+    usage_recorder.join()
+    assert "Could not write query usage" in caplog.text
+
+    # The calls are kept and written once the file can be opened.
+    (tmp_path / "missing").mkdir()
+    repo.paginate(filters={"is_active": "true"})
+    usage_recorder.join()
+    key = usage_key(User, {"is_active": "true"}, None, "active")
+    assert read_usage_file(path)[key].calls == 2
+
+    with patch(
+        "flask_devkit.core.usage.usage_key", side_effect=RuntimeError("boom")
+    ):
+        assert repo.paginate().total == 0
+    assert "Could not record query usage: boom" in caplog.text
+
+
+def test_recorder_is_bounded():
+    recorder = QueryUsageRecorder(maxsize=2)
+    for table in ("a", "b", "a", "c"):
+        recorder.record((table, (), ()), 0.1)
+    assert sorted(key[0] for key in recorder.snapshot()) == ["a", "c"]
+
+
+def test_recommend_indexes_skips_covered_queries():
+    table = User.__table__
+    usage = {
+        # is_active = ?, deleted_at IS NULL, ORDER BY created_at: not indexed.
+        (
+            "users",
+            (("deleted_at", ("eq",)), ("is_active", ("eq",))),
+            ("created_at",),
+        ): UsageStats(10, 3.0, 0.5),
+        # Only a range on last_login_at.
+        ("users", (("last_login_at", ("gte", "lt")),), ()): UsageStats(5, 1.0, 0.3),
+        # Served by the partial unique index on active usernames.
+        (
+            "users",
+            (("deleted_at", ("eq",)), ("username", ("eq",))),
+            (),
+        ): UsageStats(50, 1.0, 0.1),
+        # Served by the index on created_at.
+        ("users", (), ("created_at",)): UsageStats(1, 0.5, 0.5),
+        # Nothing a B-tree index could help with.
+        ("users", (("username", ("like",)),), ()): UsageStats(1, 0.5, 0.5),
+        ("unknown_table", (("id", ("eq",)),), ()): UsageStats(1, 0.5, 0.5),
+    }
+    advice = recommend_indexes(usage, {"users": table})
+    assert [(a.table, a.columns, a.calls) for a in advice] == [
+        ("users", ("deleted_at", "is_active", "created_at"), 10),
+        ("users", ("last_login_at",), 5),
+    ]
+    assert advice[0].share == pytest.approx(3.0 / 6.5)
+    assert advice[0].average_seconds == pytest.approx(0.3)
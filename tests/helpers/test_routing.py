@@ -9,9 +9,10 @@ from apiflask import Schema
 
 from flask_devkit import DevKit
 from flask_devkit.core.mixins import IDMixin, UUIDMixin
+from flask_devkit.core.repository import BaseRepository
 from flask_devkit.core.service import BaseService
 from flask_devkit.database import db
-from flask_devkit.helpers.routing import register_custom_route
+from flask_devkit.helpers.routing import register_crud_routes, register_custom_route
 from flask_devkit.helpers.schemas import create_crud_schemas
 
 
@@ -54,6 +55,7 @@ def app():
             "delete": {"permission": "delete:widget"},
             "list": {"auth_required": True},
             "get": {"auth_required": True},
+            "stats": {"enabled": True, "group_by": ["name"], "aggregate": ["id"]},
         },
     )
 
@@ -107,6 +109,90 @@ def test_list_widgets(client, auth_headers):
     assert list_resp.json["pagination"]["total"] == 2
 
 
+def test_count_widgets(client, auth_headers):
+    for name in ["WidgetA", "WidgetB", "Other"]:
+        client.post("/widgets/", json={"name": name}, headers=auth_headers)
+
+    resp = client.get("/widgets/count", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json == {"total": 3}
+    assert resp.headers["X-Total-Count"] == "3"
+
+    head = client.head("/widgets/count", headers=auth_headers)
+    assert head.status_code == 200
+    assert head.headers["X-Total-Count"] == "3"
+    assert head.data == b""
+
+
+def test_widget_stats(client, auth_headers):
+    for name in ["WidgetA", "WidgetA", "WidgetB"]:
+        client.post("/widgets/", json={"name": name}, headers=auth_headers)
+
+    resp = client.get(
+        "/widgets/stats?group_by=name&metrics=count,max:id", headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert resp.json == {
+        "items": [
+            {"name": "WidgetA", "count": 2, "max_id": 2},
+            {"name": "WidgetB", "count": 1, "max_id": 3},
+        ]
+    }
+    assert client.get("/widgets/stats", headers=auth_headers).json == {
+        "items": [{"count": 3}]
+    }
+
+    resp = client.get("/widgets/stats?group_by=uuid", headers=auth_headers)
+    assert resp.status_code == 422
+    assert resp.json["error_code"] == "INVALID_AGGREGATE"
+    resp = client.get("/widgets/stats?metrics=sum:name", headers=auth_headers)
+    assert resp.status_code == 422
+
+
+def test_count_route_follows_list_access():
+    app = APIFlask(__name__)
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["JWT_SECRET_KEY"] = "routing-secret"
+    DevKit().init_app(app)
+    from flask_devkit.helpers.routing import register_crud_routes
+
+    service = BaseService(model=Widget, db_session=db.session)
+    for name, routes_config in [
+        (
+            "guarded",
+            {"list": {"permission": "read:widget"}, "stats": {"enabled": True}},
+        ),
+        ("hidden", {"list": {"enabled": False}}),
+        ("exposed", {"list": {"enabled": False}, "count": {"enabled": True}}),
+    ]:
+        bp = APIBlueprint(name, __name__, url_prefix=f"/{name}")
+        register_crud_routes(
+            bp=bp,
+            service=service,
+            schemas=widget_schemas,
+            entity_name="widget",
+            routes_config=routes_config,
+        )
+        app.register_blueprint(bp)
+
+    with app.app_context():
+        db.create_all()
+        headers = {
+            "Authorization": f"Bearer {create_access_token(identity='reader')}"
+        }
+        client = app.test_client()
+        try:
+            assert client.get("/guarded/count", headers=headers).status_code == 403
+            assert client.get("/guarded/stats", headers=headers).status_code == 403
+            assert client.get("/exposed/count", headers=headers).status_code == 200
+            rules = {rule.rule for rule in app.url_map.iter_rules()}
+            assert "/hidden/count" not in rules
+            assert "/hidden/stats" not in rules
+        finally:
+            db.drop_all()
+
+
 def test_update_widget(client, auth_headers):
     create_resp = client.post(
         "/widgets/", json={"name": "Original"}, headers=auth_headers
@@ -274,4 +360,151 @@ def test_expired_token_returns_401(app, client):
     response = client.get("/widgets/", headers=headers)
 
     assert response.status_code == 401
-    assert response.json["error_code"] == "TOKEN_EXPIRED"
\ No newline at end of file
+    assert response.json["error_code"] == "TOKEN_EXPIRED"
+
+def test_list_widgets_with_cursor(client, auth_headers):
+    for name in ["W1", "W2", "W3"]:
+        client.post("/widgets/", json={"name": name}, headers=auth_headers)
+
+    first = client.get("/widgets/?per_page=2&sort_by=name", headers=auth_headers)
+    assert first.status_code == 200
+    assert first.json["pagination"]["next_cursor"] is None
+
+    # The widget routes use offset pagination by default; any cursor passed
+    # in the query string switches the request to keyset pagination.
+    widget_service = BaseService(model=Widget, db_session=db.session)
+    with client.application.app_context():
+        cursor = widget_service.paginate(
+            per_page=2, order_by=["name"], keyset=True
+        ).next_cursor
+
+    second = client.get(
+        f"/widgets/?per_page=2&sort_by=name&cursor={cursor}", headers=auth_headers
+    )
+    assert second.status_code == 200
+    assert [item["name"] for item in second.json["items"]] == ["W3"]
+    assert second.json["pagination"]["has_next"] is False
+    assert second.json["pagination"]["prev_cursor"] is not None
+
+    bad = client.get("/widgets/?cursor=garbage", headers=auth_headers)
+    assert bad.status_code == 400
+
+
+def test_list_widgets_without_total(client, auth_headers):
+    for name in ["W1", "W2", "W3"]:
+        client.post("/widgets/", json={"name": name}, headers=auth_headers)
+
+    resp = client.get("/widgets/?per_page=2&with_total=false", headers=auth_headers)
+    assert resp.status_code == 200
+    assert len(resp.json["items"]) == 2
+    assert resp.json["pagination"]["total"] is None
+    assert resp.json["pagination"]["total_pages"] is None
+    assert resp.json["pagination"]["has_next"] is True
+
+
+def test_load_plan_follows_output_schema():
+    from flask_devkit.helpers.routing import _schema_load_plan
+
+    columns, eager_load = _schema_load_plan(widget_schemas["main"], Widget)
+    assert set(columns) == {"id", "uuid", "name"}
+    assert eager_load == {}
+    # The list route projects through the pagination schema's item schema.
+    columns, _ = _schema_load_plan(widget_schemas["pagination_out"], Widget)
+    assert set(columns) == {"id", "uuid", "name"}
+
+    # Schemas dumping anything but columns and relationships load everything.
+    computed = create_crud_schemas(
+        Widget, custom_fields={"label": StringField(dump_only=True)}
+    )
+    assert _schema_load_plan(computed["main"], Widget) == (None, {})
+
+
+def test_load_plan_eager_loads_nested_relationships():
+    from apiflask.fields import List, Nested
+
+    from flask_devkit.helpers.routing import _schema_load_plan
+    from flask_devkit.users.models import Permission, Role, User
+
+    permission_schema = create_crud_schemas(Permission)["main"]
+    role_schema = create_crud_schemas(
+        Role, custom_fields={"permissions": List(Nested(permission_schema))}
+    )["main"]
+    user_schemas = create_crud_schemas(
+        User,
+        custom_fields={"roles": List(Nested(role_schema))},
+        exclude_from_main=["password_hash"],
+    )
+
+    columns, eager_load = _schema_load_plan(user_schemas["pagination_out"], User)
+    assert eager_load == {"roles": "selectin", "roles.permissions": "selectin"}
+    assert "id" in columns and "password_hash" not in columns
+
+
+def test_list_and_get_pass_projection_to_service(app, client, auth_headers):
+    bp = APIBlueprint("projected", __name__, url_prefix="/projected")
+    register_crud_routes(
+        bp,
+        BaseService(model=Widget, db_session=db.session),
+        widget_schemas,
+        "widget",
+        routes_config={"list": {"auth_required": False, "load_only": True}},
+    )
+    app.register_blueprint(bp)
+    client.post("/widgets/", json={"name": "W1"}, headers=auth_headers)
+
+    with patch.object(
+        BaseService, "paginate", autospec=True, side_effect=BaseService.paginate
+    ) as paginate:
+        resp = client.get("/widgets/", headers=auth_headers)
+    assert resp.status_code == 200
+    # Column projection is opt-in.
+    assert "load_only" not in paginate.call_args.kwargs
+
+    with patch.object(
+        BaseService, "paginate", autospec=True, side_effect=BaseService.paginate
+    ) as paginate:
+        resp = client.get("/projected/")
+    assert resp.status_code == 200
+    assert set(paginate.call_args.kwargs["load_only"]) == {"id", "uuid", "name"}
+
+
+class BasicSignatureRepository(BaseRepository):
+    """Overrides read methods with the signatures they had before projection."""
+
+    def paginate(
+        self, page=1, per_page=20, filters=None, order_by=None, deleted_state="active"
+    ):
+        return super().paginate(
+            page=page,
+            per_page=per_page,
+            filters=filters,
+            order_by=order_by,
+            deleted_state=deleted_state,
+        )
+
+    def get_by_uuid(self, uuid_, deleted_state="active"):
+        return super().get_by_uuid(uuid_, deleted_state=deleted_state)
+
+
+def test_routes_skip_loader_options_the_repository_lacks(app, client):
+    bp = APIBlueprint("basic", __name__, url_prefix="/basic")
+    service = BaseService(
+        model=Widget, db_session=db.session, repository_class=BasicSignatureRepository
+    )
+    register_crud_routes(
+        bp,
+        service,
+        widget_schemas,
+        "widget",
+        routes_config={
+            name: {"auth_required": False, "load_only": True}
+            for name in ("list", "get")
+        },
+    )
+    app.register_blueprint(bp)
+    widget = service.create({"name": "W1"})
+
+    assert client.get("/basic/").status_code == 200
+    resp = client.get(f"/basic/{widget.uuid}")
+    assert resp.status_code == 200
+    assert resp.json["name"] == "W1"
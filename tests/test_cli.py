@@ -1,4 +1,5 @@
 # tests/test_cli.py
+from unittest.mock import patch
 
 from apiflask import APIFlask
 from click.testing import CliRunner
@@ -31,6 +32,17 @@ def test_seed_default_auth_idempotent(tmp_path):
         # Verify the admin user has the admin role
         assert admin_role in admin_user.roles
 
+        # Reseeding resets the password, hashing it only once.
+        with patch.object(
+            User, "set_password", autospec=True, side_effect=User.set_password
+        ) as set_password:
+            seed_default_auth(
+                session=db.session, admin_username="admin", admin_password="a_new_pass456"
+            )
+        assert set_password.call_count == 1
+        db.session.refresh(admin_user)
+        assert admin_user.check_password("a_new_pass456")
+
 
 def test_cli_command(tmp_path):
     app = APIFlask(__name__)
@@ -85,3 +97,29 @@ def test_db_commands(app, db_session):
     result_drop = runner.invoke(drop_db_command)
     assert result_drop.exit_code == 0
     assert "Database file not found" in result_drop.output
+
+
+def test_index_advice_command(app, db_session):
+    from flask_devkit.core.cli import index_advice_command
+    from flask_devkit.core.usage import usage_key, usage_recorder
+    from flask_devkit.users.models import User
+
+    runner = app.test_cli_runner()
+    usage_recorder.clear()
+    result = runner.invoke(index_advice_command)
+    assert "No query usage has been recorded yet" in result.output
+
+    usage_recorder.record(usage_key(User, {"username": "admin"}, None, "active"), 0.1)
+    result = runner.invoke(index_advice_command)
+    assert "Existing indexes cover" in result.output
+
+    key = usage_key(User, {"is_active": "true"}, ["-last_login_at"], "all")
+    usage_recorder.record(key, 0.02)
+    result = runner.invoke(index_advice_command)
+    usage_recorder.clear()
+    assert result.exit_code == 0
+    assert (
+        "CREATE INDEX ix_users_is_active_last_login_at "
+        "ON users (is_active, last_login_at);" in result.output
+    )
+    assert "1 calls, avg 20.0 ms" in result.output
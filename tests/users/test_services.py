@@ -65,6 +65,39 @@ def test_create_user_with_duplicate_username_raises_error(db_session, user_servi
         user_service.create(user_data)
 
 
+def test_deleted_user_frees_username(db_session, user_service):
+    user_data = {"username": "leaver", "password": "a_good_password123"}
+    old_user = user_service.create(dict(user_data))
+    user_service.delete(old_user.uuid, id_field="uuid")
+    db_session.commit()
+
+    new_user = user_service.create(dict(user_data))
+    assert new_user.id != old_user.id
+    user_service.delete(new_user.uuid, id_field="uuid")
+    db_session.commit()
+    users = user_service.create_many([dict(user_data)])
+    assert users[0].username == "leaver"
+
+
+def test_create_many_users_hashes_passwords(db_session, user_service):
+    users = user_service.create_many(
+        [
+            {"username": "bulk1", "password": "a_good_password123"},
+            {"username": "bulk2", "password": "a_good_password456"},
+        ]
+    )
+
+    assert [u.username for u in users] == ["bulk1", "bulk2"]
+    assert users[0].check_password("a_good_password123")
+
+    with pytest.raises(BusinessLogicError, match="Username already exists."):
+        user_service.create_many([{"username": "bulk2", "password": "pass1234word"}])
+    with pytest.raises(BusinessLogicError, match="Username already exists."):
+        user_service.create_many(
+            [{"username": "dup"}, {"username": "dup"}]
+        )
+
+
 def test_password_strength_validation(user_service):
     with pytest.raises(BusinessLogicError, match="at least 8 characters long"):
         user_service.create({"username": "user1", "password": "short"})
@@ -170,19 +203,19 @@ def test_permission_service_db_error_handling(app, role_permission_services):
     """Tests that PermissionService correctly handles DB errors when fetching a role."""
     from unittest.mock import patch
     from sqlalchemy.exc import SQLAlchemyError
-    from sqlalchemy.orm import Query
+    from sqlalchemy.orm import Session
     from flask_devkit.core.exceptions import DatabaseError
 
     with app.app_context():
         _, permission_service = role_permission_services
 
-        # Patch the internal query execution to simulate a DB error, keeping the decorator active
+        # Patch the internal primary key lookup to simulate a DB error, keeping the decorator active
         with patch.object(
-            Query, "first", side_effect=SQLAlchemyError("DB is down")
-        ) as mock_first:
+            Session, "get", side_effect=SQLAlchemyError("DB is down")
+        ) as mock_get:
             with pytest.raises(DatabaseError):
-                # This call will use the repo, which calls .first() internally
+                # This call will use the repo, which calls Session.get() internally
                 permission_service.assign_permission_to_role(role_id=1, permission_id=1)
 
             # The mock should be called once for the role before the exception is raised
-            assert mock_first.call_count == 1
+            assert mock_get.call_count == 1